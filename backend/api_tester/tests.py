@@ -0,0 +1,182 @@
+"""
+Query budgets of the API routes (see radiumB/query_budget.py).
+
+Every route listed by get_all_api_endpoints() must declare a budget for
+each method it serves, and a staff user's GET of every readable route must
+stay within it against seeded data with more rows per list than any
+budget, so a query per row cannot hide inside one.
+"""
+import re
+from datetime import timedelta
+from decimal import Decimal
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.test import TestCase, override_settings
+from django.urls import resolve
+from django.utils import timezone
+
+from event.models import AdmissionTicket, EventGuide, EventQuestion, ODList, Participant, ReportJob
+from event.tests import TempMediaMixin, make_event
+from payment.models import Payment, PaymentConfiguration
+from event.views import EventCategoryListAPIView, EventGuideCreateUpdateAPIView
+from radiumB.query_budget import get_query_budget, query_budget
+from users.choice_lookups import invalidate_choice_lookups
+from users.membership.models import DevsMembership, PremiumMembershipApplication, PremiumMembershipSlot
+
+from .admin import get_all_api_endpoints
+
+User = get_user_model()
+
+# Rows per seeded list (and page size requested), above every budget
+ROWS = 25
+
+# Routes left out of the GET sweep
+SKIPPED_GETS = {
+    # Server-sent events: the response never ends
+    '/api/events/{event_id}/attendance/stream/',
+    # PayU redirect targets: only meaningful with a signed gateway payload
+    '/api/payment/payu/success/',
+    '/api/payment/payu/failure/',
+}
+
+# Sample values for the re_path() groups of the Django password reset views
+REGEX_SAMPLES = {'uidb64': 'MQ', 'token': 'set-password'}
+
+
+def view_methods(view_func):
+    """HTTP methods a resolved view serves (HEAD and OPTIONS aside)"""
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+    if view_class is None:
+        return ['GET']
+    return [
+        method.upper() for method in view_class.http_method_names
+        if method not in ('head', 'options') and hasattr(view_class, method)
+    ]
+
+
+@override_settings(QUERY_BUDGET_MODE='raise')
+class QueryBudgetTests(TempMediaMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        # Measure cold requests: no response cache or choice tables left over from other tests
+        cache.clear()
+        invalidate_choice_lookups()
+
+        self.staff = User.objects.create(username='staff', is_staff=True, is_superuser=True)
+        self.event = make_event(event_name='Budget Event', event_date=timezone.now() - timedelta(days=1))
+        self.question = EventQuestion.objects.create(event=self.event, label='T-shirt size', order=1)
+        EventQuestion.objects.create(event=self.event, label='Dietary needs', order=2)
+        EventGuide.objects.create(event=self.event)
+
+        self.attendees = [
+            User.objects.create(username=f'attendee{i}', first_name='Attendee', last_name=str(i))
+            for i in range(ROWS)
+        ]
+        for user in self.attendees:
+            participant = Participant.objects.create(
+                user=user, event=self.event, payment_status=True,
+                answers=[{'question_id': self.question.pk, 'answer': 'M'}],
+            )
+            ODList.objects.create(participant=participant, event=self.event, attendance=True)
+        self.participant = participant
+
+        # The staff user's own registrations and payments, one event each
+        for i in range(ROWS):
+            event = make_event(event_name=f'Staff Event {i}')
+            participant = Participant.objects.create(user=self.staff, event=event, payment_status=True)
+            self.payment = Payment.objects.create(
+                order_id=f'ORDER_{i}', user=self.staff, event=event, participant=participant, amount=Decimal('100'),
+            )
+
+        self.admission_ticket = AdmissionTicket.objects.create(event=self.event, user=self.staff)
+        self.report_job = ReportJob.objects.create(
+            event=self.event, kind='analysis', data_version='budget', status='done', filename='analysis.csv'
+        )
+        self.report_job.file.save('analysis.csv', ContentFile(b'name\n'))
+
+        for i in range(3):
+            PaymentConfiguration.objects.create(
+                app_id=f'app{i}', secret_key='secret', updated_by=self.staff, is_active=(i == 0)
+            )
+
+        DevsMembership.objects.create(user=self.staff)
+        for i in range(ROWS):
+            slot = PremiumMembershipSlot.objects.create(name=f'Batch {i}', total_slots=10, is_open=True)
+            PremiumMembershipApplication.objects.create(
+                user=self.attendees[i], slot=slot, status='approved', application_reason='Budget'
+            )
+            if i % 2:
+                PremiumMembershipApplication.objects.create(
+                    user=self.staff, slot=slot, reviewed_by=self.attendees[i], application_reason='Budget'
+                )
+
+    def url_for(self, path):
+        """A concrete URL for a route of get_all_api_endpoints(), pointing at the seeded rows"""
+        path = re.sub(r'\(\?P<(\w+)>[^)]*\)', lambda match: REGEX_SAMPLES[match[1]], path)
+        values = {
+            'pk': self.event.pk,
+            'event_id': self.event.pk,
+            'participant_id': self.participant.pk,
+            'question_id': self.question.pk,
+            'category_id': self.event.event_type_id,
+            'user_id': self.attendees[0].pk,
+            'order_id': self.payment.order_id,
+            'token': self.report_job.token if '/report-jobs/' in path else self.admission_ticket.token,
+        }
+        return re.sub(r'\{(\w+)\}', lambda match: str(values[match[1]]), path)
+
+    def test_every_route_declares_budgets(self):
+        for endpoint in get_all_api_endpoints():
+            with self.subTest(path=endpoint['path']):
+                view = resolve(self.url_for(endpoint['path'])).func
+                for method in view_methods(view):
+                    self.assertIsNotNone(
+                        get_query_budget(view, method), f"{method} {endpoint['path']} has no query budget"
+                    )
+
+    def test_reads_stay_within_budget(self):
+        self.client.force_login(self.staff)
+        for endpoint in get_all_api_endpoints():
+            path = endpoint['path']
+            url = self.url_for(path)
+            if path in SKIPPED_GETS or 'GET' not in view_methods(resolve(url).func):
+                continue
+            with self.subTest(path=path):
+                # Raises QueryBudgetExceeded, listing the statements, when over budget
+                response = self.client.get(url, {'page_size': ROWS})
+                if response.streaming:
+                    b''.join(response.streaming_content)  # reads and closes downloads
+                self.assertLess(response.status_code, 500)
+
+
+class QueryBudgetMiddlewareTests(TestCase):
+
+    def setUp(self):
+        # The category list then has to load its rows
+        cache.clear()
+        invalidate_choice_lookups()
+
+    def test_budget_lookup(self):
+        guide_admin = EventGuideCreateUpdateAPIView.as_view()
+        self.assertEqual(get_query_budget(guide_admin, 'post'), 15)
+        self.assertEqual(get_query_budget(guide_admin, 'HEAD'), get_query_budget(guide_admin, 'GET'))
+        self.assertIsNone(get_query_budget(query_budget({'GET': 3})(lambda request: None), 'POST'))
+
+    @override_settings(QUERY_BUDGET_MODE='log')
+    def test_log_mode_warns_and_serves(self):
+        with mock.patch.object(EventCategoryListAPIView, 'query_budget', 0):
+            with self.assertLogs('radiumB.query_budget', 'WARNING') as logs:
+                response = self.client.get('/api/events/categories/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('GET event:event_categories ran', logs.output[0])
+
+    @override_settings(QUERY_BUDGET_MODE='off')
+    def test_off_mode_counts_nothing(self):
+        with mock.patch.object(EventCategoryListAPIView, 'query_budget', 0):
+            with self.assertNoLogs('radiumB.query_budget'):
+                self.assertEqual(self.client.get('/api/events/categories/').status_code, 200)
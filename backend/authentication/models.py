@@ -130,17 +130,16 @@ class UserProfile(models.Model):
 
     def get_year_display(self):
         """Get the display name for the year (method for Django admin compatibility)"""
-        from users.dynamic_choices_models import Year
+        from users.choice_lookups import year_display_name
         from users.choices import YEAR_CHOICES
         
         if self.year:
-            try:
-                year_obj = Year.objects.get(code=self.year, is_active=True)
-                return year_obj.display_name
-            except Year.DoesNotExist:
+            display_name = year_display_name(self.year)
+            if display_name is None:
                 # Fallback to hardcoded choices if dynamic model doesn't exist
                 year_choices = dict(YEAR_CHOICES)
                 return year_choices.get(self.year, self.year)
+            return display_name
         return None
     
     @property
@@ -151,17 +150,16 @@ class UserProfile(models.Model):
     @property
     def department_display(self):
         """Get the display name for the department"""
-        from users.dynamic_choices_models import Department
+        from users.choice_lookups import department_display_name
         from users.choices import DEPARTMENT_CHOICES
         
         if self.department:
-            try:
-                dept_obj = Department.objects.get(code=self.department, is_active=True)
-                return dept_obj.full_name
-            except Department.DoesNotExist:
+            display_name = department_display_name(self.department)
+            if display_name is None:
                 # Fallback to hardcoded choices if dynamic model doesn't exist
                 dept_choices = dict(DEPARTMENT_CHOICES)
                 return dept_choices.get(self.department, self.department)
+            return display_name
         return None
 
     @property
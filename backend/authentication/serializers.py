@@ -1,6 +1,5 @@
 from dj_rest_auth.serializers import PasswordResetSerializer, PasswordResetConfirmSerializer
 from dj_rest_auth.registration.serializers import RegisterSerializer
-from django.conf import settings
 from django.contrib.auth.tokens import default_token_generator
 from django.contrib.auth import get_user_model
 from django.utils.http import urlsafe_base64_decode
@@ -85,13 +84,8 @@ class CustomPasswordResetSerializer(PasswordResetSerializer):
         email = self.data.get('email')
         form = CustomPasswordResetForm(data={'email': email})
         if form.is_valid():
-            form.save(
-                use_https=request.is_secure() if request else False,
-                from_email=getattr(settings, 'DEFAULT_FROM_EMAIL'),
-                request=request,
-                token_generator=default_token_generator,
-                domain_override=getattr(settings, 'SITE_DOMAIN', 'localhost:3000'),
-            )
+            # Queued for the mail worker, which builds the link (SITE_DOMAIN / SITE_PROTOCOL)
+            form.save(request=request)
 
 class CustomRegisterSerializer(RegisterSerializer):
     """Custom registration serializer that validates email uniqueness and saves names"""
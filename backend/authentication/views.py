@@ -1,6 +1,8 @@
 from datetime import timedelta
 from django.contrib.auth import get_user_model
-from dj_rest_auth.registration.views import SocialLoginView
+from dj_rest_auth.registration.views import RegisterView, SocialLoginView
+from dj_rest_auth.views import LogoutView, UserDetailsView, PasswordChangeView, PasswordResetView, PasswordResetConfirmView
+from django.contrib.auth import views as auth_views
 from allauth.socialaccount.providers.google.views import GoogleOAuth2Adapter
 from allauth.socialaccount.providers.oauth2.client import OAuth2Client
 from allauth.socialaccount.providers.github.views import GitHubOAuth2Adapter
@@ -27,6 +29,7 @@ import hashlib
 from django.http import JsonResponse
 from requests.exceptions import RequestException
 from rest_framework.permissions import IsAdminUser
+from radiumB.query_budget import query_budget
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
@@ -759,6 +762,7 @@ def refresh_github_token(request):
         logger.exception(f"Error refreshing GitHub token: {str(e)}")
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
+@query_budget(10)
 @api_view(['POST'])
 def custom_login(request):
     """
@@ -858,6 +862,7 @@ def custom_login(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
     
+@query_budget(8)
 @api_view(['POST'])
 def refresh_token(request):
     """
@@ -925,6 +930,7 @@ class CreateAdminUserAPIView(APIView):
     POST /api/auth/create-admin/
     """
     permission_classes = [IsAdminUser]
+    query_budget = 12
 
     def post(self, request):
         """Create a new admin user"""
@@ -1010,4 +1016,43 @@ class CreateAdminUserAPIView(APIView):
                 {"error": f"Failed to create admin user: {str(e)}"},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-    
\ No newline at end of file
+    
+
+
+# ========== dj-rest-auth AND DJANGO AUTH VIEWS ==========
+# Subclassed only to declare their query budgets where the view is defined
+
+class CustomRegisterView(RegisterView):
+    query_budget = 25
+
+
+class CustomLogoutView(LogoutView):
+    query_budget = 6
+
+
+class CustomUserDetailsView(UserDetailsView):
+    query_budget = {'GET': 4, 'PUT': 8, 'PATCH': 8}
+
+
+class CustomPasswordChangeView(PasswordChangeView):
+    query_budget = 8
+
+
+class CustomPasswordResetView(PasswordResetView):
+    query_budget = 10
+
+
+class CustomPasswordResetConfirmView(PasswordResetConfirmView):
+    query_budget = 10
+
+
+class WebPasswordResetView(auth_views.PasswordResetView):
+    query_budget = {'GET': 2, 'POST': 10, 'PUT': 10}
+
+
+class WebPasswordResetDoneView(auth_views.PasswordResetDoneView):
+    query_budget = 2
+
+
+class WebPasswordResetConfirmView(auth_views.PasswordResetConfirmView):
+    query_budget = {'GET': 4, 'POST': 10, 'PUT': 10}
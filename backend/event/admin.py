@@ -1,11 +1,17 @@
 from django.contrib import admin
 from django.contrib.auth import get_user_model
-from django.shortcuts import redirect, render
-from django.urls import path
+from django.db.models import Exists, OuterRef, Subquery
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404, redirect, render
+from django.urls import path, reverse
+from django.utils import timezone
 from django.utils.html import format_html
 from django.contrib import messages
-from .models import Event, ODList, Participant, EventGuide, EventQuestion, EventCategory
+from .models import Event, EventStats, ODList, Participant, EventGuide, EventQuestion, EventCategory, AdmissionTicket, OutboundEmail, ReportJob, AdminJob
 from .email_services import send_registration_email, send_qr_email_to_participant, get_participant_qr_status_html, create_participant_with_od
+from .admission import promote_waitlist
+from .bulk_mail import send_registration_emails_bulk
+from .admin_jobs import admin_job_handler, admin_job_progress_url, queue_admin_job, start_admin_job
 from import_export.admin import ImportExportModelAdmin
 from import_export import resources
 
@@ -57,27 +63,15 @@ def internal_booking_view(request):
             messages.error(request, 'No users selected.')
             return redirect(f"{request.path}?event_id={event_id}")
 
-        success_count = 0
-        for user_id in selected_user_ids:
-            try:
-                user = User.objects.get(pk=user_id)
-                result = create_participant_with_od(user, event, send_email=True)
-
-                if result['success']:
-                    messages.success(request, f'{user.username}: {result["message"]}')
-                    success_count += 1
-                else:
-                    messages.warning(request, f'{user.username}: {result["message"]}')
-
-            except User.DoesNotExist:
-                messages.error(request, f'User with ID {user_id} not found.')
-            except Exception as e:
-                messages.error(request, f'Error booking user {user_id}: {str(e)}')
-
-        if success_count > 0:
-            messages.success(request, f'Successfully processed {success_count} booking(s) for {event.event_name}.')
-
-        return redirect('admin:event_event_changelist')
+        job = queue_admin_job(
+            request,
+            'internal_booking',
+            [int(user_id) for user_id in selected_user_ids if user_id.isdigit()],
+            description=f'Book users for {event.event_name}',
+            params={'event_id': event.pk},
+            return_url=reverse('admin:event_event_changelist'),
+        )
+        return redirect(admin_job_progress_url(job))
 
     registered_user_ids = Participant.objects.filter(event=event).values_list('user_id', flat=True)
     available_users = User.objects.exclude(id__in=registered_user_ids).order_by('username')
@@ -91,12 +85,51 @@ def internal_booking_view(request):
 
     return render(request, 'admin/internal_booking_form.html', context)
 
+
+@admin_job_handler('internal_booking')
+def book_users_job(user_ids, params):
+    event = Event.objects.get(pk=params['event_id'])
+    errors = []
+    users = list(User.objects.filter(pk__in=user_ids))
+    for user in users:
+        try:
+            result = create_participant_with_od(user, event, send_email=True, overbook=True)
+            if not result['success']:
+                errors.append(f'{user.username}: {result["message"]}')
+        except Exception as e:
+            errors.append(f'Error booking {user.username}: {str(e)}')
+    missing = set(user_ids) - {user.pk for user in users}
+    errors.extend(f'User with ID {user_id} not found.' for user_id in sorted(missing))
+    return errors
+
+
+def admin_job_progress_view(request, token):
+    """Progress page of a background admin action; refreshes itself until the job finishes"""
+    job = get_object_or_404(AdminJob, token=token)
+    context = {
+        'title': job.description or job.action,
+        'job': job,
+        'finished': job.status in ('done', 'failed'),
+        'opts': AdminJob._meta,
+    }
+    return render(request, 'admin/admin_job_progress.html', context)
+
+
+def admin_job_errors_view(request, token):
+    """Download the error log of a background admin action"""
+    job = get_object_or_404(AdminJob, token=token)
+    response = HttpResponse(job.error_log, content_type='text/plain; charset=utf-8')
+    response['Content-Disposition'] = f'attachment; filename="admin_job_{job.pk}_errors.txt"'
+    return response
+
 original_get_urls = admin.site.get_urls
 
 def get_urls_with_internal_booking():
     urls = original_get_urls()
     custom_urls = [
         path('internal-booking/', admin.site.admin_view(internal_booking_view), name='internal_booking'),
+        path('admin-jobs/<uuid:token>/', admin.site.admin_view(admin_job_progress_view), name='admin_job_progress'),
+        path('admin-jobs/<uuid:token>/errors/', admin.site.admin_view(admin_job_errors_view), name='admin_job_errors'),
     ]
     return custom_urls + urls
 
@@ -139,7 +172,7 @@ class EventAdmin(ImportExportModelAdmin):
 
     search_fields = ['event_name', 'description', 'venue']
 
-    readonly_fields = ['created_at', 'updated_at', 'is_upcoming', 'is_registration_open', 'od_status_detail']
+    readonly_fields = ['created_at', 'updated_at', 'is_upcoming', 'is_registration_open', 'registration_closes_at', 'confirmed_count', 'seats_left', 'od_status_detail']
 
     fieldsets = (
         ('Basic Information', {
@@ -152,7 +185,7 @@ class EventAdmin(ImportExportModelAdmin):
             'fields': ('event_image', 'event_video')
         }),
         ('Registration Details', {
-            'fields': ('price', 'max_participants', 'registration_deadline')
+            'fields': ('price', 'max_participants', 'registration_deadline', 'registration_closes_at', 'admission_queue_enabled', 'confirmed_count', 'seats_left')
         }),
         ('Payment Gateway', {
             'fields': ('gateway_options', 'gateway_credentials'),
@@ -175,7 +208,8 @@ class EventAdmin(ImportExportModelAdmin):
     actions = ['send_qr_emails_bulk', 'resend_qr_emails_bulk', 'internal_book_users']
 
     def get_queryset(self, request):
-        return super().get_queryset(request).select_related().prefetch_related('participants')
+        # Counters come from the stats row: no per-row COUNT queries on the changelist
+        return super().get_queryset(request).select_related('event_type', 'stats')
 
     def is_upcoming(self, obj):
         return obj.is_upcoming
@@ -183,31 +217,26 @@ class EventAdmin(ImportExportModelAdmin):
     is_upcoming.short_description = 'Upcoming'
 
     def participant_count(self, obj):
-        return obj.participants.count()
+        return EventStats.for_event(obj).registered
     participant_count.short_description = 'Participants'
 
     def od_status_summary(self, obj):
         """Show OD/QR status summary for the event"""
-        participants = obj.participants.filter(registration_status='confirmed', payment_status=True)
-        total_participants = participants.count()
+        stats = EventStats.for_event(obj)
 
-        if total_participants == 0:
+        if stats.paid == 0:
             return format_html('<span style="color: gray;">No eligible participants</span>')
 
-        od_entries = ODList.objects.filter(participant__in=participants)
-        qr_sent_count = od_entries.filter(qr_sent=True).count()
-        total_od_entries = od_entries.count()
-
-        if total_od_entries == 0:
+        if stats.od_created == 0:
             return format_html('<span style="color: orange;">{} eligible, {} OD entries</span>',
-                             total_participants, total_od_entries)
+                             stats.paid, stats.od_created)
 
-        percentage = int((qr_sent_count / total_od_entries) * 100)
+        percentage = int((stats.qr_sent / stats.od_created) * 100)
 
-        if qr_sent_count == total_od_entries:
+        if stats.qr_sent == stats.od_created:
             color = 'green'
             status = 'Complete'
-        elif qr_sent_count > 0:
+        elif stats.qr_sent > 0:
             color = 'orange'
             status = 'Partial'
         else:
@@ -222,136 +251,55 @@ class EventAdmin(ImportExportModelAdmin):
 
     def od_status_detail(self, obj):
         """Show detailed OD/QR status for the event"""
-        participants = obj.participants.filter(registration_status='confirmed', payment_status=True)
-        total_eligible = participants.count()
+        stats = EventStats.for_event(obj)
 
-        if total_eligible == 0:
+        if stats.paid == 0:
             return "No eligible participants (confirmed registration + payment completed)"
 
-        od_entries = ODList.objects.filter(participant__in=participants)
-        total_od = od_entries.count()
-        qr_sent = od_entries.filter(qr_sent=True).count()
-        qr_not_sent = total_od - qr_sent
+        # The OD counters cover every OD entry of the event, eligible or not; count
+        # the eligible participants without one directly rather than by subtraction
+        missing_od = Participant.objects.filter(
+            event=obj,
+            registration_status='confirmed',
+            payment_status=True,
+            registered_participants__isnull=True,
+        ).count()
 
-        detail = f"Eligible participants: {total_eligible}\n"
-        detail += f"OD entries created: {total_od}\n"
-        detail += f"QR emails sent: {qr_sent}\n"
-        detail += f"QR emails pending: {qr_not_sent}"
+        detail = f"Eligible participants: {stats.paid}\n"
+        detail += f"OD entries created: {stats.od_created}\n"
+        detail += f"QR emails sent: {stats.qr_sent}\n"
+        detail += f"QR emails pending: {stats.od_created - stats.qr_sent}\n"
+        detail += f"Attended: {stats.attended}"
 
-        if total_od < total_eligible:
-            detail += f"\n {total_eligible - total_od} participants missing OD entries"
+        if missing_od:
+            detail += f"\n {missing_od} eligible participants missing OD entries"
 
         return detail
     od_status_detail.short_description = 'OD/QR Status Details'
 
+    def _send_event_qr_emails(self, request, queryset, force):
+        """Queue QR emails for eligible participants of the selected events as a background job"""
+        eligible_ids = Participant.objects.filter(
+            event__in=queryset,
+            registration_status='confirmed',
+            payment_status=True
+        ).order_by('event_id', 'id').values_list('id', flat=True)
+        return start_admin_job(
+            request,
+            'event_qr_emails',
+            eligible_ids,
+            description=f'{"Resend" if force else "Send"} QR emails for {queryset.count()} event(s)',
+            params={'force': force},
+        )
+
     def send_qr_emails_bulk(self, request, queryset):
         """Send QR code emails to all eligible participants of selected events"""
-        total_sent = 0
-        total_failed = 0
-
-        for event in queryset:
-            participants = event.participants.filter(
-                registration_status='confirmed',
-                payment_status=True
-            )
-
-            for participant in participants:
-                try:
-                    od_list = ODList.objects.get(participant=participant)
-                    if not od_list.qr_sent: 
-                        try:
-                            if send_registration_email(od_list):
-                                od_list.qr_sent = True
-                                od_list.save(update_fields=['qr_sent'])
-                                total_sent += 1
-                            else:
-                                total_failed += 1
-                        except Exception as e:
-                            total_failed += 1
-                            self.message_user(
-                                request,
-                                f'Failed to send email for {event.event_name} to {participant.user.email}: {str(e)}',
-                                messages.ERROR
-                            )
-                except ODList.DoesNotExist:
-                    try:
-                        od_list = ODList.objects.create(participant=participant)
-                        if send_registration_email(od_list):
-                            total_sent += 1
-                        else:
-                            total_failed += 1
-                    except Exception as e:
-                        total_failed += 1
-                        self.message_user(
-                            request,
-                            f'Failed to create OD and send email for {event.event_name} to {participant.user.email}: {str(e)}',
-                            messages.ERROR
-                        )
-
-        if total_sent > 0:
-            self.message_user(
-                request,
-                f'Successfully sent {total_sent} QR code emails.',
-                messages.SUCCESS
-            )
-        if total_failed > 0:
-            self.message_user(
-                request,
-                f'Failed to send {total_failed} emails.',
-                messages.WARNING
-            )
+        return self._send_event_qr_emails(request, queryset, force=False)
     send_qr_emails_bulk.short_description = 'Send QR emails to all eligible participants'
 
     def resend_qr_emails_bulk(self, request, queryset):
         """Resend QR code emails to all participants of selected events (force send)"""
-        total_sent = 0
-        total_failed = 0
-
-        for event in queryset:
-            participants = event.participants.filter(
-                registration_status='confirmed',
-                payment_status=True
-            )
-
-            for participant in participants:
-                try:
-                    od_list = ODList.objects.get(participant=participant)
-                    try:
-                        if send_registration_email(od_list):
-                            od_list.qr_sent = True
-                            od_list.save(update_fields=['qr_sent'])
-                            total_sent += 1
-                        else:
-                            total_failed += 1
-                    except Exception as e:
-                        total_failed += 1
-                        self.message_user(
-                            request,
-                            f'Failed to resend email for {event.event_name} to {participant.user.email}: {str(e)}',
-                            messages.ERROR
-                        )
-                except ODList.DoesNotExist:
-                    try:
-                        od_list = ODList.objects.create(participant=participant)
-                        if send_registration_email(od_list):
-                            total_sent += 1
-                        else:
-                            total_failed += 1
-                    except Exception as e:
-                        total_failed += 1
-
-        if total_sent > 0:
-            self.message_user(
-                request,
-                f'Successfully resent {total_sent} QR code emails.',
-                messages.SUCCESS
-            )
-        if total_failed > 0:
-            self.message_user(
-                request,
-                f'Failed to resend {total_failed} emails.',
-                messages.WARNING
-            )
+        return self._send_event_qr_emails(request, queryset, force=True)
     resend_qr_emails_bulk.short_description = 'Resend QR emails to all participants (force)'
 
     def internal_book_users(self, request, queryset):
@@ -363,7 +311,6 @@ class EventAdmin(ImportExportModelAdmin):
         event = queryset.first()
         event_id = event.pk
 
-        from django.urls import reverse
         booking_url = reverse('admin:internal_booking') + f'?event_id={event_id}'
         return redirect(booking_url)
 
@@ -424,7 +371,7 @@ class ODListAdmin(ImportExportModelAdmin):
     list_display = ('participant', 'hash', 'attendance', 'qr_sent', 'attendance_marked_at', 'event_name', 'user_email')
     list_filter = ('attendance', 'qr_sent', 'participant__event__event_name')
     search_fields = ('participant__user__username', 'participant__user__email', 'hash')
-    readonly_fields = ('hash', 'attendance_marked_at')
+    readonly_fields = ('hash', 'attendance_marked_at', 'attendance_device')
     actions = ['mark_attendance', 'unmark_attendance', 'send_qr_email', 'resend_qr_email']
 
     def event_name(self, obj):
@@ -437,85 +384,116 @@ class ODListAdmin(ImportExportModelAdmin):
     user_email.short_description = 'User Email'
     user_email.admin_order_field = 'participant__user__email'
 
+    def _refresh_event_stats(self, event_ids):
+        # Bulk update bypasses the EventStats signals
+        for event_id in event_ids:
+            EventStats.refresh(event_id)
+
     def mark_attendance(self, request, queryset):
-        updated = queryset.update(attendance=True)
+        event_ids = set(queryset.values_list('event_id', flat=True))
+        updated = queryset.update(attendance=True, updated_at=timezone.now())
+        self._refresh_event_stats(event_ids)
         self.message_user(request, f'{updated} entries marked as attended.')
     mark_attendance.short_description = 'Mark selected as attended'
 
     def unmark_attendance(self, request, queryset):
-        updated = queryset.update(attendance=False, attendance_marked_at=None)
+        event_ids = set(queryset.values_list('event_id', flat=True))
+        updated = queryset.update(attendance=False, attendance_marked_at=None, updated_at=timezone.now())
+        self._refresh_event_stats(event_ids)
         self.message_user(request, f'{updated} entries unmarked.')
     unmark_attendance.short_description = 'Unmark attendance'
 
-    def send_qr_email(self, request, queryset):
-        """Send QR code email to selected OD entries"""
-        sent_count = 0
-        failed_count = 0
+    def _send_qr_emails(self, request, queryset, verb, past_tense):
+        results = send_registration_emails_bulk(
+            queryset.select_related('participant__user', 'participant__event')
+        )
+        sent_count = sum(1 for result in results if result['success'])
+        failed_count = len(results) - sent_count
 
-        for od_list in queryset:
-            try:
-                if send_registration_email(od_list):
-                    od_list.qr_sent = True
-                    od_list.save(update_fields=['qr_sent'])
-                    sent_count += 1
-                else:
-                    failed_count += 1
-            except Exception as e:
-                failed_count += 1
+        for result in results:
+            if not result['success']:
                 self.message_user(
                     request,
-                    f'Failed to send email to {od_list.participant.user.email}: {str(e)}',
+                    f'Failed to {verb} email to {result["email"]}: {result["error"]}',
                     messages.ERROR
                 )
-
         if sent_count > 0:
             self.message_user(
                 request,
-                f'Successfully sent {sent_count} QR code emails.',
+                f'Successfully {past_tense} {sent_count} QR code emails.',
                 messages.SUCCESS
             )
         if failed_count > 0:
             self.message_user(
                 request,
-                f'Failed to send {failed_count} emails.',
+                f'Failed to {verb} {failed_count} emails.',
                 messages.WARNING
             )
+
+    def send_qr_email(self, request, queryset):
+        """Send QR code email to selected OD entries"""
+        self._send_qr_emails(request, queryset, 'send', 'sent')
     send_qr_email.short_description = 'Send QR code email to selected'
 
     def resend_qr_email(self, request, queryset):
         """Resend QR code email to selected OD entries (force send even if already sent)"""
-        sent_count = 0
-        failed_count = 0
+        self._send_qr_emails(request, queryset, 'resend', 'resent')
+    resend_qr_email.short_description = 'Resend QR code email to selected (force)'
 
-        for od_list in queryset:
-            try:
-                if send_registration_email(od_list):
-                    od_list.qr_sent = True
-                    od_list.save(update_fields=['qr_sent'])
-                    sent_count += 1
-                else:
-                    failed_count += 1
-            except Exception as e:
-                failed_count += 1
-                self.message_user(
-                    request,
-                    f'Failed to resend email to {od_list.participant.user.email}: {str(e)}',
-                    messages.ERROR
-                )
 
-        if sent_count > 0:
-            self.message_user(
-                request,
-                f'Successfully resent {sent_count} QR code emails.',
-                messages.SUCCESS
-            )
-        if failed_count > 0:
-            self.message_user(
-                request,
-                f'Failed to resend {failed_count} emails.',
-                messages.WARNING
+@admin_job_handler('event_qr_emails')
+def send_event_qr_emails_job(participant_ids, params):
+    """Create missing OD entries for a chunk of eligible participants and send their QR emails"""
+    errors = []
+    chunk = Participant.objects.filter(id__in=participant_ids)
+
+    missing = chunk.filter(registered_participants__isnull=True).select_related('user', 'event')
+    for participant in missing:
+        try:
+            ODList.objects.create(participant=participant, event=participant.event)
+        except Exception as e:
+            errors.append(f'Failed to create OD for {participant.event.event_name} to {participant.user.email}: {str(e)}')
+
+    od_lists = ODList.objects.filter(participant__in=chunk).select_related(
+        'participant__user', 'participant__event'
+    )
+    if not params.get('force'):
+        od_lists = od_lists.filter(qr_sent=False)
+
+    for result in send_registration_emails_bulk(od_lists):
+        if not result['success']:
+            errors.append(
+                f'Failed to send email for {result["od_list"].participant.event.event_name} to {result["email"]}: {result["error"]}'
             )
-    resend_qr_email.short_description = 'Resend QR code email to selected (force)'
+    return errors
+
+
+@admin_job_handler('mark_participants_paid')
+def mark_participants_paid_job(participant_ids, params):
+    chunk = Participant.objects.filter(id__in=participant_ids)
+    event_ids = set(chunk.values_list('event_id', flat=True))
+    chunk.update(payment_status=True)
+    # Bulk update bypasses the EventStats signals
+    for event_id in event_ids:
+        EventStats.refresh(event_id)
+    return []
+
+
+@admin_job_handler('unregister_participants')
+def unregister_participants_job(participant_ids, params):
+    errors = []
+    freed_events = {}
+    for participant in Participant.objects.filter(id__in=participant_ids).select_related('user', 'event'):
+        try:
+            if participant.registration_status == 'confirmed':
+                freed_events[participant.event_id] = participant.event
+            participant.delete()
+        except Exception as e:
+            errors.append(f'Failed to unregister {participant.user.username} from {participant.event.event_name}: {str(e)}')
+
+    for event in freed_events.values():
+        promote_waitlist(event)
+    return errors
 
 
 class ParticipantResource(resources.ModelResource):
@@ -536,29 +514,41 @@ class ParticipantAdmin(ImportExportModelAdmin):
     readonly_fields = ('registered_at',)
     actions = ['confirm_registrations', 'mark_as_paid', 'admin_unregister', 'send_qr_email_individual', 'resend_qr_email_individual']
 
+    def get_queryset(self, request):
+        # OD columns come from annotations instead of one ODList lookup per column per row
+        od_entries = ODList.objects.filter(participant=OuterRef('pk')).order_by('id')
+        return super().get_queryset(request).select_related('user', 'event').annotate(
+            od_exists=Exists(od_entries),
+            od_qr_sent=Subquery(od_entries.values('qr_sent')[:1]),
+            od_attendance=Subquery(od_entries.values('attendance')[:1]),
+        )
+
     def confirm_registrations(self, request, queryset):
-        updated = queryset.update(registration_status=True)
+        event_ids = set(queryset.values_list('event_id', flat=True))
+        updated = queryset.update(registration_status='confirmed')
+        # Bulk update bypasses the seat counter and EventStats signals
+        for event in Event.objects.filter(id__in=event_ids):
+            event.refresh_confirmed_count()
+            EventStats.refresh(event.pk)
         self.message_user(request, f'{updated} registrations confirmed.')
     confirm_registrations.short_description = 'Confirm selected registrations'
 
     def mark_as_paid(self, request, queryset):
-        updated = queryset.update(payment_status=True)
-        self.message_user(request, f'{updated} marked as paid.')
+        return start_admin_job(
+            request,
+            'mark_participants_paid',
+            queryset.order_by('id').values_list('id', flat=True),
+            description='Mark participants as paid',
+        )
     mark_as_paid.short_description = 'Mark selected as paid'
 
     def admin_unregister(self, request, queryset):
         """Admin action to unregister selected participants"""
-        deleted_count = 0
-        for participant in queryset:
-            user_name = participant.user.get_full_name() or participant.user.username
-            event_name = participant.event.event_name
-            participant.delete()
-            deleted_count += 1
-
-        self.message_user(
+        return start_admin_job(
             request,
-            f'Successfully unregistered {deleted_count} participant(s).',
-            messages.SUCCESS
+            'unregister_participants',
+            queryset.order_by('id').values_list('id', flat=True),
+            description='Unregister participants',
         )
     admin_unregister.short_description = 'Unregister selected participants'
 
@@ -620,28 +610,25 @@ class ParticipantAdmin(ImportExportModelAdmin):
         """Show QR email status for this participant"""
         return get_participant_qr_status_html(obj)
     qr_status.short_description = 'QR Status'
-    qr_status.admin_order_field = 'participant__odlist__qr_sent'
+    qr_status.admin_order_field = 'od_qr_sent'
 
     def od_status(self, obj):
         """Show OD status for this participant"""
-        try:
-            od_entry = ODList.objects.get(participant=obj)
+        if obj.od_exists:
             return format_html('<span style="color: green;">✅ Has OD</span>')
-        except ODList.DoesNotExist:
-            return format_html('<span style="color: red;">❌ No OD</span>')
+        return format_html('<span style="color: red;">❌ No OD</span>')
     od_status.short_description = 'OD Status'
+    od_status.admin_order_field = 'od_exists'
 
     def attendance_status(self, obj):
         """Show attendance status for this participant"""
-        try:
-            od_entry = ODList.objects.get(participant=obj)
-            if od_entry.attendance:
-                return format_html('<span style="color: green;">✅ Attended</span>')
-            else:
-                return format_html('<span style="color: orange;">⏳ Not Attended</span>')
-        except ODList.DoesNotExist:
+        if not obj.od_exists:
             return format_html('<span style="color: gray;">N/A</span>')
+        if obj.od_attendance:
+            return format_html('<span style="color: green;">✅ Attended</span>')
+        return format_html('<span style="color: orange;">⏳ Not Attended</span>')
     attendance_status.short_description = 'Attendance'
+    attendance_status.admin_order_field = 'od_attendance'
 
 
 class EventGuideResource(resources.ModelResource):
@@ -766,4 +753,83 @@ class EventCategoryAdmin(ImportExportModelAdmin):
     def get_readonly_fields(self, request, obj=None):
         if obj:  # Editing existing object
             return self.readonly_fields + ('event_count',)
-        return self.readonly_fields
\ No newline at end of file
+        return self.readonly_fields
+
+
+@admin.register(AdmissionTicket)
+class AdmissionTicketAdmin(admin.ModelAdmin):
+    """Admin interface for queued registration attempts"""
+    list_display = ('token', 'user', 'event', 'status', 'message', 'attempts', 'created_at', 'processed_at')
+    list_filter = ('status', 'event')
+    search_fields = ('user__username', 'user__email', 'event__event_name', 'token')
+    readonly_fields = ('token', 'user', 'event', 'answers', 'participant', 'attempts', 'locked_at', 'created_at', 'processed_at')
+    list_select_related = ('user', 'event')
+
+
+@admin.register(OutboundEmail)
+class OutboundEmailAdmin(admin.ModelAdmin):
+    """Admin interface for the transactional mail outbox"""
+    list_display = ('id', 'kind', 'to_email', 'status', 'attempts', 'next_attempt_at', 'sent_at', 'created_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('to_email', 'subject')
+    # The message itself is read-only: staff retry or inspect deliveries, they do not rewrite mail
+    readonly_fields = (
+        'kind', 'od_list', 'user', 'to_email', 'subject', 'body', 'html_body', 'from_email',
+        'attempts', 'locked_at', 'last_error', 'created_at', 'sent_at',
+    )
+    actions = ['retry_emails']
+
+    def retry_emails(self, request, queryset):
+        """Put dead-lettered or pending emails back at the front of the queue"""
+        updated = queryset.exclude(status='sent').update(
+            status='pending', attempts=0, next_attempt_at=timezone.now(), locked_at=None
+        )
+        self.message_user(request, f'{updated} email(s) queued for retry.')
+    retry_emails.short_description = 'Retry selected emails'
+
+
+@admin.register(ReportJob)
+class ReportJobAdmin(admin.ModelAdmin):
+    """Admin interface for generated event reports"""
+    list_display = ('id', 'event', 'kind', 'status', 'requested_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'kind')
+    search_fields = ('event__event_name',)
+    readonly_fields = ('token', 'data_version', 'file', 'filename', 'error', 'created_at', 'started_at', 'finished_at')
+    list_select_related = ('event', 'requested_by')
+
+
+@admin.register(EventStats)
+class EventStatsAdmin(admin.ModelAdmin):
+    """Read-only view of the per-event counters"""
+    list_display = ('event', 'registered', 'paid', 'od_created', 'qr_sent', 'attended', 'updated_at')
+    search_fields = ('event__event_name',)
+    readonly_fields = ('event',) + EventStats.COUNTER_FIELDS + ('updated_at',)
+    list_select_related = ('event',)
+    actions = ['reconcile']
+
+    def reconcile(self, request, queryset):
+        """Recount the selected events from their participant and OD rows"""
+        event_ids = list(queryset.values_list('event_id', flat=True))
+        for event_id in event_ids:
+            EventStats.refresh(event_id)
+        self.message_user(request, f'{len(event_ids)} event(s) reconciled.')
+    reconcile.short_description = 'Reconcile selected stats'
+
+
+@admin.register(AdminJob)
+class AdminJobAdmin(admin.ModelAdmin):
+    """Admin interface for background admin actions"""
+    list_display = ('id', 'description', 'action', 'status', 'progress', 'requested_by', 'created_at', 'finished_at')
+    list_filter = ('status', 'action')
+    search_fields = ('description', 'action')
+    readonly_fields = ('token', 'action', 'description', 'params', 'total', 'processed', 'failed',
+                       'error_log', 'requested_by', 'created_at', 'started_at', 'finished_at')
+    exclude = ('object_ids', 'return_url')
+    list_select_related = ('requested_by',)
+
+    def progress(self, obj):
+        return format_html(
+            '<a href="{}">{} / {} ({} failed)</a>',
+            admin_job_progress_url(obj), obj.processed + obj.failed, obj.total, obj.failed
+        )
+    progress.short_description = 'Progress'
@@ -0,0 +1,140 @@
+"""
+Background runner for admin bulk actions.
+
+An admin action calls `queue_admin_job()` with the selected ids and
+redirects to the job's progress page instead of doing the work inside the
+request (where large selections hit the gunicorn timeout).
+`manage.py run_admin_job_worker` claims queued jobs and calls the
+registered handler on ADMIN_JOB_CHUNK_SIZE ids at a time, saving the
+processed / failed counters and the error log after every chunk.
+
+Handlers take `(ids, params)` and return a list of error lines, one per
+record that failed; everything else in the chunk counts as processed. They
+are registered with `@admin_job_handler` next to the action that queues
+them in the app's admin module, which Django imports at startup in the
+worker as well.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.shortcuts import redirect
+from django.urls import reverse
+from django.utils import timezone
+
+from .models import AdminJob
+
+_handlers = {}
+
+
+def admin_job_handler(name):
+    """Register a function as the handler of the `name` admin job"""
+    def register(func):
+        _handlers[name] = func
+        return func
+    return register
+
+
+def queue_admin_job(request, action, object_ids, description='', params=None, return_url=''):
+    """
+    Queue a background admin job for the given ids.
+
+    Returns:
+        AdminJob: the queued job; redirect to `admin_job_progress_url(job)`
+    """
+    if action not in _handlers:
+        raise ValueError(f'Unknown admin job: {action}')
+    object_ids = list(object_ids)
+    user = getattr(request, 'user', None)
+    return AdminJob.objects.create(
+        action=action,
+        description=description,
+        object_ids=object_ids,
+        params=params or {},
+        total=len(object_ids),
+        return_url=return_url or (request.get_full_path() if request else ''),
+        requested_by=user if user and user.is_authenticated else None,
+    )
+
+
+def admin_job_progress_url(job):
+    return reverse('admin:admin_job_progress', args=[job.token])
+
+
+def start_admin_job(request, action, object_ids, description, params=None):
+    """Queue the job from an admin action and send the user to its progress page"""
+    job = queue_admin_job(request, action, object_ids, description=description, params=params)
+    return redirect(admin_job_progress_url(job))
+
+
+def run_admin_job(job, chunk_size=None):
+    """Run a claimed job to completion, resuming after the ids it already processed"""
+    chunk_size = chunk_size or settings.ADMIN_JOB_CHUNK_SIZE
+    handler = _handlers.get(job.action)
+    if handler is None:
+        job.status = 'failed'
+        job.error_log += f'No handler registered for {job.action}\n'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error_log', 'finished_at'])
+        return False
+
+    # A job picked up again after a worker crash skips the chunks it already saved
+    object_ids = job.object_ids[job.processed + job.failed:]
+    for start in range(0, len(object_ids), chunk_size):
+        chunk = object_ids[start:start + chunk_size]
+        try:
+            errors = handler(chunk, job.params)
+        except Exception as e:
+            errors = [f'{object_id}: {type(e).__name__}: {e}' for object_id in chunk]
+
+        failed_count = min(len(errors), len(chunk))
+        job.processed += len(chunk) - failed_count
+        job.failed += failed_count
+        if errors:
+            job.error_log += ''.join(f'{line}\n' for line in errors)
+        job.started_at = timezone.now()  # heartbeat: a live job is never treated as stale
+        job.save(update_fields=['processed', 'failed', 'error_log', 'started_at'])
+
+    job.status = 'done'
+    job.finished_at = timezone.now()
+    job.save(update_fields=['status', 'finished_at'])
+    return True
+
+
+def claim_admin_jobs(batch_size=1, stale_after=timedelta(minutes=10)):
+    """
+    Claim queued jobs (and ones stuck 'running' after a worker crash) for this worker.
+
+    Claimed one by one with a conditional UPDATE on the status and heartbeat that were read,
+    so several workers never run the same job, stale or not.
+    """
+    now = timezone.now()
+    due = (
+        AdminJob.objects
+        .filter(Q(status='queued') | Q(status='running', started_at__lt=now - stale_after))
+        .order_by('id')
+        .values_list('id', 'status', 'started_at')[:batch_size]
+    )
+    claimed_ids = [
+        job_id for job_id, current_status, started_at in due
+        if AdminJob.objects.filter(pk=job_id, status=current_status, started_at=started_at).update(
+            status='running', started_at=now,
+        )
+    ]
+    return list(AdminJob.objects.filter(id__in=claimed_ids).order_by('id'))
+
+
+def process_admin_jobs(batch_size=1):
+    """
+    Run one batch of queued admin jobs.
+
+    Returns:
+        dict: counts of 'done' and 'failed' jobs
+    """
+    counts = {'done': 0, 'failed': 0}
+    for job in claim_admin_jobs(batch_size=batch_size):
+        if run_admin_job(job):
+            counts['done'] += 1
+        else:
+            counts['failed'] += 1
+    return counts
@@ -0,0 +1,222 @@
+"""
+Admission queue and waitlist for oversubscribed events.
+
+Events with admission_queue_enabled do not register inside the request.
+The registration view only validates the form and hands out an
+AdmissionTicket; the run_admission_worker command admits tickets in FIFO
+order up to max_participants and puts the overflow on the waitlist.
+Waitlisted participants are promoted as seats are freed.
+
+Workers claim the head ticket of an event with a conditional UPDATE
+(queued -> processing), so overlapping workers never admit the same
+ticket and an event is drained by one worker at a time. A ticket whose
+admission keeps raising is marked failed after ADMISSION_MAX_ATTEMPTS
+instead of blocking its event's queue.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .email_services import create_participant_with_od, queue_qr_email_to_participant
+from .models import AdmissionTicket, Event, EventStats, Participant
+
+
+def enqueue_registration(user, event, answers=None):
+    """
+    Hand out a queue ticket for a registration attempt.
+
+    Returns:
+        tuple: (AdmissionTicket, created) - repeated attempts reuse the open ticket
+    """
+    open_tickets = AdmissionTicket.objects.filter(event=event, user=user, status__in=AdmissionTicket.OPEN_STATUSES)
+    existing = open_tickets.first()
+    if existing:
+        return existing, False
+    try:
+        with transaction.atomic():
+            return AdmissionTicket.objects.create(event=event, user=user, answers=answers or []), True
+    except IntegrityError:
+        # A concurrent request from the same user created the ticket first
+        return open_tickets.get(), False
+
+
+def _close_ticket(ticket, status, message, participant=None):
+    ticket.status = status
+    ticket.message = message
+    ticket.participant = participant
+    ticket.processed_at = timezone.now()
+    ticket.locked_at = None
+    ticket.save(update_fields=['status', 'message', 'participant', 'processed_at', 'locked_at'])
+
+
+def _add_to_waitlist(user, event, answers, payment_status):
+    """Create a waitlisted participant; returns None when the user is already registered"""
+    try:
+        with transaction.atomic():
+            return Participant.objects.create(
+                user=user,
+                event=event,
+                registration_status='waitlisted',
+                payment_status=payment_status,
+                answers=answers or []
+            )
+    except IntegrityError:
+        return None
+
+
+def admit_ticket(ticket):
+    """Register the ticket holder, waitlisting them when the event is full"""
+    event = ticket.event
+    user = ticket.user
+
+    clash_type, clash_message = event.check_time_clash(user)
+    if clash_type == 'block':
+        _close_ticket(ticket, 'rejected', clash_message or 'Registration blocked due to time clash')
+        return ticket
+
+    is_paid = event.payment_type == 'paid'
+    result = create_participant_with_od(
+        user, event, send_email=not is_paid, answers=ticket.answers, payment_status=not is_paid
+    )
+
+    if result['success']:
+        _close_ticket(ticket, 'admitted', result['message'][:255], result['participant'])
+    elif result['error_code'] == 'event_full':
+        participant = _add_to_waitlist(user, event, ticket.answers, not is_paid)
+        if participant:
+            _close_ticket(ticket, 'waitlisted', 'Event is full, added to the waitlist', participant)
+        else:
+            _close_ticket(ticket, 'rejected', 'Already registered')
+    elif result['error_code'] == 'already_registered':
+        _close_ticket(ticket, 'rejected', 'Already registered', result['participant'])
+    else:
+        # Unexpected failure - the worker puts the ticket back in the queue for a later pass
+        raise RuntimeError(result['message'])
+    return ticket
+
+
+def _claim_head_ticket(event_id, stale_after):
+    """
+    Claim the oldest open ticket of an event for this worker, or return None.
+
+    None when the queue is empty, when another worker is processing the
+    event (its ticket is claimed and not stale) or when another worker
+    claimed the head first.
+    """
+    now = timezone.now()
+    head = (
+        AdmissionTicket.objects
+        .filter(event_id=event_id, status__in=AdmissionTicket.OPEN_STATUSES)
+        .order_by('id')
+        .values('id', 'status', 'locked_at')
+        .first()
+    )
+    if head is None:
+        return None
+    if head['status'] == 'processing' and head['locked_at'] >= now - stale_after:
+        return None
+
+    # Only the worker that still sees the row as read wins it; a stale claim is taken over exactly once
+    claimed = AdmissionTicket.objects.filter(
+        pk=head['id'], status=head['status'], locked_at=head['locked_at']
+    ).update(status='processing', locked_at=now, attempts=F('attempts') + 1)
+    if not claimed:
+        return None
+    return AdmissionTicket.objects.select_related('event', 'user').get(pk=head['id'])
+
+
+def _release_ticket(ticket, error):
+    """Hand a ticket whose admission raised back to the queue, or fail it after ADMISSION_MAX_ATTEMPTS"""
+    message = f'{type(error).__name__}: {error}'[:255]
+    if ticket.attempts >= settings.ADMISSION_MAX_ATTEMPTS:
+        _close_ticket(ticket, 'failed', message)
+        return False
+    AdmissionTicket.objects.filter(pk=ticket.pk, status='processing').update(
+        status='queued', locked_at=None, message=message
+    )
+    return True
+
+
+def process_admission_queue(event_ids=None, batch_size=100, stale_after=timedelta(minutes=10)):
+    """
+    Admit up to batch_size queued tickets per event in FIFO order.
+
+    Tickets claimed by a worker that died are taken over after `stale_after`.
+
+    Returns:
+        dict: counts per resulting ticket status ('failed' also counts
+        attempts that will be retried)
+    """
+    counts = {'admitted': 0, 'waitlisted': 0, 'rejected': 0, 'failed': 0}
+
+    events = (
+        AdmissionTicket.objects
+        .filter(status__in=AdmissionTicket.OPEN_STATUSES)
+        .order_by()
+        .values_list('event_id', flat=True)
+        .distinct()
+    )
+    if event_ids:
+        events = events.filter(event_id__in=event_ids)
+
+    for event_id in list(events):
+        for _ in range(batch_size):
+            ticket = _claim_head_ticket(event_id, stale_after)
+            if ticket is None:
+                break
+            try:
+                admit_ticket(ticket)
+                counts[ticket.status] += 1
+            except Exception as e:
+                counts['failed'] += 1
+                if _release_ticket(ticket, e):
+                    # Keep FIFO order: later tickets must not overtake one that will be retried
+                    break
+
+    return counts
+
+
+def promote_waitlist(event):
+    """
+    Move waitlisted participants into freed seats in registration order.
+
+    Returns:
+        list: promoted Participant instances
+    """
+    promoted = []
+    while True:
+        with transaction.atomic():
+            candidate = (
+                Participant.objects
+                .filter(event=event, registration_status='waitlisted')
+                .order_by('id')
+                .first()
+            )
+            if candidate is None or not Event.reserve_seat(event.pk):
+                break
+            # The seat is already counted, so a plain UPDATE (no signals) is enough
+            claimed = Participant.objects.filter(
+                pk=candidate.pk, registration_status='waitlisted'
+            ).update(registration_status='confirmed', updated_at=timezone.now())
+            if not claimed:
+                # Someone else promoted or removed this participant; release the seat
+                transaction.set_rollback(True)
+                continue
+            if candidate.payment_status:
+                # Now a confirmed, paid participant
+                EventStats.adjust(event.pk, paid=1)
+
+        candidate.registration_status = 'confirmed'
+        candidate._loaded_registration_status = 'confirmed'
+        AdmissionTicket.objects.filter(participant=candidate, status='waitlisted').update(
+            status='admitted', message='Promoted from the waitlist', processed_at=timezone.now()
+        )
+        if candidate.can_attend:
+            # Creates the OD entry and queues the QR ticket mail
+            queue_qr_email_to_participant(candidate, force=False)
+        promoted.append(candidate)
+
+    return promoted
@@ -0,0 +1,129 @@
+"""
+Batch attendance marking for gate scanners.
+
+Scanner devices queue scans while offline (or just to save round trips on
+venue Wi-Fi) and flush them in one request. The whole batch is applied in a
+single transaction: one SELECT to classify the hashes, one UPDATE that
+marks every new one (keeping the device-side scan time) and one for the
+event's attended counter.
+"""
+from django.db import transaction
+from django.db.models import Case, DateTimeField, Value, When
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import EventStats, ODList
+from .tickets import is_ticket_token, verify_ticket_token
+
+
+def _parse_scanned_at(value, now):
+    """Device scan time as an aware datetime; missing -> now, unparseable -> None"""
+    if not value:
+        return now
+    scanned_at = parse_datetime(value) if isinstance(value, str) else None
+    if scanned_at is None:
+        return None
+    if timezone.is_naive(scanned_at):
+        scanned_at = timezone.make_aware(scanned_at)
+    # Devices with a fast clock must not stamp attendance in the future
+    return min(scanned_at, now)
+
+
+def mark_attendance_batch(event, scans):
+    """
+    Mark attendance for a batch of scans of one event.
+
+    Args:
+        event: Event the scanner is checking in
+        scans: list of {'hash', 'scanned_at', 'device_id'} dicts; hash is the
+            scanned QR value (OD hash or signed ticket token), scanned_at an
+            ISO 8601 string defaulting to the time of the upload
+
+    Returns:
+        list: one {'hash', 'status', 'attendance_marked_at'} dict per scan, in
+        order, with status 'marked', 'already_marked', 'unknown' or 'invalid'.
+        A hash scanned twice in the batch is marked at its earliest scan.
+    """
+    now = timezone.now()
+    parsed = []
+    for scan in scans:
+        scan = scan if isinstance(scan, dict) else {}
+        hash_value = scan.get('hash')
+        scanned_at = _parse_scanned_at(scan.get('scanned_at'), now)
+        valid = isinstance(hash_value, str) and bool(hash_value) and scanned_at is not None
+        parsed.append((hash_value if valid else None, scanned_at, str(scan.get('device_id') or '')[:64]))
+
+    # Signed tokens are verified in memory, then stand in for their entry's hash
+    token_hashes = _token_hashes(event, {value for value, _, _ in parsed if value and is_ticket_token(value)})
+    keys = {value: token_hashes.get(value, value) for value, _, _ in parsed if value}
+
+    # Earliest scan per ticket
+    first_scans = {}
+    for value, scanned_at, device_id in parsed:
+        if value is None:
+            continue
+        key = keys[value]
+        if key not in first_scans or scanned_at < first_scans[key][0]:
+            first_scans[key] = (scanned_at, device_id)
+
+    with transaction.atomic():
+        rows = list(
+            ODList.objects.select_for_update(of=('self',))
+            .filter(participant__event=event, hash__in=first_scans)
+            .values_list('hash', 'attendance', 'attendance_marked_at')
+        )
+        entries = {hash_value: marked_at for hash_value, _, marked_at in rows}
+        already_attended = {hash_value for hash_value, attendance, _ in rows if attendance}
+        to_mark = [hash_value for hash_value in entries if hash_value not in already_attended]
+
+        if to_mark:
+            marked_count = ODList.objects.filter(hash__in=to_mark, attendance=False).update(
+                attendance=True,
+                updated_at=timezone.now(),
+                attendance_marked_at=Case(
+                    *[When(hash=hash_value, then=Value(first_scans[hash_value][0])) for hash_value in to_mark],
+                    output_field=DateTimeField(),
+                ),
+                attendance_device=Case(
+                    *[When(hash=hash_value, then=Value(first_scans[hash_value][1])) for hash_value in to_mark],
+                    default=Value(''),
+                ),
+            )
+            EventStats.adjust(event.pk, attended=marked_count)
+
+    results = []
+    reported = set()
+    for value, scanned_at, device_id in parsed:
+        key = keys.get(value)
+        if value is None:
+            results.append({'hash': None, 'status': 'invalid', 'attendance_marked_at': None})
+        elif key not in entries:
+            results.append({'hash': value, 'status': 'unknown', 'attendance_marked_at': None})
+        elif key in already_attended or key in reported:
+            marked_at = entries[key] if key in already_attended else first_scans[key][0]
+            results.append({'hash': value, 'status': 'already_marked', 'attendance_marked_at': marked_at})
+        else:
+            reported.add(key)
+            results.append({'hash': value, 'status': 'marked', 'attendance_marked_at': first_scans[key][0]})
+    return results
+
+
+def _token_hashes(event, tokens):
+    """Map the valid signed tokens among `tokens` to their OD entry's hash (one query, none if no token verifies)"""
+    verified = {}
+    for token in tokens:
+        ticket = verify_ticket_token(token, event.id)
+        if ticket:
+            verified[ticket] = token
+    if not verified:
+        return {}
+
+    rows = ODList.objects.filter(
+        participant__event=event,
+        participant_id__in={participant_id for participant_id, _ in verified},
+    ).values_list('participant_id', 'ticket_version', 'hash')
+    return {
+        verified[(participant_id, version)]: hash_value
+        for participant_id, version, hash_value in rows
+        if (participant_id, version) in verified
+    }
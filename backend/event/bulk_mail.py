@@ -0,0 +1,152 @@
+"""
+Pooled, parallel sender for bulk QR emails.
+
+Admin bulk actions used to call send_registration_email() once per
+participant, opening a fresh SMTP connection (and TLS handshake) for every
+message. This sender splits the messages over a small thread pool where
+each thread keeps one SMTP connection open for its whole share, and a
+shared rate limiter keeps the overall send rate under the provider cap.
+"""
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from smtplib import SMTPServerDisconnected
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+
+from .email_services import build_registration_email
+from .models import EventStats, ODList
+from .qr_codes import prerender_qr_codes
+
+
+class RateLimiter:
+    """Thread-safe limiter spacing calls at most `per_second` apart (0 disables it)"""
+
+    def __init__(self, per_second):
+        self.interval = 1.0 / per_second if per_second else 0
+        self.next_slot = time.monotonic()
+        self.lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self.lock:
+            now = time.monotonic()
+            slot = max(self.next_slot, now)
+            self.next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def _open(connection):
+    """
+    Open the connection up front, so send_messages() reuses it instead of
+    opening and closing a session per message. A failure is left to the
+    sends, which then fail and are reported individually.
+    """
+    try:
+        connection.open()
+    except Exception:
+        pass
+
+
+def _send_share(messages, limiter):
+    """Send (od_list_id, message) pairs over one reused connection; returns per-message results"""
+    results = []
+    connection = get_connection()
+    _open(connection)
+    try:
+        for od_list_id, message in messages:
+            limiter.wait()
+            error = None
+            for attempt in range(2):
+                try:
+                    connection.send_messages([message])
+                    error = None
+                    break
+                except SMTPServerDisconnected as e:
+                    # The server dropped the pooled connection; reconnect once and retry
+                    error = e
+                    connection.close()
+                    _open(connection)
+                except Exception as e:
+                    error = e
+                    break
+            results.append((od_list_id, error))
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    return results
+
+
+def send_registration_emails_bulk(od_lists, workers=None, rate_limit=None):
+    """
+    Send registration QR emails for many OD entries over pooled connections.
+
+    Args:
+        od_lists: iterable of ODList instances (ideally with participant__user
+            and participant__event selected)
+        workers: number of parallel SMTP connections (default BULK_EMAIL_WORKERS)
+        rate_limit: maximum messages per second across all workers
+            (default BULK_EMAIL_RATE_LIMIT, 0 for no limit)
+
+    Returns:
+        list: one {'od_list': ODList, 'email': str, 'success': bool, 'error': str or None}
+        per OD entry, in input order. Successful entries are marked qr_sent.
+    """
+    workers = workers or settings.BULK_EMAIL_WORKERS
+    rate_limit = settings.BULK_EMAIL_RATE_LIMIT if rate_limit is None else rate_limit
+
+    od_lists = list(od_lists)
+    # Render missing QR images across processes before building the messages
+    prerender_qr_codes(
+        od_list.qr_value for od_list in od_lists
+        if od_list.participant.event.event_mode != 'online'
+    )
+
+    results = {}
+    messages = []
+    for od_list in od_lists:
+        try:
+            messages.append((od_list.id, build_registration_email(od_list)))
+        except Exception as e:
+            results[od_list.id] = f'{type(e).__name__}: {e}'
+
+    if messages:
+        workers = max(1, min(workers, len(messages)))
+        shares = [messages[i::workers] for i in range(workers)]
+        limiter = RateLimiter(rate_limit)
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            for share_results in executor.map(lambda share: _send_share(share, limiter), shares):
+                for od_list_id, error in share_results:
+                    results[od_list_id] = f'{type(error).__name__}: {error}' if error else None
+
+    sent_ids = [od_list_id for od_list_id, error in results.items() if error is None]
+    if sent_ids:
+        with transaction.atomic():
+            newly_sent = list(
+                ODList.objects.select_for_update()
+                .filter(id__in=sent_ids, qr_sent=False)
+                .values_list('id', 'event_id')
+            )
+            ODList.objects.filter(id__in=[od_list_id for od_list_id, _ in newly_sent]).update(qr_sent=True)
+            for event_id, count in Counter(event_id for _, event_id in newly_sent).items():
+                EventStats.adjust(event_id, qr_sent=count)
+
+    report = []
+    for od_list in od_lists:
+        error = results.get(od_list.id)
+        if error is None:
+            od_list.qr_sent = True
+        report.append({
+            'od_list': od_list,
+            'email': od_list.participant.user.email,
+            'success': error is None,
+            'error': error,
+        })
+    return report
@@ -0,0 +1,92 @@
+"""
+Conditional GET for the public, read-heavy event endpoints.
+
+Each endpoint computes a validator from one cheap aggregate over the rows it
+would serialize (row count, id sum, latest updated_at, plus whatever
+time-dependent flags the payload carries). A client or CDN presenting the
+same ETag gets `304 Not Modified` before any serialization happens.
+
+No Last-Modified is sent: deleted rows, the seat counter and the
+time-dependent flags change the payload without moving any updated_at, so
+an If-Modified-Since check would answer 304 for a stale copy.
+"""
+import hashlib
+
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import quote_etag
+
+from users.choice_lookups import choice_tables_version
+
+from .models import EventQuestion
+
+
+def _etag(*parts):
+    return quote_etag(hashlib.sha256('|'.join(str(part) for part in parts).encode()).hexdigest()[:32])
+
+
+def _question_state(questions):
+    return questions.order_by().aggregate(
+        count=Count('id'),
+        id_sum=Sum('id'),
+        last_modified=Max('updated_at'),
+    )
+
+
+def event_list_validator(events):
+    """ETag of a filtered event list (EventListSerializer fields)"""
+    now = timezone.now()
+    state = events.order_by().aggregate(
+        count=Count('id'),
+        id_sum=Sum('id'),
+        last_modified=Max('updated_at'),
+        # is_upcoming flips when an event starts
+        started=Count('id', filter=Q(event_date__lte=now)),
+    )
+    questions = _question_state(EventQuestion.objects.filter(event__in=events))
+    return _etag(
+        'events', state['count'], state['id_sum'], state['last_modified'], state['started'],
+        questions['count'], questions['id_sum'], questions['last_modified'], choice_tables_version(),
+    )
+
+
+def event_detail_validator(event):
+    """ETag of one event (EventSerializer fields, seat counter included)"""
+    questions = _question_state(event.questions.all())
+    return _etag(
+        'event', event.pk, event.updated_at, event.confirmed_count, event.is_upcoming, event.is_registration_open,
+        questions['count'], questions['id_sum'], questions['last_modified'], choice_tables_version(),
+    )
+
+
+def event_questions_validator(event):
+    """ETag of an event's registration questions"""
+    questions = _question_state(event.questions.all())
+    return _etag('questions', event.pk, questions['count'], questions['id_sum'], questions['last_modified'])
+
+
+def event_guide_validator(guide):
+    return _etag('guide', guide.pk, guide.updated_at)
+
+
+def event_categories_validator():
+    return _etag('event_categories', choice_tables_version())
+
+
+def conditional_get(request, etag, respond, **cache_control):
+    """
+    Answer a GET with 304 when the client's ETag still matches, otherwise with `respond()`.
+
+    Args:
+        etag: quoted ETag from one of the validators above
+        respond: builds the full response; not called for a 304
+        cache_control: Cache-Control directives for patch_cache_control
+    """
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = respond()
+    if response.status_code in (200, 304):
+        response['ETag'] = etag
+        patch_cache_control(response, **cache_control)
+    return response
@@ -1,29 +1,25 @@
-import qrcode
 from io import BytesIO
-from django.core.mail import EmailMultiAlternatives
+from datetime import timedelta
+from django.core.mail import EmailMultiAlternatives, get_connection
 from django.template.loader import render_to_string
 from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
 from django.utils.html import format_html
-from .models import ODList, Participant
+from django.utils.http import urlsafe_base64_encode
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import Event, EventStats, ODList, OutboundEmail, Participant
+from .qr_codes import get_qr_png, prerender_qr_codes
 from email.mime.image import MIMEImage
 
-def generate_qr_code(hash_value):
-    """Generate QR code image for the hash"""
-    qr = qrcode.QRCode(version=1, box_size=10, border=5)
-    qr.add_data(hash_value)
-    qr.make(fit=True)
-    img = qr.make_image(fill='black', back_color='white')
-
-    buffer = BytesIO()
-    img.save(buffer, format='PNG')
-    buffer.seek(0)
-    return buffer
-
-def send_registration_email(od_list):
-    """Send email with hosted logo (URL) and inline QR code (MIMEImage) for offline events only."""
-    if not isinstance(od_list, ODList):
-        return False
+def generate_qr_code(hash_value, variant='full'):
+    """Return a buffer with the QR code PNG for the hash, served from the on-disk QR cache"""
+    return BytesIO(get_qr_png(hash_value, variant))
 
+def build_registration_email(od_list):
+    """Build the registration email with hosted logo (URL) and inline QR code (MIMEImage) for offline events only."""
     participant = od_list.participant
     user = participant.user
     event = participant.event
@@ -31,11 +27,10 @@ def send_registration_email(od_list):
     # Check if event is online - skip QR code generation for online events
     is_online_event = getattr(event, 'event_mode', 'offline') == 'online'
 
-    # 1) Generate QR code in memory (only for offline events)
+    # 1) Load the compact, cached QR code (only for offline events)
     qr_bytes = None
     if not is_online_event:
-        qr_buffer = generate_qr_code(od_list.hash)
-        qr_bytes = qr_buffer.getvalue()
+        qr_bytes = get_qr_png(od_list.qr_value, 'email')
 
     # 2) Hosted logo URL (update url according to your deployment)
     logo_url = "https://raw.githubusercontent.com/Chandhru-241801035/FloatChat-API-Documentation/refs/heads/main/DEVS_White.png"
@@ -52,7 +47,6 @@ def send_registration_email(od_list):
     }
 
     # 4) Render HTML
-    print(f"User: {user}, First name: {user.first_name}, Last name: {user.last_name}")
     html_message = render_to_string('event/registration_email.html', context)
 
     # 5) Email setup
@@ -73,11 +67,21 @@ def send_registration_email(od_list):
         except Exception as e:
             print("Failed to attach QR image:", e)
 
-    # 7) Send email
+    return email
+
+
+def send_registration_email(od_list):
+    """Send the registration email synchronously. Request handlers should use enqueue_registration_email()."""
+    if not isinstance(od_list, ODList):
+        return False
+
+    user = od_list.participant.user
+    email = build_registration_email(od_list)
+
     try:
         print(f"User: {user}, First name: {user.first_name}, Last name: {user.last_name}")
         print(f"Sending email to: {user.email}")
-        print(f"Email subject: {subject}")
+        print(f"Email subject: {email.subject}")
         print(f"Email backend: {settings.EMAIL_BACKEND}")
         print(f"Email host: {settings.EMAIL_HOST}")
         print(f"Email port: {settings.EMAIL_PORT}")
@@ -95,6 +99,247 @@ def send_registration_email(od_list):
         return False
 
 
+# ========== TRANSACTIONAL MAIL OUTBOX ==========
+
+def enqueue_email(subject, body, to_email, html_message=None, from_email=None):
+    """Queue a plain transactional email for the mail worker"""
+    return OutboundEmail.objects.create(
+        kind='message',
+        to_email=to_email,
+        subject=subject,
+        body=body,
+        html_body=html_message or '',
+        from_email=from_email or '',
+    )
+
+
+def enqueue_registration_email(od_list):
+    """
+    Queue the registration QR email for an OD entry.
+
+    The QR image and template are rendered by the worker, not the request.
+    An already queued, undelivered email for the same OD entry is reused.
+    """
+    existing = OutboundEmail.objects.filter(
+        od_list=od_list, kind='registration_qr', status__in=['pending', 'sending']
+    ).first()
+    if existing:
+        return existing
+    return OutboundEmail.objects.create(
+        kind='registration_qr',
+        od_list=od_list,
+        to_email=od_list.participant.user.email,
+    )
+
+
+def enqueue_password_reset_email(user):
+    """
+    Queue a password reset email for a user.
+
+    Only the user is stored: the worker makes the reset token and renders the
+    mail at send time, so no reset link sits in the outbox. An already queued,
+    undelivered reset email for the same user is reused.
+    """
+    existing = OutboundEmail.objects.filter(
+        user=user, kind='password_reset', status__in=['pending', 'sending']
+    ).first()
+    if existing:
+        return existing
+    return OutboundEmail.objects.create(kind='password_reset', user=user, to_email=user.email)
+
+
+def build_password_reset_email(user):
+    """Build the password reset email with a reset token made now"""
+    context = {
+        'email': user.email,
+        'domain': settings.SITE_DOMAIN,
+        'site_name': settings.SITE_NAME,
+        'uid': urlsafe_base64_encode(force_bytes(user.pk)),
+        'user': user,
+        'token': default_token_generator.make_token(user),
+        'protocol': settings.SITE_PROTOCOL,
+    }
+    email = EmailMultiAlternatives(
+        subject=render_to_string('registration/password_reset_subject.txt', context).strip(),
+        body=render_to_string('registration/password_reset_email.txt', context),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[user.email],
+    )
+    email.attach_alternative(render_to_string('registration/password_reset_email.html', context), "text/html")
+    return email
+
+
+def queue_qr_email_to_participant(participant, force=False):
+    """
+    Outbox counterpart of send_qr_email_to_participant().
+
+    Returns:
+        dict: {'success': bool, 'message': str, 'od_list': ODList or None}
+    """
+    if not isinstance(participant, Participant):
+        return {'success': False, 'message': 'Invalid participant', 'od_list': None}
+
+    try:
+        od_list, created = ODList.objects.get_or_create(
+            participant=participant,
+            event=participant.event,
+            defaults={'hash': None}
+        )
+
+        if not force and od_list.qr_sent:
+            return {
+                'success': False,
+                'message': 'QR email already sent',
+                'od_list': od_list
+            }
+
+        enqueue_registration_email(od_list)
+        message = 'QR email queued'
+        if created:
+            message += ' (OD entry created)'
+        return {
+            'success': True,
+            'message': message,
+            'od_list': od_list
+        }
+
+    except Exception as e:
+        return {
+            'success': False,
+            'message': f'Error queueing email: {str(e)}',
+            'od_list': None
+        }
+
+
+def build_outbound_message(outbound, connection=None):
+    """Turn an OutboundEmail row into a sendable EmailMessage"""
+    if outbound.kind == 'registration_qr':
+        email = build_registration_email(outbound.od_list)
+        email.to = [outbound.to_email]
+    elif outbound.kind == 'password_reset':
+        email = build_password_reset_email(outbound.user)
+    else:
+        email = EmailMultiAlternatives(
+            subject=outbound.subject,
+            body=outbound.body,
+            from_email=outbound.from_email or settings.DEFAULT_FROM_EMAIL,
+            to=[outbound.to_email],
+        )
+        if outbound.html_body:
+            email.attach_alternative(outbound.html_body, "text/html")
+    email.connection = connection
+    return email
+
+
+def _outbox_backoff(attempts):
+    """Seconds to wait before the next attempt after `attempts` failures"""
+    delay = settings.MAIL_OUTBOX_BACKOFF_SECONDS * (2 ** (attempts - 1))
+    return min(delay, settings.MAIL_OUTBOX_MAX_BACKOFF_SECONDS)
+
+
+def claim_outbound_emails(batch_size=50, stale_after=timedelta(minutes=10)):
+    """
+    Claim due outbox rows for this worker.
+
+    Rows are claimed one by one with a conditional UPDATE, so several workers
+    can drain the outbox without sending the same email twice. Rows stuck in
+    'sending' (a worker died mid-send) are reclaimed after `stale_after`.
+    """
+    now = timezone.now()
+    due = (
+        OutboundEmail.objects
+        .filter(
+            Q(status='pending', next_attempt_at__lte=now) |
+            Q(status='sending', locked_at__lt=now - stale_after)
+        )
+        .order_by('next_attempt_at', 'id')
+        .values_list('id', 'status')[:batch_size]
+    )
+    claimed_ids = [
+        email_id for email_id, current_status in due
+        if OutboundEmail.objects.filter(pk=email_id, status=current_status).update(status='sending', locked_at=now)
+    ]
+    return list(
+        OutboundEmail.objects
+        .filter(id__in=claimed_ids)
+        .select_related('od_list__participant__user', 'od_list__participant__event', 'user')
+        .order_by('id')
+    )
+
+
+def deliver_outbound_email(outbound, connection=None):
+    """
+    Send one claimed outbox row and record the outcome.
+
+    Failures are retried with exponential backoff until
+    MAIL_OUTBOX_MAX_ATTEMPTS is reached, then dead-lettered.
+
+    Returns:
+        bool: True when the email was sent
+    """
+    outbound.attempts += 1
+    try:
+        build_outbound_message(outbound, connection).send()
+    except Exception as e:
+        outbound.last_error = f'{type(e).__name__}: {e}'
+        outbound.locked_at = None
+        if outbound.attempts >= settings.MAIL_OUTBOX_MAX_ATTEMPTS:
+            outbound.status = 'dead'
+        else:
+            outbound.status = 'pending'
+            outbound.next_attempt_at = timezone.now() + timedelta(seconds=_outbox_backoff(outbound.attempts))
+        outbound.save(update_fields=['attempts', 'last_error', 'locked_at', 'status', 'next_attempt_at'])
+        return False
+
+    outbound.status = 'sent'
+    outbound.sent_at = timezone.now()
+    outbound.locked_at = None
+    outbound.last_error = ''
+    outbound.save(update_fields=['attempts', 'status', 'sent_at', 'locked_at', 'last_error'])
+    if outbound.od_list_id:
+        with transaction.atomic():
+            if ODList.objects.filter(pk=outbound.od_list_id, qr_sent=False).update(qr_sent=True):
+                EventStats.adjust(outbound.od_list.event_id, qr_sent=1)
+    return True
+
+
+def process_mail_outbox(batch_size=50):
+    """
+    Claim and deliver one batch of due emails over a single SMTP connection.
+
+    Returns:
+        dict: {'sent': int, 'failed': int}
+    """
+    emails = claim_outbound_emails(batch_size=batch_size)
+    counts = {'sent': 0, 'failed': 0}
+    if not emails:
+        return counts
+
+    prerender_qr_codes(
+        outbound.od_list.qr_value for outbound in emails
+        if outbound.od_list_id and outbound.od_list.participant.event.event_mode != 'online'
+    )
+
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception:
+        # Let each message fail and back off individually
+        pass
+    try:
+        for outbound in emails:
+            if deliver_outbound_email(outbound, connection):
+                counts['sent'] += 1
+            else:
+                counts['failed'] += 1
+    finally:
+        try:
+            connection.close()
+        except Exception:
+            pass
+    return counts
+
+
 def send_qr_email_to_participant(participant, force=False):
     """
     Centralized QR email sending logic for participants.
@@ -148,19 +393,28 @@ def send_qr_email_to_participant(participant, force=False):
             'od_list': None
         }
 
-def create_participant_with_od(user, event, send_email=True, answers=None, payment_status=True):
+def create_participant_with_od(user, event, send_email=True, answers=None, payment_status=True, overbook=False):
     """
     Centralized participant creation with OD handling.
 
+    New registrations claim a seat with Event.reserve_seat() inside the same
+    transaction that inserts the participant, so concurrent requests cannot
+    oversell the event and a duplicate registration rolls the seat back.
+    Staff bookings pass overbook=True and are counted without the capacity
+    check, so an admin can still add people to a full event.
+
     Args:
         user: User instance
         event: Event instance
-        send_email: Whether to send QR email immediately
+        send_email: Whether to queue the QR email for the mail worker
         answers: List of answer dictionaries (optional)
         payment_status: Initial payment status (default True for free events)
+        overbook: Skip the capacity check (internal bookings by staff)
 
     Returns:
-        dict: {'success': bool, 'participant': Participant or None, 'od_list': ODList or None, 'message': str}
+        dict: {'success': bool, 'participant': Participant or None, 'od_list': ODList or None,
+               'message': str, 'error_code': str or None}
+        error_code is 'already_registered' or 'event_full' for the expected conflicts.
     """
     try:
         print(f"[PARTICIPANT_DEBUG] Creating participant for user: {user.username}, event: {event.event_name}")
@@ -173,7 +427,8 @@ def create_participant_with_od(user, event, send_email=True, answers=None, payme
                     'success': False,
                     'participant': existing_participant,
                     'od_list': None,
-                    'message': 'User already fully registered'
+                    'message': 'User already fully registered',
+                    'error_code': 'already_registered'
                 }
             else:
                 print(f"[PARTICIPANT_DEBUG] Updating payment status for existing participant")
@@ -185,13 +440,35 @@ def create_participant_with_od(user, event, send_email=True, answers=None, payme
                 message = 'Payment approved for existing registration'
         else:
             print(f"[PARTICIPANT_DEBUG] Creating new participant")
-            participant = Participant.objects.create(
-                user=user,
-                event=event,
-                registration_status='confirmed',
-                payment_status=payment_status,
-                answers=answers or []
-            )
+            try:
+                with transaction.atomic():
+                    if not overbook and not Event.reserve_seat(event.pk):
+                        return {
+                            'success': False,
+                            'participant': None,
+                            'od_list': None,
+                            'message': 'Event is full',
+                            'error_code': 'event_full'
+                        }
+                    participant = Participant(
+                        user=user,
+                        event=event,
+                        registration_status='confirmed',
+                        payment_status=payment_status,
+                        answers=answers or []
+                    )
+                    # Overbooked seats are counted by the post_save signal instead
+                    participant._seat_reserved = not overbook
+                    participant.save(force_insert=True)
+            except IntegrityError:
+                # A concurrent request registered this user first; the seat was rolled back
+                return {
+                    'success': False,
+                    'participant': None,
+                    'od_list': None,
+                    'message': 'User already registered',
+                    'error_code': 'already_registered'
+                }
             print(f"[PARTICIPANT_DEBUG] New participant created with ID: {participant.id}, payment_status: {payment_status}")
             message = 'Participant created successfully'
 
@@ -202,20 +479,16 @@ def create_participant_with_od(user, event, send_email=True, answers=None, payme
             print(f"[PARTICIPANT_DEBUG] OD list created with ID: {od_list.id}, hash: {od_list.hash}")
 
             if send_email:
-                print(f"[PARTICIPANT_DEBUG] Sending QR email")
-                email_result = send_qr_email_to_participant(participant, force=False)
-                if email_result['success']:
-                    message += ' and QR email sent'
-                    print(f"[PARTICIPANT_DEBUG] QR email sent successfully")
-                else:
-                    message += f' but email failed: {email_result["message"]}'
-                    print(f"[PARTICIPANT_DEBUG] QR email failed: {email_result['message']}")
+                print(f"[PARTICIPANT_DEBUG] Queueing QR email")
+                enqueue_registration_email(od_list)
+                message += ' and QR email queued'
 
             return {
                 'success': True,
                 'participant': participant,
                 'od_list': od_list,
-                'message': message
+                'message': message,
+                'error_code': None
             }
         else:
             print(f"[PARTICIPANT_DEBUG] Participant cannot attend yet - OD not created")
@@ -223,7 +496,8 @@ def create_participant_with_od(user, event, send_email=True, answers=None, payme
                 'success': True,
                 'participant': participant,
                 'od_list': None,
-                'message': f'{message} but OD not created yet'
+                'message': f'{message} but OD not created yet',
+                'error_code': None
             }
 
     except Exception as e:
@@ -234,7 +508,8 @@ def create_participant_with_od(user, event, send_email=True, answers=None, payme
             'success': False,
             'participant': None,
             'od_list': None,
-            'message': f'Error creating participant: {str(e)}'
+            'message': f'Error creating participant: {str(e)}',
+            'error_code': None
         }
 
 def get_participant_qr_status(participant):
@@ -247,29 +522,33 @@ def get_participant_qr_status(participant):
     Returns:
         dict: {'status': str, 'od_exists': bool, 'qr_sent': bool, 'color': str}
     """
-    try:
-        od_list = ODList.objects.get(participant=participant)
-        if od_list.qr_sent:
-            return {
-                'status': 'Sent',
-                'od_exists': True,
-                'qr_sent': True,
-                'color': 'green'
-            }
-        else:
-            return {
-                'status': 'Pending',
-                'od_exists': True,
-                'qr_sent': False,
-                'color': 'orange'
-            }
-    except ODList.DoesNotExist:
+    if hasattr(participant, 'od_exists'):
+        # Annotated by ParticipantAdmin.get_queryset: no extra query
+        od_exists, qr_sent = participant.od_exists, bool(participant.od_qr_sent)
+    else:
+        od_list = ODList.objects.filter(participant=participant).only('qr_sent').first()
+        od_exists, qr_sent = od_list is not None, bool(od_list and od_list.qr_sent)
+
+    if not od_exists:
         return {
             'status': 'No OD',
             'od_exists': False,
             'qr_sent': False,
             'color': 'red'
         }
+    if qr_sent:
+        return {
+            'status': 'Sent',
+            'od_exists': True,
+            'qr_sent': True,
+            'color': 'green'
+        }
+    return {
+        'status': 'Pending',
+        'od_exists': True,
+        'qr_sent': False,
+        'color': 'orange'
+    }
 
 def get_participant_qr_status_html(participant):
     """Get QR status as HTML span for admin display"""
@@ -329,12 +608,15 @@ def format_csv_row(participant, event, idx):
     user_info = extract_user_info(participant.user)
 
     reg_date = participant.registered_at.strftime('%Y-%m-%d %H:%M') if hasattr(participant, 'registered_at') and participant.registered_at else 'Unknown'
-    # Check attendance using prefetched related manager if present, otherwise query
-    try:
-        od_entry = participant.registered_participants.first()
-    except Exception:
-        od_entry = ODList.objects.filter(participant=participant).first()
-    attendance_status = 'Present' if od_entry and od_entry.attendance else 'Absent'
+    # Use the `attended` annotation when the caller provides it, otherwise query
+    attended = getattr(participant, 'attended', None)
+    if attended is None:
+        try:
+            od_entry = participant.registered_participants.first()
+        except Exception:
+            od_entry = ODList.objects.filter(participant=participant).first()
+        attended = bool(od_entry and od_entry.attendance)
+    attendance_status = 'Present' if attended else 'Absent'
     payment_status = 'Paid' if participant.payment_status else 'Unpaid' if event.payment_type == 'paid' else 'Unknown'
     team_name = 'Unknown'  # team_name field doesn't exist on Participant model
     special_reqs = 'Unknown'  # special_requirements field doesn't exist on Participant model
@@ -0,0 +1,233 @@
+"""
+CSV row generators for OD lists and event analysis reports.
+
+Rows are produced by generators over queryset.iterator(), so memory use
+stays constant however large the event is. The report worker
+(event/reports.py) writes them to a stored artifact.
+"""
+from django.db.models import Case, CharField, Count, Exists, OuterRef, Q, Value, When
+from django.db.models.functions import StrIndex, Substr
+from django.utils import timezone
+
+from .email_services import format_csv_row
+from .models import ODList
+
+# Rows fetched from the database per round trip while streaming
+EXPORT_CHUNK_SIZE = 2000
+
+# Aggregate filter for participants whose OD entry is marked attended
+ATTENDED = Q(registered_participants__attendance=True)
+
+
+def with_attendance(participants):
+    """Annotate participants with `attended` instead of fetching their OD entries row by row"""
+    return participants.annotate(
+        attended=Exists(ODList.objects.filter(participant=OuterRef('pk'), attendance=True))
+    )
+
+
+# ========== OD LIST ==========
+
+def iter_od_list_rows(event, od_list_entries, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the rows of an event OD list CSV"""
+    # Header
+    yield [f'{event.event_name} - OD list']
+    yield []  # Empty row
+
+    # Column headers
+    yield [
+        'Username',
+        'User Email',
+        'Roll Number',
+        'Degree',
+        'Year',
+        'Department',
+        'College Name',
+        'Attended'
+    ]
+
+    # OD list entry data
+    for od_entry in od_list_entries.iterator(chunk_size=chunk_size):
+        participant = od_entry.participant
+        profile = getattr(participant.user, 'profile', None)
+
+        yield [
+            participant.user.username,
+            participant.user.email,
+            profile.rollno if profile else 'Unknown',
+            profile.degree if profile and profile.degree else 'Unknown',
+            profile.year if profile and profile.year else 'Unknown',
+            profile.department if profile and profile.department else 'Unknown',
+            profile.college_name if profile else 'Unknown',
+            'Yes' if od_entry.attendance else 'No'
+        ]
+
+
+# ========== EVENT ANALYSIS ==========
+
+def iter_analysis_rows(event, participants, chunk_size=EXPORT_CHUNK_SIZE):
+    """Yield the rows of the comprehensive event analysis CSV"""
+    # SECTION 1: Event Summary
+    yield ['=' * 80]
+    yield [f'EVENT ANALYSIS REPORT: {event.event_name}']
+    yield ['=' * 80]
+    yield ['Generated on:', timezone.now().strftime('%Y-%m-%d %H:%M:%S')]
+    yield ['Event Date:', event.event_date.strftime('%Y-%m-%d %H:%M:%S')]
+    yield ['Event Type:', event.event_type.display_name]
+    yield ['Payment Type:', event.get_payment_type_display()]
+    yield ['Participation Type:', event.get_participation_type_display()]
+    yield []
+
+    # Summary statistics in one aggregate query
+    summary = _summary_counts(participants)
+    total_registered = summary['total']
+    total_present = summary['present']
+    total_absent = total_registered - total_present
+    attendance_rate = (total_present / total_registered * 100) if total_registered > 0 else 0
+
+    yield ['📊 EVENT SUMMARY']
+    yield ['-' * 40]
+    yield ['Total Registrations:', total_registered]
+    yield ['Total Present:', total_present]
+    yield ['Total Absent:', total_absent]
+    yield ['Attendance Rate:', f'{attendance_rate:.2f}%']
+    yield []
+
+    # SECTION 2: Department-wise Analysis
+    yield ['🏛️ DEPARTMENT-WISE ANALYSIS']
+    yield ['-' * 50]
+    yield ['Department', 'Registered', 'Present', 'Absent', 'Attendance %']
+    yield from _stats_rows(_get_department_stats(participants).items())
+    yield []
+
+    # SECTION 3: Year-wise Analysis
+    yield ['📅 YEAR-WISE ANALYSIS']
+    yield ['-' * 40]
+    yield ['Year', 'Registered', 'Present', 'Absent', 'Attendance %']
+    yield from _stats_rows(_get_year_stats(participants).items())
+    yield []
+
+    # SECTION 4: College-wise Analysis
+    yield ['🏫 COLLEGE-WISE ANALYSIS']
+    yield ['-' * 40]
+    yield ['College', 'Registered', 'Present', 'Absent', 'Attendance %']
+    yield from _stats_rows(_get_college_stats(participants).items())
+    yield []
+
+    # SECTION 5: Payment Analysis (if applicable)
+    if event.payment_type == 'paid':
+        yield ['💳 PAYMENT ANALYSIS']
+        yield ['-' * 30]
+        paid_count = summary['paid']
+        unpaid_count = total_registered - paid_count
+        payment_rate = (paid_count / total_registered * 100) if total_registered > 0 else 0
+
+        yield ['Total Paid:', paid_count]
+        yield ['Total Unpaid:', unpaid_count]
+        yield ['Payment Rate:', f'{payment_rate:.2f}%']
+        yield []
+
+    # SECTION 6: Complete Participants List
+    yield ['👥 COMPLETE PARTICIPANTS LIST']
+    yield ['=' * 80]
+    yield [
+        'S.No', 'Name', 'Email', 'Roll No', 'Degree', 'Year', 'Department',
+        'College', 'Phone', 'Registration Date', 'Attendance Status',
+        'Payment Status', 'Team Name', 'Special Requirements'
+    ]
+
+    ordered = with_attendance(participants).order_by('user__first_name')
+    for idx, participant in enumerate(ordered.iterator(chunk_size=chunk_size), 1):
+        yield format_csv_row(participant, event, idx)
+
+
+def _stats_rows(stats_items):
+    for group, stats in stats_items:
+        attendance_pct = (stats['present'] / stats['total'] * 100) if stats['total'] > 0 else 0
+        yield [
+            group,
+            stats['total'],
+            stats['present'],
+            stats['absent'],
+            f'{attendance_pct:.1f}%'
+        ]
+
+
+def _summary_counts(participants):
+    """Registration, attendance and payment totals in a single aggregate query"""
+    return participants.order_by().aggregate(
+        total=Count('id'),
+        present=Count('id', filter=ATTENDED),
+        paid=Count('id', filter=Q(payment_status=True)),
+    )
+
+
+def _grouped_stats(participants, key, label_of):
+    """
+    Count registered/present participants per `key` with one GROUP BY query.
+
+    label_of maps each raw key value to its report label; groups that share
+    a label (e.g. NULL and '' both shown as 'Unknown') are merged.
+    """
+    rows = (
+        participants.order_by()
+        .values(key)
+        .annotate(total=Count('id'), present=Count('id', filter=ATTENDED))
+    )
+    stats = {}
+    for row in rows:
+        group = stats.setdefault(label_of(row[key]), {'total': 0, 'present': 0, 'absent': 0})
+        group['total'] += row['total']
+        group['present'] += row['present']
+        group['absent'] += row['total'] - row['present']
+    return dict(sorted(stats.items()))
+
+
+def _department_names():
+    """Department code -> display name, active dynamic choices overriding the static ones"""
+    from users.choice_lookups import get_choice_tables
+    from users.choices import DEPARTMENT_CHOICES
+
+    names = dict(DEPARTMENT_CHOICES)
+    names.update(get_choice_tables()['department_names'])
+    return names
+
+
+def _get_department_stats(participants):
+    """Calculate department-wise statistics"""
+    names = _department_names()
+    return _grouped_stats(
+        participants,
+        'user__profile__department',
+        lambda code: names.get(code, code) if code else 'Unknown',
+    )
+
+
+def _get_year_stats(participants):
+    """Calculate year-wise statistics"""
+    # Same rule as _extract_year_from_email: a local part of 9+ characters
+    # starting with two digits gives the batch year; the digit check is
+    # done on the (few) grouped codes in Python
+    participants = participants.annotate(
+        local_part_length=StrIndex('user__email', Value('@')) - 1,
+    ).annotate(
+        year_code=Case(
+            When(local_part_length__gte=9, then=Substr('user__email', 1, 2)),
+            default=Value(None),
+            output_field=CharField(),
+        )
+    )
+    return _grouped_stats(
+        participants,
+        'year_code',
+        lambda code: f'20{code}' if code and code.isdigit() else 'Unknown',
+    )
+
+
+def _get_college_stats(participants):
+    """Calculate college-wise statistics"""
+    return _grouped_stats(
+        participants,
+        'user__profile__college_name',
+        lambda college: college if college is not None else 'Unknown',
+    )
@@ -0,0 +1,95 @@
+"""
+Live attendance stream for check-in dashboards (server-sent events).
+
+A dashboard holds one `text/event-stream` connection per event instead of
+re-fetching the whole OD list every few seconds. The stream opens with the
+running totals, then every ATTENDANCE_STREAM_POLL_SECONDS compares the
+event's attended OD ids with the ones already pushed (one narrow query) and,
+only when something changed, sends the new marks and the updated totals.
+
+Polling the database keeps the stream correct across worker processes and
+for every way attendance changes (single scans, batch uploads with device
+timestamps, admin actions). Serve the project through radiumB.asgi so open
+streams do not hold a worker thread; streams close after
+ATTENDANCE_STREAM_MAX_SECONDS and EventSource reconnects on its own.
+"""
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+
+from .exports import _get_department_stats, _summary_counts
+from .models import ODList, Participant
+
+
+def _sse(event, data):
+    return f'event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+
+
+def attendance_totals(event):
+    """Present / absent / total, overall and by department"""
+    participants = Participant.objects.filter(event=event)
+    summary = _summary_counts(participants)
+    return {
+        'total': summary['total'],
+        'present': summary['present'],
+        'absent': summary['total'] - summary['present'],
+        'by_department': _get_department_stats(participants),
+    }
+
+
+def _attended_ids(event):
+    return set(
+        ODList.objects.filter(participant__event=event, attendance=True)
+        .order_by()
+        .values_list('id', flat=True)
+    )
+
+
+def attendance_delta(event, known_ids):
+    """
+    Attendance changes since `known_ids` was taken.
+
+    Returns:
+        tuple: (delta dict or None when nothing changed, current attended ids)
+    """
+    from .serializers import ScanResultSerializer
+
+    current_ids = _attended_ids(event)
+    marked_ids = current_ids - known_ids
+    unmarked_ids = known_ids - current_ids
+    if not marked_ids and not unmarked_ids:
+        return None, current_ids
+
+    marked = ODList.objects.filter(id__in=marked_ids).select_related('participant__user__profile').order_by('attendance_marked_at', 'id')
+    delta = {
+        'marked': [dict(ScanResultSerializer(od_entry).data, id=od_entry.id) for od_entry in marked],
+        'unmarked': sorted(unmarked_ids),
+        'totals': attendance_totals(event),
+    }
+    return delta, current_ids
+
+
+def _snapshot(event):
+    return attendance_totals(event), _attended_ids(event)
+
+
+async def attendance_event_stream(event):
+    """Async iterator of SSE messages for one dashboard connection"""
+    poll_seconds = settings.ATTENDANCE_STREAM_POLL_SECONDS
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.ATTENDANCE_STREAM_MAX_SECONDS
+
+    totals, known_ids = await sync_to_async(_snapshot)(event)
+    yield f'retry: {int(poll_seconds * 1000)}\n' + _sse('totals', totals)
+
+    while loop.time() < deadline:
+        await asyncio.sleep(poll_seconds)
+        delta, known_ids = await sync_to_async(attendance_delta)(event, known_ids)
+        if delta:
+            yield _sse('attendance', delta)
+        else:
+            # Comment line: keeps proxies from closing an idle connection
+            yield ': keepalive\n\n'
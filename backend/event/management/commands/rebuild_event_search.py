@@ -0,0 +1,30 @@
+"""
+Management command to (re)create the event full-text search index and its sync triggers
+"""
+from django.core.management.base import BaseCommand
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+
+from event.search import install_search_index
+
+
+class Command(BaseCommand):
+    help = 'Recreate the event search index, its triggers and its contents (run after migrations that rebuild event_event on SQLite)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database to rebuild the index in',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        with transaction.atomic(using=connection.alias):
+            installed = install_search_index(connection)
+
+        if installed:
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt the {connection.vendor} event search index"))
+        else:
+            self.stdout.write(self.style.WARNING(
+                f"No full-text index for {connection.vendor}; ?search= falls back to icontains"
+            ))
@@ -0,0 +1,64 @@
+"""
+Management command to recompute EventStats counters from Participant and ODList rows
+"""
+from django.core.management.base import BaseCommand
+from event.models import Event, EventStats
+
+
+class Command(BaseCommand):
+    help = 'Recompute the per-event registration / OD / attendance counters'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event',
+            type=int,
+            action='append',
+            dest='event_ids',
+            help='Only reconcile the given event id (can be repeated)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be updated without making changes',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        events = Event.objects.select_related('stats')
+        if options['event_ids']:
+            events = events.filter(id__in=options['event_ids'])
+
+        checked_count = 0
+        repaired_count = 0
+
+        for event in events:
+            checked_count += 1
+            actual = EventStats.count(event.id)
+            stats = getattr(event, 'stats', None)
+            stored = {field: getattr(stats, field) for field in EventStats.COUNTER_FIELDS} if stats else {}
+            drift = {
+                field: (stored.get(field), actual[field])
+                for field in EventStats.COUNTER_FIELDS
+                if stored.get(field) != actual[field]
+            }
+            if not drift:
+                continue
+
+            repaired_count += 1
+            changes = ', '.join(f"{field} {old} -> {new}" for field, (old, new) in drift.items())
+            message = f"{event.event_name} (ID: {event.id}): {changes}"
+            if dry_run:
+                self.stdout.write(f"Would repair {message}")
+            else:
+                EventStats.refresh(event.id)
+                self.stdout.write(self.style.SUCCESS(f"Repaired {message}"))
+
+        self.stdout.write("\n" + "=" * 50)
+        if dry_run:
+            self.stdout.write(self.style.SUCCESS("DRY RUN COMPLETE"))
+            self.stdout.write(f"Would repair: {repaired_count} events")
+        else:
+            self.stdout.write(self.style.SUCCESS("REPAIR COMPLETE"))
+            self.stdout.write(f"Repaired: {repaired_count} events")
+        self.stdout.write(f"Checked: {checked_count} events")
@@ -0,0 +1,58 @@
+"""
+Management command to recompute Event.confirmed_count from Participant rows
+"""
+from django.core.management.base import BaseCommand
+from django.db.models import Count, Q
+from event.models import Event
+
+
+class Command(BaseCommand):
+    help = 'Recompute the denormalized confirmed participant counter on events'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event',
+            type=int,
+            action='append',
+            dest='event_ids',
+            help='Only repair the given event id (can be repeated)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Show what would be updated without making changes',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+
+        events = Event.objects.annotate(
+            actual_count=Count('participants', filter=Q(participants__registration_status='confirmed'))
+        ).only('id', 'event_name', 'confirmed_count')
+        if options['event_ids']:
+            events = events.filter(id__in=options['event_ids'])
+
+        checked_count = 0
+        repaired_count = 0
+
+        for event in events:
+            checked_count += 1
+            if event.confirmed_count == event.actual_count:
+                continue
+
+            repaired_count += 1
+            message = f"{event.event_name} (ID: {event.id}): {event.confirmed_count} -> {event.actual_count}"
+            if dry_run:
+                self.stdout.write(f"Would repair {message}")
+            else:
+                event.refresh_confirmed_count()
+                self.stdout.write(self.style.SUCCESS(f"Repaired {message}"))
+
+        self.stdout.write("\n" + "=" * 50)
+        if dry_run:
+            self.stdout.write(self.style.SUCCESS("DRY RUN COMPLETE"))
+            self.stdout.write(f"Would repair: {repaired_count} events")
+        else:
+            self.stdout.write(self.style.SUCCESS("REPAIR COMPLETE"))
+            self.stdout.write(f"Repaired: {repaired_count} events")
+        self.stdout.write(f"Checked: {checked_count} events")
@@ -0,0 +1,49 @@
+"""
+Management command that runs background admin bulk actions
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from event.admin_jobs import process_admin_jobs
+
+
+class Command(BaseCommand):
+    help = 'Run queued admin bulk actions in chunks, recording their progress'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=1,
+            help='Maximum jobs to run per pass (default: 1)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when nothing is queued (default: 2.0)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Run a single batch and exit',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Admin job worker started'))
+
+        try:
+            while True:
+                counts = process_admin_jobs(batch_size=options['batch_size'])
+                if counts['done'] or counts['failed']:
+                    self.stdout.write(f"Done: {counts['done']}, failed: {counts['failed']}")
+
+                if options['once']:
+                    break
+                # Keep draining while a full batch ran, otherwise back off
+                if counts['done'] + counts['failed'] < options['batch_size']:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Admin job worker stopped'))
@@ -0,0 +1,63 @@
+"""
+Management command that admits queued registrations for admission-queue events
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from event.admission import process_admission_queue
+
+
+class Command(BaseCommand):
+    help = 'Admit queued registrations in FIFO order and waitlist the overflow'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--event',
+            type=int,
+            action='append',
+            dest='event_ids',
+            help='Only process the given event id (can be repeated)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Maximum tickets to process per event in one pass (default: 100)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1.0,
+            help='Seconds to sleep when the queue is empty (default: 1.0)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Process a single pass and exit',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Admission worker started'))
+
+        try:
+            while True:
+                counts = process_admission_queue(
+                    event_ids=options['event_ids'],
+                    batch_size=options['batch_size'],
+                )
+                processed = sum(counts.values())
+                if processed:
+                    self.stdout.write(
+                        f"Admitted: {counts['admitted']}, waitlisted: {counts['waitlisted']}, "
+                        f"rejected: {counts['rejected']}, failed: {counts['failed']}"
+                    )
+
+                if options['once']:
+                    break
+                # Keep draining while there is work, otherwise back off
+                if processed == counts['failed']:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Admission worker stopped'))
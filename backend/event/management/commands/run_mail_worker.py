@@ -0,0 +1,49 @@
+"""
+Management command that delivers queued transactional emails from the outbox
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from event.email_services import process_mail_outbox
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails with retries, exponential backoff and dead-lettering'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=50,
+            help='Maximum emails to send per SMTP connection (default: 50)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when nothing is due (default: 2.0)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Deliver a single batch and exit',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Mail worker started'))
+
+        try:
+            while True:
+                counts = process_mail_outbox(batch_size=options['batch_size'])
+                if counts['sent'] or counts['failed']:
+                    self.stdout.write(f"Sent: {counts['sent']}, failed: {counts['failed']}")
+
+                if options['once']:
+                    break
+                # Keep draining while a full batch was sent, otherwise back off
+                if counts['sent'] + counts['failed'] < options['batch_size']:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Mail worker stopped'))
@@ -0,0 +1,49 @@
+"""
+Management command that builds queued analysis / OD list report files
+"""
+import time
+
+from django.core.management.base import BaseCommand
+from event.reports import process_report_jobs
+
+
+class Command(BaseCommand):
+    help = 'Generate queued event reports into media storage'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=5,
+            help='Maximum reports to build per pass (default: 5)',
+        )
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=2.0,
+            help='Seconds to sleep when nothing is queued (default: 2.0)',
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Build a single batch and exit',
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.SUCCESS('Report worker started'))
+
+        try:
+            while True:
+                counts = process_report_jobs(batch_size=options['batch_size'])
+                if counts['built'] or counts['failed']:
+                    self.stdout.write(f"Built: {counts['built']}, failed: {counts['failed']}")
+
+                if options['once']:
+                    break
+                # Keep draining while a full batch was built, otherwise back off
+                if counts['built'] + counts['failed'] < options['batch_size']:
+                    time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            pass
+
+        self.stdout.write(self.style.SUCCESS('Report worker stopped'))
@@ -0,0 +1,34 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:41
+
+from django.db import migrations, models
+
+
+def populate_confirmed_count(apps, schema_editor):
+    """Initialise confirmed_count from existing confirmed participants"""
+    Event = apps.get_model('event', 'Event')
+    Participant = apps.get_model('event', 'Participant')
+
+    counts = (
+        Participant.objects
+        .filter(registration_status='confirmed')
+        .values('event_id')
+        .annotate(total=models.Count('id'))
+    )
+    for row in counts:
+        Event.objects.filter(pk=row['event_id']).update(confirmed_count=row['total'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0008_replace_event_type_field'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='confirmed_count',
+            field=models.PositiveIntegerField(default=0, editable=False, help_text='Number of confirmed participants (maintained automatically)'),
+        ),
+        migrations.RunPython(populate_confirmed_count, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2.7 on 2026-10-16 20:46
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0009_event_confirmed_count'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='admission_queue_enabled',
+            field=models.BooleanField(default=False, help_text='Queue registrations and admit them in order through the admission worker; overflow goes to the waitlist'),
+        ),
+        migrations.AlterField(
+            model_name='participant',
+            name='registration_status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('confirmed', 'Confirmed'), ('waitlisted', 'Waitlisted'), ('cancelled', 'Cancelled')], default='confirmed', max_length=20),
+        ),
+        migrations.CreateModel(
+            name='AdmissionTicket',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('answers', models.JSONField(blank=True, default=list, help_text='Validated answers submitted with the request')),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('admitted', 'Admitted'), ('waitlisted', 'Waitlisted'), ('rejected', 'Rejected')], default='queued', max_length=20)),
+                ('message', models.CharField(blank=True, max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('processed_at', models.DateTimeField(blank=True, null=True)),
+                ('event', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='admission_tickets', to='event.event')),
+                ('participant', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='admission_tickets', to='event.participant')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='admission_tickets', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Admission Ticket',
+                'verbose_name_plural': 'Admission Tickets',
+                'ordering': ['id'],
+                'indexes': [models.Index(fields=['event', 'status', 'id'], name='event_admis_event_i_d968aa_idx')],
+                'constraints': [models.UniqueConstraint(condition=models.Q(('status', 'queued')), fields=('event', 'user'), name='unique_queued_admission_ticket')],
+            },
+        ),
+    ]
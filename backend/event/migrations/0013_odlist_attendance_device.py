@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 21:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0012_report_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='odlist',
+            name='attendance_device',
+            field=models.CharField(blank=True, help_text='Scanner device that marked attendance', max_length=64),
+        ),
+    ]
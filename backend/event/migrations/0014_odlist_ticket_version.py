@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-16 22:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0013_odlist_attendance_device'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='odlist',
+            name='ticket_version',
+            field=models.PositiveSmallIntegerField(default=1, help_text='Bump to revoke previously issued ticket tokens'),
+        ),
+    ]
@@ -0,0 +1,70 @@
+# Generated by Django 5.2.7 on 2026-10-16 23:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def create_event_stats(apps, schema_editor):
+    """One stats row per existing event, so the admin changelist never builds them one by one"""
+    Event = apps.get_model('event', 'Event')
+    EventStats = apps.get_model('event', 'EventStats')
+    Participant = apps.get_model('event', 'Participant')
+    ODList = apps.get_model('event', 'ODList')
+
+    participant_counts = {
+        row['event_id']: row for row in
+        Participant.objects.order_by().values('event_id').annotate(
+            registered=Count('id'),
+            paid=Count('id', filter=Q(registration_status='confirmed', payment_status=True)),
+        )
+    }
+    od_counts = {
+        row['event_id']: row for row in
+        ODList.objects.order_by().values('event_id').annotate(
+            od_created=Count('id'),
+            qr_sent=Count('id', filter=Q(qr_sent=True)),
+            attended=Count('id', filter=Q(attendance=True)),
+        )
+    }
+
+    stats = []
+    for event_id in Event.objects.values_list('id', flat=True).iterator():
+        participants = participant_counts.get(event_id, {})
+        od_entries = od_counts.get(event_id, {})
+        stats.append(EventStats(
+            event_id=event_id,
+            registered=participants.get('registered', 0),
+            paid=participants.get('paid', 0),
+            od_created=od_entries.get('od_created', 0),
+            qr_sent=od_entries.get('qr_sent', 0),
+            attended=od_entries.get('attended', 0),
+        ))
+    EventStats.objects.bulk_create(stats, batch_size=500, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0014_odlist_ticket_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EventStats',
+            fields=[
+                ('event', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='stats', serialize=False, to='event.event')),
+                ('registered', models.PositiveIntegerField(default=0, help_text='Participants in any registration status')),
+                ('paid', models.PositiveIntegerField(default=0, help_text='Confirmed participants with payment completed')),
+                ('od_created', models.PositiveIntegerField(default=0, help_text='OD entries')),
+                ('qr_sent', models.PositiveIntegerField(default=0, help_text='OD entries whose QR email was sent')),
+                ('attended', models.PositiveIntegerField(default=0, help_text='OD entries marked attended')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Event Stats',
+                'verbose_name_plural': 'Event Stats',
+            },
+        ),
+        migrations.RunPython(create_event_stats, migrations.RunPython.noop),
+    ]
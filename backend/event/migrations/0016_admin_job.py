@@ -0,0 +1,44 @@
+# Generated by Django 5.2.7 on 2026-10-17 09:40
+
+import django.db.models.deletion
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0015_event_stats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AdminJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('token', models.UUIDField(default=uuid.uuid4, editable=False, unique=True)),
+                ('action', models.CharField(help_text='Registered job handler name', max_length=100)),
+                ('description', models.CharField(blank=True, max_length=255)),
+                ('object_ids', models.JSONField(default=list, help_text='Primary keys to process')),
+                ('params', models.JSONField(blank=True, default=dict)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('running', 'Running'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('processed', models.PositiveIntegerField(default=0)),
+                ('failed', models.PositiveIntegerField(default=0)),
+                ('error_log', models.TextField(blank=True)),
+                ('return_url', models.CharField(blank=True, help_text='Admin page to go back to when done', max_length=255)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('requested_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='admin_jobs', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Admin Job',
+                'verbose_name_plural': 'Admin Jobs',
+                'ordering': ['-id'],
+                'indexes': [models.Index(fields=['status', 'id'], name='event_admin_status_0ba635_idx')],
+            },
+        ),
+    ]
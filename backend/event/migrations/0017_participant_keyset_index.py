@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0016_admin_job'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='participant',
+            index=models.Index(fields=['event', 'registered_at', 'id'], name='event_parti_event_i_7c4649_idx'),
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.7 on 2026-10-17 13:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0017_participant_keyset_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='eventquestion',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
@@ -0,0 +1,43 @@
+# Generated by Django 5.2.7 on 2026-10-17 16:40
+
+import django.contrib.postgres.search
+import django.db.models.deletion
+import event.search
+from django.db import migrations, models
+
+
+def install_search_index(apps, schema_editor):
+    event.search.install_search_index(schema_editor.connection)
+
+
+def remove_search_index(apps, schema_editor):
+    event.search.remove_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0018_eventquestion_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='event',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, help_text='Full-text index of name and description (PostgreSQL only, maintained by a database trigger)', null=True),
+        ),
+        migrations.CreateModel(
+            name='EventSearchIndex',
+            fields=[
+                ('event', models.OneToOneField(db_column='rowid', on_delete=django.db.models.deletion.DO_NOTHING, primary_key=True, related_name='search_index', serialize=False, to='event.event')),
+                ('event_name', models.TextField()),
+                ('description', models.TextField()),
+                ('document', event.search.FullTextDocumentField(db_column='event_event_fts')),
+            ],
+            options={
+                'db_table': 'event_event_fts',
+                'managed': False,
+            },
+        ),
+        migrations.RunPython(install_search_index, remove_search_index),
+    ]
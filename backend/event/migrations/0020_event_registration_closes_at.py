@@ -0,0 +1,46 @@
+# Generated by Django 5.2.7 on 2026-10-18 10:05
+
+from datetime import datetime, time
+
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def registration_closing_time(registration_deadline, event_date):
+    """Copy of event.models.registration_closing_time as of this migration"""
+    if not registration_deadline:
+        return event_date
+    deadline = registration_deadline
+
+    if timezone.is_naive(deadline):
+        deadline = timezone.make_aware(deadline, timezone.get_current_timezone())
+
+    deadline_local_date = deadline.astimezone(timezone.get_current_timezone()).date()
+    deadline_datetime = datetime.combine(deadline_local_date, time(23, 59, 59))
+    return timezone.make_aware(deadline_datetime, timezone.get_current_timezone())
+
+
+def fill_registration_closes_at(apps, schema_editor):
+    Event = apps.get_model('event', 'Event')
+    events = list(Event.objects.only('id', 'registration_deadline', 'event_date'))
+    for event in events:
+        event.registration_closes_at = registration_closing_time(event.registration_deadline, event.event_date)
+    Event.objects.bulk_update(events, ['registration_closes_at'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0019_event_search'),
+    ]
+
+    operations = [
+        # Nullable without a default: SQLite adds the column in place rather
+        # than rebuilding event_event, which would drop the search index triggers
+        migrations.AddField(
+            model_name='event',
+            name='registration_closes_at',
+            field=models.DateTimeField(db_index=True, editable=False, help_text="When registration closes: end of the deadline's day (local time), else the event start (maintained on save)", null=True),
+        ),
+        migrations.RunPython(fill_registration_closes_at, migrations.RunPython.noop),
+    ]
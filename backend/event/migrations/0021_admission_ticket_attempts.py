@@ -0,0 +1,38 @@
+# Generated by Django 5.2.7 on 2026-10-18 11:20
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0020_event_registration_closes_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='admissionticket',
+            name='unique_queued_admission_ticket',
+        ),
+        migrations.AddField(
+            model_name='admissionticket',
+            name='attempts',
+            field=models.PositiveIntegerField(default=0, help_text='Admission attempts; failed for good after ADMISSION_MAX_ATTEMPTS'),
+        ),
+        migrations.AddField(
+            model_name='admissionticket',
+            name='locked_at',
+            field=models.DateTimeField(blank=True, help_text='When a worker claimed the ticket', null=True),
+        ),
+        migrations.AlterField(
+            model_name='admissionticket',
+            name='status',
+            field=models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('admitted', 'Admitted'), ('waitlisted', 'Waitlisted'), ('rejected', 'Rejected'), ('failed', 'Failed')], default='queued', max_length=20),
+        ),
+        migrations.AddConstraint(
+            model_name='admissionticket',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['queued', 'processing'])), fields=('event', 'user'), name='unique_open_admission_ticket'),
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:05
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0021_admission_ticket_attempts'),
+    ]
+
+    operations = [
+        # Existing rows get the migration time, so the first delta after it resends them once
+        migrations.AddField(
+            model_name='odlist',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
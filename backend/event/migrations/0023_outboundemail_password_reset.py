@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-18 12:40
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('event', '0022_odlist_updated_at'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='outboundemail',
+            name='kind',
+            field=models.CharField(choices=[('registration_qr', 'Registration QR'), ('password_reset', 'Password reset'), ('message', 'Plain message')], default='message', max_length=20),
+        ),
+        migrations.AddField(
+            model_name='outboundemail',
+            name='user',
+            field=models.ForeignKey(blank=True, help_text='Account whose reset link is mailed (password reset mails only; the link is made at send time)', null=True, on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -1,9 +1,16 @@
-from django.db import models
+from django.conf import settings
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.search import SearchVectorField
 import hashlib
+import uuid
 from datetime import datetime, time
 
+from .search import FTS_TABLE, FullTextDocumentField
+
 User = get_user_model()
 
 
@@ -28,7 +35,8 @@ class EventCategory(models.Model):
     @classmethod
     def get_choices(cls):
         """Get active categories as choices for form fields"""
-        return [(cat.code, cat.display_name) for cat in cls.objects.filter(is_active=True).order_by('order')]
+        from users.choice_lookups import event_category_choices
+        return event_category_choices()
 
     @classmethod
     def populate_defaults(cls):
@@ -51,6 +59,48 @@ class EventCategory(models.Model):
                     order=order
                 )
 
+def registration_closing_time(registration_deadline, event_date):
+    """
+    When registration for an event closes: the end of the deadline's day in
+    local time, or the event start when there is no deadline.
+    """
+    if not registration_deadline:
+        return event_date
+    deadline = registration_deadline
+
+    if timezone.is_naive(deadline):
+        deadline = timezone.make_aware(deadline, timezone.get_current_timezone())
+
+    deadline_local_date = deadline.astimezone(timezone.get_current_timezone()).date()
+    deadline_datetime = datetime.combine(deadline_local_date, time(23, 59, 59))
+    return timezone.make_aware(deadline_datetime, timezone.get_current_timezone())
+
+
+# Events with a seat left: no participant limit, or fewer confirmed participants than it
+HAS_FREE_SEAT = Q(max_participants__isnull=True) | Q(max_participants=0) | Q(confirmed_count__lt=F('max_participants'))
+
+
+class EventQuerySet(models.QuerySet):
+
+    def with_free_seats(self, free=True):
+        """Events with a seat left (free=False: the full ones)"""
+        return self.filter(HAS_FREE_SEAT) if free else self.exclude(HAS_FREE_SEAT)
+
+    def registration_window_open(self, is_open=True):
+        """Events whose registration window is open (is_open=False: closed), an indexed range on registration_closes_at"""
+        now = timezone.now()
+        if is_open:
+            return self.filter(registration_closes_at__gt=now)
+        return self.filter(Q(registration_closes_at__lte=now) | Q(registration_closes_at__isnull=True))
+
+    def registration_open(self, is_open=True):
+        """Events accepting registrations (is_registration_open): window open and a seat left"""
+        if is_open:
+            return self.registration_window_open().with_free_seats()
+        open_events = Q(registration_closes_at__gt=timezone.now()) & HAS_FREE_SEAT
+        return self.exclude(open_events)
+
+
 class Event(models.Model):
     # Remove hardcoded EVENT_TYPE_CHOICES - now using dynamic EventCategory
     
@@ -163,8 +213,37 @@ class Event(models.Model):
         blank=True,
         help_text="Custom payment gateway credentials (JSON format)"
     )
+    admission_queue_enabled = models.BooleanField(
+        default=False,
+        help_text="Queue registrations and admit them in order through the admission worker; overflow goes to the waitlist"
+    )
+    confirmed_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Number of confirmed participants (maintained automatically)"
+    )
+    registration_closes_at = models.DateTimeField(
+        null=True,
+        editable=False,
+        db_index=True,
+        help_text="When registration closes: end of the deadline's day (local time), else the event start (maintained on save)"
+    )
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False,
+        help_text="Full-text index of name and description (PostgreSQL only, maintained by a database trigger)"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    # Counters are only ever changed with atomic UPDATEs and search_vector by
+    # the database, so a regular save() of a stale instance must never write them back.
+    COUNTER_FIELDS = ('confirmed_count',)
+    DATABASE_MAINTAINED_FIELDS = COUNTER_FIELDS + ('search_vector',)
+    # registration_closes_at is derived from these on save (queryset.update() and bulk_create() skip it)
+    REGISTRATION_WINDOW_FIELDS = ('registration_deadline', 'event_date')
+
+    objects = EventQuerySet.as_manager()
     
     class Meta:
         ordering = ['-event_date']
@@ -181,37 +260,104 @@ class Event(models.Model):
     def is_upcoming(self):
         return self.event_date and self.event_date > timezone.now()
 
+    def save(self, *args, **kwargs):
+        deferred = self.get_deferred_fields()
+        window_loaded = not deferred.intersection(self.REGISTRATION_WINDOW_FIELDS)
+        if window_loaded:
+            self.registration_closes_at = registration_closing_time(self.registration_deadline, self.event_date)
+
+        update_fields = kwargs.get('update_fields')
+        if not self._state.adding and update_fields is None:
+            skipped = set(self.DATABASE_MAINTAINED_FIELDS) | deferred
+            if not window_loaded:
+                skipped.add('registration_closes_at')
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in skipped and field.attname not in skipped
+            ]
+        elif update_fields is not None and window_loaded and set(update_fields).intersection(self.REGISTRATION_WINDOW_FIELDS):
+            kwargs['update_fields'] = [*update_fields, 'registration_closes_at']
+        super().save(*args, **kwargs)
+
+    @classmethod
+    def adjust_confirmed_count(cls, event_id, delta):
+        """Atomically add delta to an event's confirmed_count (never below zero)"""
+        events = cls.objects.filter(pk=event_id)
+        if delta < 0:
+            events = events.filter(confirmed_count__gte=-delta)
+        updated = events.update(confirmed_count=F('confirmed_count') + delta)
+        if updated:
+            cls._seats_changed(event_id)
+        return updated
+
+    @staticmethod
+    def _seats_changed(event_id):
+        """Bare UPDATEs of the seat counter send no signals; drop cached event responses here"""
+        from .response_cache import EVENT_SEATS_TAG, event_tag, invalidate_tags
+        invalidate_tags(event_tag(event_id), EVENT_SEATS_TAG)
+
+    @classmethod
+    def reserve_seat(cls, event_id):
+        """
+        Atomically claim one seat with a conditional UPDATE.
+
+        Returns True when a seat was claimed, False when the event is full.
+        The capacity check and the increment happen in the same statement,
+        so concurrent registrations can never oversell max_participants.
+        """
+        claimed = cls.objects.with_free_seats().filter(pk=event_id).update(
+            confirmed_count=F('confirmed_count') + 1
+        ) == 1
+        if claimed:
+            cls._seats_changed(event_id)
+        return claimed
+
+    def refresh_confirmed_count(self):
+        """Recompute confirmed_count from Participant rows in a single UPDATE"""
+        confirmed = (
+            Participant.objects
+            .filter(event=OuterRef('pk'), registration_status='confirmed')
+            .order_by()
+            .values('event')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        Event.objects.filter(pk=self.pk).update(confirmed_count=Coalesce(Subquery(confirmed), 0))
+        Event._seats_changed(self.pk)
+        self.refresh_from_db(fields=['confirmed_count'])
+        return self.confirmed_count
+
+    @property
+    def seats_left(self):
+        """Remaining seats, or None when the event has no participant limit"""
+        if self.max_participants and self.max_participants > 0:
+            return max(self.max_participants - self.confirmed_count, 0)
+        return None
+
     @property
     def is_full(self):
         """Check if the event is full"""
-        if self.max_participants and self.max_participants > 0:
-            return self.participants.filter(registration_status='confirmed').count() >= self.max_participants
-        return False
+        return self.seats_left == 0
 
     @property
     def get_current_participants(self):
-        return self.participants.filter(registration_status='confirmed').count()
+        return self.confirmed_count
 
     @property
     def is_registration_open(self):
         """Check if registration is still open"""
         if self.is_full:
             return False
+        return self.is_registration_window_open
 
-        if self.registration_deadline:
-            deadline = self.registration_deadline
-
-            if timezone.is_naive(deadline):
-                deadline = timezone.make_aware(deadline, timezone.get_current_timezone())
-
-            deadline_local_date = deadline.astimezone(timezone.get_current_timezone()).date()
-            deadline_datetime = datetime.combine(deadline_local_date, time(23, 59, 59))
-            deadline_datetime = timezone.make_aware(deadline_datetime, timezone.get_current_timezone())
-
-            # Final comparison
-            return timezone.now() < deadline_datetime
-
-        return self.is_upcoming
+    @property
+    def is_registration_window_open(self):
+        """Check the registration deadline only, ignoring capacity"""
+        closes_at = self.registration_closes_at
+        if closes_at is None:
+            # Not saved yet, or created with bulk_create()
+            closes_at = registration_closing_time(self.registration_deadline, self.event_date)
+        return closes_at is not None and timezone.now() < closes_at
 
     
     def block_event_visibility(self, user) -> bool:
@@ -270,6 +416,26 @@ class Event(models.Model):
         return None, None
 
 
+class EventSearchIndex(models.Model):
+    """
+    The SQLite FTS5 index over Event names and descriptions (see event/search.py).
+
+    Unmanaged: the virtual table and its sync triggers are created by
+    migration 0019, and only exist when the database is SQLite with FTS5.
+    """
+
+    event = models.OneToOneField(
+        Event, on_delete=models.DO_NOTHING, primary_key=True, db_column='rowid', related_name='search_index'
+    )
+    event_name = models.TextField()
+    description = models.TextField()
+    document = FullTextDocumentField(db_column=FTS_TABLE)
+
+    class Meta:
+        managed = False
+        db_table = FTS_TABLE
+
+
 class EventQuestion(models.Model):
     """Dynamic questions for event registration"""
     
@@ -293,6 +459,7 @@ class EventQuestion(models.Model):
     help_text = models.CharField(max_length=255, blank=True, help_text="Helper text for the question")
     options = models.JSONField(blank=True, null=True, help_text="Options for choice questions (list of strings)")
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         ordering = ['order', 'id']
@@ -309,6 +476,7 @@ class Participant(models.Model):
     REGISTRATION_STATUS_CHOICES = [
         ('pending', 'Pending'),
         ('confirmed', 'Confirmed'),
+        ('waitlisted', 'Waitlisted'),
         ('cancelled', 'Cancelled'),
     ]
 
@@ -328,11 +496,29 @@ class Participant(models.Model):
         indexes = [
             models.Index(fields=['event', 'registration_status']),
             models.Index(fields=['user', 'registered_at']),
+            # Keyset pages of an event's participants (event/pagination.py)
+            models.Index(fields=['event', 'registered_at', 'id']),
         ]
     
     def __str__(self):
         return f"{self.user.get_full_name() or self.user.username} - {self.event.event_name}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so signals can detect confirmed <-> other transitions
+        instance._loaded_registration_status = instance.__dict__.get('registration_status')
+        instance._loaded_payment_status = instance.__dict__.get('payment_status')
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # Reloaded fields hold the stored values again; keep the signal snapshot in step
+        if fields is None or 'registration_status' in fields:
+            self._loaded_registration_status = self.registration_status
+        if fields is None or 'payment_status' in fields:
+            self._loaded_payment_status = self.payment_status
+
     @property
     def participant_name(self):
         """Get participant's full name"""
@@ -395,6 +581,10 @@ class ODList(models.Model):
     attendance = models.BooleanField(default=False)
     hash = models.CharField(max_length=64, unique=True)
     attendance_marked_at = models.DateTimeField(null=True, blank=True)
+    attendance_device = models.CharField(max_length=64, blank=True, help_text="Scanner device that marked attendance")
+    ticket_version = models.PositiveSmallIntegerField(default=1, help_text="Bump to revoke previously issued ticket tokens")
+    # Server time of the last change; queryset.update() paths that touch attendance set it explicitly
+    updated_at = models.DateTimeField(auto_now=True)
     
     class Meta:
         unique_together = ('participant',)
@@ -404,12 +594,35 @@ class ODList(models.Model):
     def __str__(self):
         return f"{self.participant.user.username} - {self.participant.event.event_name}"
     
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored flags so signals can keep EventStats in step
+        instance._loaded_flags = (instance.__dict__.get('qr_sent'), instance.__dict__.get('attendance'))
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        # The stored flags may have moved since they were remembered; pre_save fetches them again
+        self.__dict__.pop('_loaded_flags', None)
+
     def save(self, *args, **kwargs):
         if not self.hash:
             hash_string = f"{self.participant.user.id}{self.participant.event.id}{timezone.now().timestamp()}"
             self.hash = hashlib.sha256(hash_string.encode()).hexdigest()
         super().save(*args, **kwargs)
     
+    @property
+    def ticket_token(self):
+        """Signed ticket token, verifiable by the scanner without a DB lookup"""
+        from .tickets import make_ticket_token
+        return make_ticket_token(self.event_id, self.participant_id, self.ticket_version)
+
+    @property
+    def qr_value(self):
+        """Payload encoded in the ticket QR code (TICKET_QR_FORMAT)"""
+        return self.ticket_token if settings.TICKET_QR_FORMAT == 'token' else self.hash
+
     @property
     def is_qr_sent(self):
         return self.qr_sent
@@ -419,6 +632,338 @@ class ODList(models.Model):
         return self.attendance
 
 
+class EventStats(models.Model):
+    """
+    Registration / OD / attendance counters of one event.
+
+    Kept in step by signals on Participant and ODList and by F() increments
+    in the paths that use queryset.update() (scanner, bulk mail, outbox);
+    `manage.py reconcile_event_stats` fixes any drift. Confirmed registrations
+    live on Event.confirmed_count.
+    """
+
+    COUNTER_FIELDS = ('registered', 'paid', 'od_created', 'qr_sent', 'attended')
+
+    event = models.OneToOneField(Event, on_delete=models.CASCADE, primary_key=True, related_name='stats')
+    registered = models.PositiveIntegerField(default=0, help_text="Participants in any registration status")
+    paid = models.PositiveIntegerField(default=0, help_text="Confirmed participants with payment completed")
+    od_created = models.PositiveIntegerField(default=0, help_text="OD entries")
+    qr_sent = models.PositiveIntegerField(default=0, help_text="OD entries whose QR email was sent")
+    attended = models.PositiveIntegerField(default=0, help_text="OD entries marked attended")
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Event Stats"
+        verbose_name_plural = "Event Stats"
+
+    def __str__(self):
+        return f"Stats - {self.event_id}"
+
+    @staticmethod
+    def participant_counters(registration_status, payment_status):
+        """What one participant row contributes to the counters"""
+        return {
+            'registered': 1,
+            'paid': int(registration_status == 'confirmed' and bool(payment_status)),
+        }
+
+    @staticmethod
+    def od_counters(qr_sent, attendance):
+        """What one OD entry contributes to the counters"""
+        return {'od_created': 1, 'qr_sent': int(bool(qr_sent)), 'attended': int(bool(attendance))}
+
+    @classmethod
+    def adjust(cls, event_id, **deltas):
+        """Atomically add the deltas to an event's counters; a missing or drifted row is rebuilt from scratch"""
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        stats = cls.objects.filter(event_id=event_id)
+        for field, delta in deltas.items():
+            if delta < 0:
+                stats = stats.filter(**{f'{field}__gte': -delta})
+        updated = stats.update(
+            **{field: F(field) + delta for field, delta in deltas.items()},
+            updated_at=timezone.now()
+        )
+        if not updated:
+            cls.refresh(event_id)
+
+    @classmethod
+    def count(cls, event_id):
+        """Count an event's Participant and ODList rows (two queries)"""
+        participant_counts = Participant.objects.filter(event_id=event_id).order_by().aggregate(
+            registered=Count('id'),
+            paid=Count('id', filter=Q(registration_status='confirmed', payment_status=True)),
+        )
+        od_counts = ODList.objects.filter(event_id=event_id).order_by().aggregate(
+            od_created=Count('id'),
+            qr_sent=Count('id', filter=Q(qr_sent=True)),
+            attended=Count('id', filter=Q(attendance=True)),
+        )
+        return {**participant_counts, **od_counts}
+
+    @classmethod
+    def refresh(cls, event_id):
+        """Recompute an event's counters from Participant and ODList rows"""
+        counts = cls.count(event_id)
+        try:
+            with transaction.atomic():
+                stats, _ = cls.objects.update_or_create(event_id=event_id, defaults=counts)
+        except IntegrityError:
+            # Created concurrently; the other writer's numbers are just as fresh
+            stats = cls.objects.get(event_id=event_id)
+        return stats
+
+    @classmethod
+    def for_event(cls, event):
+        """The event's stats row, building it on first use"""
+        try:
+            return event.stats
+        except cls.DoesNotExist:
+            return cls.refresh(event.pk)
+
+
+class AdmissionTicket(models.Model):
+    """Queued registration attempt for events running in admission queue mode"""
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('processing', 'Processing'),
+        ('admitted', 'Admitted'),
+        ('waitlisted', 'Waitlisted'),
+        ('rejected', 'Rejected'),
+        ('failed', 'Failed'),
+    ]
+    # Not yet decided: still waiting in the queue or claimed by an admission worker
+    OPEN_STATUSES = ('queued', 'processing')
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='admission_tickets')
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='admission_tickets')
+    answers = models.JSONField(default=list, blank=True, help_text="Validated answers submitted with the request")
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='queued')
+    message = models.CharField(max_length=255, blank=True)
+    attempts = models.PositiveIntegerField(default=0, help_text="Admission attempts; failed for good after ADMISSION_MAX_ATTEMPTS")
+    locked_at = models.DateTimeField(null=True, blank=True, help_text="When a worker claimed the ticket")
+    participant = models.ForeignKey(
+        Participant,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='admission_tickets'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = "Admission Ticket"
+        verbose_name_plural = "Admission Tickets"
+        indexes = [
+            models.Index(fields=['event', 'status', 'id']),
+        ]
+        constraints = [
+            # One open ticket per user and event; repeated clicks reuse it
+            models.UniqueConstraint(
+                fields=['event', 'user'],
+                condition=Q(status__in=['queued', 'processing']),
+                name='unique_open_admission_ticket',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.event.event_name} ({self.status})"
+
+    @property
+    def queue_position(self):
+        """1-based position among open tickets for the event, or None once processed"""
+        if self.status not in self.OPEN_STATUSES:
+            return None
+        return AdmissionTicket.objects.filter(
+            event_id=self.event_id, status__in=self.OPEN_STATUSES, id__lt=self.id
+        ).count() + 1
+
+
+class OutboundEmail(models.Model):
+    """
+    Transactional mail outbox.
+
+    Requests only insert rows here; `manage.py run_mail_worker` renders and
+    delivers them with retries and exponential backoff. Registration QR mails
+    are rendered at send time from their OD entry, and password reset mails
+    from their user, so the reset link itself is never stored.
+    """
+
+    KIND_CHOICES = [
+        ('registration_qr', 'Registration QR'),
+        ('password_reset', 'Password reset'),
+        ('message', 'Plain message'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('dead', 'Dead-lettered'),
+    ]
+
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES, default='message')
+    od_list = models.ForeignKey(
+        ODList,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='outbound_emails',
+        help_text="OD entry whose QR ticket is mailed (registration QR mails only)"
+    )
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Account whose reset link is mailed (password reset mails only; the link is made at send time)"
+    )
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255, blank=True)
+    body = models.TextField(blank=True)
+    html_body = models.TextField(blank=True)
+    from_email = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = "Outbound Email"
+        verbose_name_plural = "Outbound Emails"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} to {self.to_email} ({self.status})"
+
+
+class ReportJob(models.Model):
+    """
+    Generated CSV report for one event at one data version.
+
+    Download requests look up (or queue) the job for the event's current
+    data version; `manage.py run_report_worker` writes the artifact to
+    media storage, and later downloads are served straight from that file
+    until participants or attendance change.
+    """
+
+    KIND_CHOICES = [
+        ('analysis', 'Event analysis'),
+        ('od_list', 'OD list'),
+    ]
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    event = models.ForeignKey(Event, on_delete=models.CASCADE, related_name='report_jobs')
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    data_version = models.CharField(max_length=64, help_text="Fingerprint of the participant and attendance data")
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    file = models.FileField(upload_to='reports/', blank=True)
+    filename = models.CharField(max_length=255, blank=True, help_text="Download filename for the artifact")
+    error = models.TextField(blank=True)
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='report_jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['id']
+        verbose_name = "Report Job"
+        verbose_name_plural = "Report Jobs"
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+        constraints = [
+            # Concurrent downloads of unchanged data share one job
+            models.UniqueConstraint(
+                fields=['event', 'kind', 'data_version'],
+                name='unique_report_job_version',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.get_kind_display()} - {self.event.event_name} ({self.status})"
+
+
+class AdminJob(models.Model):
+    """
+    Admin bulk action running in the background.
+
+    The admin action stores the selected ids and returns at once;
+    `manage.py run_admin_job_worker` works through them in chunks, updating
+    the progress counters and error log that the progress page shows.
+    """
+
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('running', 'Running'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
+    token = models.UUIDField(default=uuid.uuid4, unique=True, editable=False)
+    action = models.CharField(max_length=100, help_text="Registered job handler name")
+    description = models.CharField(max_length=255, blank=True)
+    object_ids = models.JSONField(default=list, help_text="Primary keys to process")
+    params = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    total = models.PositiveIntegerField(default=0)
+    processed = models.PositiveIntegerField(default=0)
+    failed = models.PositiveIntegerField(default=0)
+    error_log = models.TextField(blank=True)
+    return_url = models.CharField(max_length=255, blank=True, help_text="Admin page to go back to when done")
+    requested_by = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='admin_jobs'
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        ordering = ['-id']
+        verbose_name = "Admin Job"
+        verbose_name_plural = "Admin Jobs"
+        indexes = [
+            models.Index(fields=['status', 'id']),
+        ]
+
+    def __str__(self):
+        return f"{self.description or self.action} ({self.status})"
+
+    @property
+    def percent(self):
+        return int(self.processed * 100 / self.total) if self.total else 100
+
+
 class EventGuide(models.Model):
     """Event guide with additional details and specifications"""
     
@@ -0,0 +1,147 @@
+"""
+Pagination for list endpoints.
+
+EventPagination is the original page-number mode (`?page=N`): every page
+runs a COUNT(*) and an OFFSET scan. Large lists can opt into keyset mode
+with `?paginate=cursor`: rows are ordered on indexed columns ending in the
+primary key, and the opaque `next` cursor carries the last row's values, so
+every page is a single indexed range query however deep it is. The total
+is only counted on request (`?with_count=1`).
+"""
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class EventPagination(PageNumberPagination):
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over `ordering`, e.g. ('-registered_at', '-id').
+
+    The last field must be unique (the primary key) so the cursor position
+    is exact. `paginate_queryset` returns None when the request did not ask
+    for keyset mode, leaving the caller's existing behaviour in place.
+    """
+
+    page_size = 10
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    cursor_query_param = 'cursor'
+    mode_query_param = 'paginate'
+    count_query_param = 'with_count'
+    invalid_cursor_message = 'Invalid cursor'
+    ordering = ('-id',)
+
+    def __init__(self, ordering=None):
+        if ordering is not None:
+            self.ordering = tuple(ordering)
+
+    @classmethod
+    def is_requested(cls, request):
+        params = request.query_params
+        return cls.cursor_query_param in params or params.get(cls.mode_query_param) == 'cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        return min(max(size, 1), self.max_page_size)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if not self.is_requested(request):
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.count = None
+        if request.query_params.get(self.count_query_param) in ('1', 'true'):
+            self.count = queryset.count()
+
+        queryset = queryset.order_by(*self.ordering)
+        position = self.decode_cursor(request, queryset.model)
+        if position is not None:
+            queryset = queryset.filter(self._after(position))
+
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+        self.next_position = self._position(rows[-1]) if self.has_next else None
+        return rows
+
+    def _fields(self):
+        return [(field.lstrip('-'), field.startswith('-')) for field in self.ordering]
+
+    def _position(self, instance):
+        return [getattr(instance, name) for name, _ in self._fields()]
+
+    def _after(self, position):
+        """Rows strictly after `position` in the ordering: (a > x) OR (a = x AND b > y) ..."""
+        condition = Q()
+        equal = {}
+        for (name, descending), value in zip(self._fields(), position):
+            condition |= Q(**equal, **{f'{name}__{"lt" if descending else "gt"}': value})
+            equal[name] = value
+        return condition
+
+    def encode_cursor(self, position):
+        raw = json.dumps([str(value) for value in position]).encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request, model):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)))
+            fields = self._fields()
+            if not isinstance(values, list) or len(values) != len(fields):
+                raise ValueError
+            return [model._meta.get_field(name).to_python(value) for (name, _), value in zip(fields, values)]
+        except (binascii.Error, ValueError, TypeError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.mode_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_data(self):
+        data = {'next': self.get_next_link()}
+        if self.count is not None:
+            data['count'] = self.count
+        return data
+
+    def get_paginated_response(self, data, results_key='results'):
+        return Response({**self.get_paginated_data(), results_key: data})
+
+
+def paginate(request, queryset, ordering, fallback=EventPagination):
+    """
+    Paginate a list endpoint: keyset mode when requested, otherwise `fallback` (None for an unpaginated list).
+
+    Returns:
+        tuple: (paginator or None, rows of the page)
+    """
+    paginator = KeysetPagination(ordering)
+    page = paginator.paginate_queryset(queryset, request)
+    if page is not None:
+        return paginator, page
+    if fallback is None:
+        return None, queryset
+    paginator = fallback()
+    return paginator, paginator.paginate_queryset(queryset, request)
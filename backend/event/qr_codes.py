@@ -0,0 +1,99 @@
+"""
+Content-addressed cache of rendered QR ticket images.
+
+An OD entry's hash never changes, so its QR image only ever needs to be
+rendered once. Images are stored on disk under QR_CACHE_DIR, keyed by a
+digest of the encoded value and the render parameters, and reused by every
+later send and resend. Bulk sends pre-render the missing images across a
+process pool because PNG encoding is CPU bound.
+"""
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import qrcode
+from django.conf import settings
+
+# Render parameters per variant. 'full' is the original large image;
+# 'email' is a compact variant sized for inline display in mail clients.
+QR_VARIANTS = {
+    'full': {'box_size': 10, 'border': 5},
+    'email': {'box_size': 6, 'border': 4},
+}
+
+# Below this many missing images a process pool costs more than it saves
+PRERENDER_POOL_THRESHOLD = 16
+
+
+def _cache_path(cache_dir, value, variant):
+    params = QR_VARIANTS[variant]
+    key = hashlib.sha256(
+        f"{variant}:{params['box_size']}:{params['border']}:{value}".encode()
+    ).hexdigest()
+    return os.path.join(cache_dir, variant, key[:2], f'{key}.png')
+
+
+def _render_to_cache(cache_dir, value, variant):
+    """Render one QR PNG into the cache (runs in pool workers, so no Django access)"""
+    path = _cache_path(cache_dir, value, variant)
+    if os.path.exists(path):
+        return path
+
+    params = QR_VARIANTS[variant]
+    qr = qrcode.QRCode(version=1, box_size=params['box_size'], border=params['border'])
+    qr.add_data(value)
+    qr.make(fit=True)
+    img = qr.make_image(fill='black', back_color='white')
+
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    # Write to a temp file and rename so readers never see a partial image
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as tmp_file:
+            img.save(tmp_file, format='PNG')
+        os.replace(tmp_path, path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return path
+
+
+def get_qr_png(value, variant='full'):
+    """Return PNG bytes of the QR code for value, rendering it on first use"""
+    path = _render_to_cache(settings.QR_CACHE_DIR, value, variant)
+    with open(path, 'rb') as png_file:
+        return png_file.read()
+
+
+def prerender_qr_codes(values, variant='email', processes=None):
+    """
+    Render every missing QR image for values ahead of a bulk send.
+
+    Returns:
+        int: number of images rendered
+    """
+    cache_dir = settings.QR_CACHE_DIR
+    missing = [
+        value for value in set(values)
+        if value and not os.path.exists(_cache_path(cache_dir, value, variant))
+    ]
+    if not missing:
+        return 0
+
+    if len(missing) < PRERENDER_POOL_THRESHOLD:
+        for value in missing:
+            _render_to_cache(cache_dir, value, variant)
+        return len(missing)
+
+    with ProcessPoolExecutor(max_workers=processes or settings.QR_PRERENDER_PROCESSES) as executor:
+        list(executor.map(
+            _render_to_cache,
+            [cache_dir] * len(missing),
+            missing,
+            [variant] * len(missing),
+            chunksize=32,
+        ))
+    return len(missing)
@@ -0,0 +1,150 @@
+"""
+Report jobs: generate event CSV reports once and serve the stored file.
+
+A download request fingerprints the event's participant and attendance
+data and looks up the ReportJob for that version. Unchanged data reuses
+the finished artifact; otherwise a job is queued and `run_report_worker`
+writes the CSV into media storage.
+"""
+import csv
+import hashlib
+import tempfile
+from datetime import timedelta
+
+from django.core.files import File
+from django.db.models import Count, Max, Q, Sum
+from django.utils import timezone
+
+from .exports import iter_analysis_rows, iter_od_list_rows
+from .models import ODList, Participant, ReportJob
+
+
+def report_data_version(event):
+    """
+    Fingerprint of everything the event reports are built from.
+
+    One aggregate query; any registration, unregistration, payment or
+    attendance change (including queryset.update() ones) changes it.
+    """
+    participants = Participant.objects.filter(event=event).order_by()
+    state = participants.aggregate(
+        total=Count('id'),
+        id_sum=Sum('id'),
+        last_update=Max('updated_at'),
+        paid_id_sum=Sum('id', filter=Q(payment_status=True)),
+        attended_id_sum=Sum('id', filter=Q(registered_participants__attendance=True)),
+        last_marked=Max('registered_participants__attendance_marked_at'),
+    )
+    raw = '|'.join(str(state[key]) for key in sorted(state))
+    return hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_or_queue_report(event, kind, user=None):
+    """
+    Return the ReportJob for the event's current data, queueing it if needed.
+
+    Failed jobs are re-queued so a retry is a plain repeat download.
+    """
+    job, created = ReportJob.objects.get_or_create(
+        event=event,
+        kind=kind,
+        data_version=report_data_version(event),
+        defaults={'requested_by': user if user and user.is_authenticated else None},
+    )
+    if job.status == 'failed':
+        ReportJob.objects.filter(pk=job.pk, status='failed').update(status='queued', error='')
+        job.refresh_from_db()
+    elif job.status == 'done' and not job.file.storage.exists(job.file.name):
+        # Artifact removed from storage; build it again
+        ReportJob.objects.filter(pk=job.pk, status='done').update(status='queued', file='')
+        job.refresh_from_db()
+    return job
+
+
+def _report_rows(job):
+    event = job.event
+    if job.kind == 'analysis':
+        participants = Participant.objects.filter(event=event).select_related('user', 'user__profile')
+        return iter_analysis_rows(event, participants)
+    od_list_entries = (
+        ODList.objects.filter(event=event)
+        .select_related('participant', 'participant__user', 'participant__user__profile')
+        .order_by('participant__user__first_name', 'participant__user__last_name')
+    )
+    return iter_od_list_rows(event, od_list_entries)
+
+
+def build_report(job):
+    """Write the job's CSV into media storage and mark it done (or failed)"""
+    try:
+        filename = f"{job.event.event_name}_{job.kind}_{timezone.now().strftime('%Y%m%d_%H%M%S')}.csv"
+        with tempfile.TemporaryFile(mode='w+', newline='', encoding='utf-8') as tmp_file:
+            writer = csv.writer(tmp_file)
+            writer.writerows(_report_rows(job))
+            tmp_file.seek(0)
+            job.file.save(f'{job.event_id}/{job.kind}_{job.data_version[:16]}.csv', File(tmp_file), save=False)
+
+        job.filename = filename
+        job.status = 'done'
+        job.error = ''
+        job.finished_at = timezone.now()
+        job.save(update_fields=['file', 'filename', 'status', 'error', 'finished_at'])
+    except Exception as e:
+        job.status = 'failed'
+        job.error = f'{type(e).__name__}: {e}'
+        job.finished_at = timezone.now()
+        job.save(update_fields=['status', 'error', 'finished_at'])
+        return False
+
+    discard_stale_reports(job)
+    return True
+
+
+def discard_stale_reports(job):
+    """Delete finished older versions of the same event report, including their files"""
+    stale = ReportJob.objects.filter(
+        event_id=job.event_id,
+        kind=job.kind,
+        id__lt=job.id,
+        status__in=['done', 'failed'],
+    )
+    for old_job in stale:
+        if old_job.file:
+            old_job.file.delete(save=False)
+        old_job.delete()
+
+
+def claim_report_jobs(batch_size=5, stale_after=timedelta(minutes=30)):
+    """
+    Claim queued jobs (and ones stuck 'running' after a worker crash) for this worker.
+
+    Claimed one by one with a conditional UPDATE, so several workers never build the same job.
+    """
+    now = timezone.now()
+    due = (
+        ReportJob.objects
+        .filter(Q(status='queued') | Q(status='running', started_at__lt=now - stale_after))
+        .order_by('id')
+        .values_list('id', 'status')[:batch_size]
+    )
+    claimed_ids = [
+        job_id for job_id, current_status in due
+        if ReportJob.objects.filter(pk=job_id, status=current_status).update(status='running', started_at=now)
+    ]
+    return list(ReportJob.objects.filter(id__in=claimed_ids).select_related('event', 'event__event_type').order_by('id'))
+
+
+def process_report_jobs(batch_size=5):
+    """
+    Build one batch of queued reports.
+
+    Returns:
+        dict: counts of 'built' and 'failed' jobs
+    """
+    counts = {'built': 0, 'failed': 0}
+    for job in claim_report_jobs(batch_size=batch_size):
+        if build_report(job):
+            counts['built'] += 1
+        else:
+            counts['failed'] += 1
+    return counts
@@ -0,0 +1,134 @@
+"""
+Server-side response cache for the public event endpoints.
+
+Entries hold the serialized payload and its ETag, keyed by endpoint,
+scheme, host and query string (absolute media and pagination URLs depend
+on all three), and are tagged with the rows they were built from
+('event:<id>', 'event_category:<id>', 'event_guide:<event id>', plus
+'event_list' and 'event_categories' for the set-level lists and
+'event_seats' for the lists filtered on open seats). Every tag has a
+version stamp in the cache; an entry records the versions it saw and is
+stale once any of them moved. Signals on Event, EventQuestion, EventGuide
+and EventCategory (and the seat counter updates) bump exactly the tags of
+the changed rows, so a warm entry is served without touching the ORM.
+
+Entries also expire after RESPONSE_CACHE_SECONDS, or earlier when a
+time-dependent flag or filter in them (is_upcoming, is_registration_open,
+?registration_open) flips. Use a shared cache backend (REDIS_URL) when running several workers.
+"""
+import hashlib
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.response import Response
+
+from users.choice_lookups import choice_tables_version
+
+from .conditional import conditional_get
+
+KEY_PREFIX = 'response_cache'
+EVENT_LIST_TAG = 'event_list'
+EVENT_CATEGORIES_TAG = 'event_categories'
+# Lists filtered on seat availability: every seat counter update changes them
+EVENT_SEATS_TAG = 'event_seats'
+
+
+def event_tag(event_id):
+    return f'event:{event_id}'
+
+
+def event_category_tag(category_id):
+    return f'event_category:{category_id}'
+
+
+def event_guide_tag(event_id):
+    return f'event_guide:{event_id}'
+
+
+def event_tags(events):
+    """Tags of a set of serialized events: the events and their categories"""
+    tags = set()
+    for event in events:
+        tags.add(event_tag(event.pk))
+        tags.add(event_category_tag(event.event_type_id))
+    return tags
+
+
+def _tag_key(tag):
+    return f'{KEY_PREFIX}:tag:{tag}'
+
+
+def _entry_key(name, request):
+    query = '&'.join(sorted(f'{key}={value}' for key, values in request.GET.lists() for value in values))
+    # Display names come from the choice tables; a change to any of them starts a new key space
+    raw = f'{request.scheme}|{request.get_host()}|{request.path}|{query}|{choice_tables_version()}'
+    return f'{KEY_PREFIX}:entry:{name}:{hashlib.sha256(raw.encode()).hexdigest()}'
+
+
+def _tag_versions(tags):
+    """Current version stamp of each tag, creating missing ones"""
+    keys = {_tag_key(tag): tag for tag in tags}
+    current = cache.get_many(keys)
+    missing = [key for key in keys if key not in current]
+    if missing:
+        for key in missing:
+            cache.add(key, uuid.uuid4().hex, None)
+        current.update(cache.get_many(missing))
+    return {keys[key]: version for key, version in current.items()}
+
+
+def _bump(tags):
+    cache.set_many({_tag_key(tag): uuid.uuid4().hex for tag in tags}, None)
+
+
+def invalidate_tags(*tags):
+    """
+    Mark every entry built from these tags stale.
+
+    Bumped again on commit, so an entry rebuilt from the still uncommitted
+    rows in between does not outlive the transaction.
+    """
+    tags = [tag for tag in tags if tag]
+    if not tags:
+        return
+    _bump(tags)
+    transaction.on_commit(lambda: _bump(tags))
+
+
+def _is_fresh(entry):
+    stored = entry['tags']
+    current = cache.get_many([_tag_key(tag) for tag in stored])
+    return all(current.get(_tag_key(tag)) == version for tag, version in stored.items())
+
+
+def cached_get(request, name, build, tags=(), **cache_control):
+    """
+    Serve a GET from the response cache, building and storing the entry on a miss.
+
+    Args:
+        name: endpoint name, part of the cache key
+        build: callable returning (response, etag, extra tags,
+            expires_at or None). Only 200 responses are cached.
+        tags: tags known before building (their versions are read first, so
+            a change landing while the entry is built leaves it stale)
+        cache_control: Cache-Control directives, as for conditional_get
+    """
+    key = _entry_key(name, request)
+    entry = cache.get(key)
+    if entry is None or not _is_fresh(entry):
+        versions = _tag_versions(tags)
+        response, etag, extra_tags, expires_at = build()
+        if response.status_code != 200:
+            return response
+
+        versions.update(_tag_versions(set(extra_tags) - set(versions)))
+        entry = {'data': response.data, 'etag': etag, 'tags': versions}
+        timeout = settings.RESPONSE_CACHE_SECONDS
+        if expires_at is not None:
+            timeout = min(timeout, max(int((expires_at - timezone.now()).total_seconds()), 1))
+        cache.set(key, entry, timeout)
+
+    return conditional_get(request, entry['etag'], lambda: Response(entry['data']), **cache_control)
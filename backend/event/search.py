@@ -0,0 +1,235 @@
+"""
+Full-text search over event names and descriptions.
+
+`?search=` used to be `event_name__icontains | description__icontains`, a
+sequential scan over every description with no ranking. The index now
+lives in the database and is maintained by triggers, so every save (and
+every queryset.update() touching the two columns) keeps it in sync:
+
+- PostgreSQL: the `search_vector` tsvector column (name weighted above
+  description) with a GIN index, matched with websearch_to_tsquery, ranked
+  with ts_rank and highlighted with ts_headline.
+- SQLite (the get_database_config() fallback): an external-content FTS5
+  table over event_event, ranked with bm25 and highlighted with snippet().
+
+Matches come back best first, annotated with `search_rank` (higher is
+better) and `search_headline` (description excerpt, hits wrapped in
+<mark>). Without an index (SQLite built without FTS5) search falls back to
+the old icontains filter.
+
+SQLite drops a table's triggers when a migration rebuilds the table; run
+`manage.py rebuild_event_search` after such a migration.
+"""
+import re
+
+from django.contrib.postgres.search import SearchHeadline, SearchQuery, SearchRank
+from django.db import connections, models
+from django.db.models import F, FloatField, Func, Q, TextField, Value
+
+FTS_TABLE = 'event_event_fts'
+SEARCH_CONFIG = 'english'
+HIGHLIGHT_START = '<mark>'
+HIGHLIGHT_STOP = '</mark>'
+
+# bm25() column weights on SQLite (PostgreSQL weighs the name as 'A', the description as 'B')
+NAME_WEIGHT, DESCRIPTION_WEIGHT = 10.0, 1.0
+
+_POSTGRES_VECTOR = (
+    "setweight(to_tsvector('{config}', coalesce({row}.event_name, '')), 'A') || "
+    "setweight(to_tsvector('{config}', coalesce({row}.description, '')), 'B')"
+)
+
+_POSTGRES_INSTALL = [
+    'CREATE INDEX IF NOT EXISTS event_event_search_gin ON event_event USING gin (search_vector)',
+    f"""
+    CREATE OR REPLACE FUNCTION event_event_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector := {_POSTGRES_VECTOR.format(config=SEARCH_CONFIG, row='NEW')};
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    'DROP TRIGGER IF EXISTS event_event_search_vector_update ON event_event',
+    """
+    CREATE TRIGGER event_event_search_vector_update
+    BEFORE INSERT OR UPDATE OF event_name, description, search_vector ON event_event
+    FOR EACH ROW EXECUTE FUNCTION event_event_search_vector_update()
+    """,
+    f"UPDATE event_event SET search_vector = {_POSTGRES_VECTOR.format(config=SEARCH_CONFIG, row='event_event')}",
+]
+
+_POSTGRES_REMOVE = [
+    'DROP TRIGGER IF EXISTS event_event_search_vector_update ON event_event',
+    'DROP FUNCTION IF EXISTS event_event_search_vector_update()',
+    'DROP INDEX IF EXISTS event_event_search_gin',
+]
+
+_SQLITE_INSTALL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        event_name, description, content='event_event', content_rowid='id', tokenize='porter unicode61'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_insert AFTER INSERT ON event_event BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, event_name, description) VALUES (new.id, new.event_name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_delete AFTER DELETE ON event_event BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, event_name, description)
+        VALUES ('delete', old.id, old.event_name, old.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_update AFTER UPDATE OF event_name, description ON event_event BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, event_name, description)
+        VALUES ('delete', old.id, old.event_name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, event_name, description) VALUES (new.id, new.event_name, new.description);
+    END
+    """,
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+_SQLITE_REMOVE = [
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_insert',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_delete',
+    f'DROP TRIGGER IF EXISTS {FTS_TABLE}_update',
+    f'DROP TABLE IF EXISTS {FTS_TABLE}',
+]
+
+
+class FullTextMatch(models.Lookup):
+    """`<FTS5 hidden column>__match=query`: the FTS5 MATCH operator"""
+
+    lookup_name = 'match'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'{lhs} MATCH {rhs}', (*lhs_params, *rhs_params)
+
+
+class FullTextDocumentField(models.TextField):
+    """
+    The hidden column named after an FTS5 table.
+
+    Matching it searches every indexed column, and it is the first argument
+    of the bm25() / snippet() auxiliary functions.
+    """
+
+
+FullTextDocumentField.register_lookup(FullTextMatch)
+
+
+# alias -> whether the FTS5 table exists (checked once per process)
+_sqlite_index = {}
+
+
+def _sqlite_has_fts5(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA compile_options')
+        return any(option == 'ENABLE_FTS5' for option, in cursor.fetchall())
+
+
+def install_search_index(connection):
+    """(Re)create the index, its sync triggers and its contents; a no-op on other backends"""
+    if connection.vendor == 'postgresql':
+        statements = _POSTGRES_INSTALL
+    elif connection.vendor == 'sqlite' and _sqlite_has_fts5(connection):
+        statements = _SQLITE_INSTALL
+    else:
+        return False
+
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+    _sqlite_index.pop(connection.alias, None)
+    return True
+
+
+def remove_search_index(connection):
+    statements = {'postgresql': _POSTGRES_REMOVE, 'sqlite': _SQLITE_REMOVE}.get(connection.vendor, [])
+    with connection.cursor() as cursor:
+        for statement in statements:
+            cursor.execute(statement)
+    _sqlite_index.pop(connection.alias, None)
+
+
+def search_backend(using='default'):
+    """'postgresql', 'sqlite' or None when `?search=` falls back to icontains"""
+    connection = connections[using]
+    if connection.vendor == 'postgresql':
+        return 'postgresql'
+    if connection.vendor != 'sqlite':
+        return None
+    if connection.alias not in _sqlite_index:
+        _sqlite_index[connection.alias] = FTS_TABLE in connection.introspection.table_names()
+    return 'sqlite' if _sqlite_index[connection.alias] else None
+
+
+def _fts5_query(text):
+    """
+    User input as an FTS5 query: every word must match, the last one as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in the input are
+    plain text rather than syntax errors.
+    """
+    words = re.findall(r'\w+', text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def icontains_search(events, text):
+    return events.filter(Q(event_name__icontains=text) | Q(description__icontains=text))
+
+
+def search_events(events, text):
+    """
+    Filter `events` to the matches of `text`, best match first (ties keep the queryset's ordering).
+
+    Returns:
+        QuerySet: annotated with `search_rank` and `search_headline` when an
+        index is available, otherwise the unranked icontains matches
+    """
+    backend = search_backend(events.db)
+    ordering = events.query.order_by or events.model._meta.ordering
+
+    if backend == 'postgresql':
+        query = SearchQuery(text, config=SEARCH_CONFIG, search_type='websearch')
+        return (
+            events.filter(search_vector=query)
+            .annotate(
+                search_rank=SearchRank(F('search_vector'), query),
+                search_headline=SearchHeadline(
+                    'description', query, config=SEARCH_CONFIG,
+                    start_sel=HIGHLIGHT_START, stop_sel=HIGHLIGHT_STOP, max_words=35, min_words=15,
+                ),
+            )
+            .order_by('-search_rank', *ordering)
+        )
+
+    if backend == 'sqlite':
+        query = _fts5_query(text)
+        if query is None:
+            return icontains_search(events, text)
+        document = F('search_index__document')
+        return (
+            events.filter(search_index__document__match=query)
+            .annotate(
+                # bm25() is lower for better matches
+                search_rank=Func(
+                    document, Value(NAME_WEIGHT), Value(DESCRIPTION_WEIGHT), function='bm25', output_field=FloatField()
+                ) * -1,
+                search_headline=Func(
+                    document, Value(1), Value(HIGHLIGHT_START), Value(HIGHLIGHT_STOP), Value('...'), Value(32),
+                    function='snippet', output_field=TextField(),
+                ),
+            )
+            .order_by('-search_rank', *ordering)
+        )
+
+    return icontains_search(events, text)
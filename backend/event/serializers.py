@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
 from .models import Event, ODList, Participant, EventGuide, EventQuestion
 from django.contrib.auth import get_user_model
 from datetime import datetime, timedelta
@@ -6,6 +7,60 @@ from django.utils import timezone
 
 User = get_user_model()
 
+class SparseFieldsetMixin:
+    """
+    Sparse fieldsets for read requests.
+
+    `?fields=id,event_name` renders only the listed fields and `?expand=questions`
+    adds the ones in Meta.expandable_fields, which are left out by default.
+    Meta.select_related_fields / Meta.prefetch_related_fields map a field to
+    the relation it reads; `setup_queryset` joins or prefetches exactly the
+    relations of the fields a request renders.
+    """
+
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        selected = self.selected_fields(self.context.get('request'))
+        if selected is not None:
+            for name in set(self.fields) - selected:
+                self.fields.pop(name)
+
+    @staticmethod
+    def _names(request, param):
+        return {name.strip() for name in request.query_params.get(param, '').split(',') if name.strip()}
+
+    @classmethod
+    def selected_fields(cls, request):
+        """Names of the fields to render for `request`, or None for all of them"""
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        expandable = set(getattr(cls.Meta, 'expandable_fields', ()))
+        requested = cls._names(request, cls.fields_query_param)
+        expanded = cls._names(request, cls.expand_query_param) & expandable
+        if requested:
+            return requested | expanded
+        if not expandable:
+            return None
+        return (set(cls.Meta.fields) - expandable) | expanded
+
+    @classmethod
+    def setup_queryset(cls, queryset, request):
+        """`queryset` with the joins / prefetches the fields rendered for `request` need"""
+        selected = cls.selected_fields(request)
+        select_related = getattr(cls.Meta, 'select_related_fields', {})
+        prefetch_related = getattr(cls.Meta, 'prefetch_related_fields', {})
+        joins = {relation for name, relation in select_related.items() if selected is None or name in selected}
+        prefetches = {relation for name, relation in prefetch_related.items() if selected is None or name in selected}
+        if joins:
+            queryset = queryset.select_related(*sorted(joins))
+        if prefetches:
+            queryset = queryset.prefetch_related(*sorted(prefetches))
+        return queryset
+
+
 class EventQuestionSerializer(serializers.ModelSerializer):
     """Serializer for EventQuestion model"""
 
@@ -38,13 +93,14 @@ class EventQuestionSerializer(serializers.ModelSerializer):
                 raise serializers.ValidationError("File type questions must specify allowed extensions in help_text")
         return data
 
-class EventSerializer(serializers.ModelSerializer):
+class EventSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     """Serializer for Event model"""
 
     is_upcoming = serializers.ReadOnlyField()
     is_registration_open = serializers.ReadOnlyField()
     get_current_participants = serializers.ReadOnlyField()
-    event_type_display = serializers.CharField(source='get_event_type_display', read_only=True)
+    seats_left = serializers.ReadOnlyField()
+    event_type_display = serializers.CharField(source='event_type.display_name', read_only=True)
     payment_type_display = serializers.CharField(source='get_payment_type_display', read_only=True)
     participation_type_display = serializers.CharField(source='get_participation_type_display', read_only=True)
     event_mode_display = serializers.CharField(source='get_event_mode_display', read_only=True)
@@ -66,9 +122,12 @@ class EventSerializer(serializers.ModelSerializer):
             'id', 'event_name', 'description', 'event_date', 'event_end_date', 'start_time', 'end_time', 'event_type', 'event_type_display',
             'payment_type', 'payment_type_display', 'participation_type', 'participation_type_display', 'event_mode', 'event_mode_display', 'meeting_url',
             'price', 'max_participants', 'registration_deadline', 'venue', 'event_image', 'event_image_url', 'event_video', 'video_url',
-            'require_registration_form', 'questions', 'is_active', 'is_upcoming', 'is_registration_open', 'get_current_participants', 'created_at', 'updated_at'
+            'require_registration_form', 'questions', 'is_active', 'is_upcoming', 'is_registration_open', 'get_current_participants',
+            'admission_queue_enabled', 'confirmed_count', 'seats_left', 'created_at', 'updated_at'
         ]
-        read_only_fields = ['id', 'created_at', 'updated_at', 'is_upcoming', 'is_registration_open', 'get_current_participants', 'event_image_url', 'questions']# 'gateway_options_display']
+        read_only_fields = ['id', 'created_at', 'updated_at', 'is_upcoming', 'is_registration_open', 'get_current_participants', 'confirmed_count', 'seats_left', 'event_image_url', 'questions']# 'gateway_options_display']
+        select_related_fields = {'event_type_display': 'event_type'}
+        prefetch_related_fields = {'questions': 'questions'}
         
     def validate_event_date(self, value):
         """Validate that event date is in the future"""
@@ -188,15 +247,18 @@ class EventSerializer(serializers.ModelSerializer):
 
         return data
 
-class EventListSerializer(serializers.ModelSerializer):
-    """Lightweight serializer for event listings"""
+class EventListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    """Lightweight serializer for event listings (card fields; questions only with ?expand=questions)"""
 
-    event_type_display = serializers.CharField(source='get_event_type_display', read_only=True)
+    event_type_display = serializers.CharField(source='event_type.display_name', read_only=True)
     payment_type_display = serializers.CharField(source='get_payment_type_display', read_only=True)
     is_upcoming = serializers.ReadOnlyField()
     event_image_url = serializers.SerializerMethodField()
     require_registration_form = serializers.BooleanField(read_only=True)
     questions = EventQuestionSerializer(many=True, read_only=True)
+    # Only present on ?search= results (see event/search.py)
+    search_rank = serializers.FloatField(read_only=True)
+    search_headline = serializers.CharField(read_only=True)
 
     def get_event_image_url(self, obj):
         """Return the full URL of the event image"""
@@ -212,8 +274,11 @@ class EventListSerializer(serializers.ModelSerializer):
         fields = [
             'id', 'event_name', 'description', 'event_date', 'event_type', 'event_type_display',
             'payment_type', 'payment_type_display', 'venue', 'event_image', 'event_image_url', 'event_video', 'video_url',
-            'require_registration_form', 'questions', 'is_active', 'is_upcoming'
+            'require_registration_form', 'questions', 'is_active', 'is_upcoming', 'search_rank', 'search_headline'
         ]
+        expandable_fields = ['questions']
+        select_related_fields = {'event_type_display': 'event_type'}
+        prefetch_related_fields = {'questions': 'questions'}
 
 class ODListSerializer(serializers.ModelSerializer):
     user_name = serializers.SerializerMethodField()
@@ -263,10 +328,14 @@ class ParticipantSerializer(serializers.ModelSerializer):
             'display_name': user.get_full_name() or user.username,
         }
 
+    def _od_entry(self, obj):
+        # all() rather than first(): first() re-queries a prefetched relation (ODList has no ordering)
+        return next(iter(obj.registered_participants.all()), None)
+
     def get_attendance(self, obj):
         """Return attendance status from ODList"""
         try:
-            od_entry = obj.registered_participants.first()
+            od_entry = self._od_entry(obj)
             return od_entry.attendance if od_entry else False
         except:
             return False
@@ -274,7 +343,7 @@ class ParticipantSerializer(serializers.ModelSerializer):
     def get_hash(self, obj):
         """Return the QR hash from ODList"""
         try:
-            od_entry = obj.registered_participants.first()
+            od_entry = self._od_entry(obj)
             return od_entry.hash if od_entry else None
         except:
             return None
@@ -283,6 +352,50 @@ class ParticipantSerializer(serializers.ModelSerializer):
         model = Participant
         fields = '__all__'
 
+class ScanResultSerializer(serializers.ModelSerializer):
+    """
+    What the gate scanner shows after a scan.
+
+    Reads only the OD entry, participant, user and profile, so fetch the entry
+    with select_related('participant__user__profile').
+    """
+    participant_id = serializers.IntegerField(read_only=True)
+    name = serializers.SerializerMethodField()
+    email = serializers.CharField(source='participant.user.email', read_only=True)
+    rollno = serializers.SerializerMethodField()
+    department = serializers.SerializerMethodField()
+    year = serializers.SerializerMethodField()
+
+    def _profile(self, obj):
+        try:
+            return obj.participant.user.profile
+        except User.profile.RelatedObjectDoesNotExist:
+            return None
+
+    def get_name(self, obj):
+        user = obj.participant.user
+        return user.get_full_name() or user.username
+
+    def get_rollno(self, obj):
+        profile = self._profile(obj)
+        return profile.rollno if profile else None
+
+    def get_department(self, obj):
+        profile = self._profile(obj)
+        return profile.department_display if profile else None
+
+    def get_year(self, obj):
+        profile = self._profile(obj)
+        return profile.year_display if profile else None
+
+    class Meta:
+        model = ODList
+        fields = [
+            'participant_id', 'name', 'email', 'rollno', 'department', 'year',
+            'attendance', 'attendance_marked_at'
+        ]
+
+
 class ParticipantListSerializer(serializers.ModelSerializer):
     class Meta:
         model = Participant
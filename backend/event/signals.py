@@ -0,0 +1,125 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .models import Event, EventCategory, EventGuide, EventQuestion, EventStats, ODList, Participant
+from .response_cache import (
+    EVENT_CATEGORIES_TAG, EVENT_LIST_TAG, event_category_tag, event_guide_tag, event_tag, invalidate_tags,
+)
+
+
+def _deleted_with_event(origin):
+    """Whether a delete cascades from an Event (its counters go with it)"""
+    return isinstance(origin, Event) or getattr(origin, 'model', None) is Event
+
+
+def _counter_deltas(new, old):
+    return {field: new.get(field, 0) - old.get(field, 0) for field in set(new) | set(old)}
+
+
+@receiver(pre_save, sender=Participant)
+def load_previous_registration_status(sender, instance, raw=False, **kwargs):
+    """Fetch the stored status for instances that were not loaded through the ORM"""
+    if raw or instance._state.adding or hasattr(instance, '_loaded_registration_status'):
+        return
+    instance._loaded_registration_status, instance._loaded_payment_status = (
+        Participant.objects.filter(pk=instance.pk)
+        .values_list('registration_status', 'payment_status')
+        .first()
+    ) or (None, None)
+
+
+@receiver(post_save, sender=Participant)
+def update_confirmed_count_on_save(sender, instance, created, raw=False, **kwargs):
+    """Keep Event.confirmed_count and EventStats in step with the participant's status"""
+    if raw:
+        return
+
+    was_confirmed = not created and instance._loaded_registration_status == 'confirmed'
+    is_confirmed = instance.registration_status == 'confirmed'
+
+    # Seats claimed up front through Event.reserve_seat() are already counted
+    if is_confirmed and not was_confirmed and not getattr(instance, '_seat_reserved', False):
+        Event.adjust_confirmed_count(instance.event_id, 1)
+    elif was_confirmed and not is_confirmed:
+        Event.adjust_confirmed_count(instance.event_id, -1)
+
+    # Shift EventStats by the change in what this participant counts towards
+    old = {} if created else EventStats.participant_counters(
+        instance._loaded_registration_status, getattr(instance, '_loaded_payment_status', None)
+    )
+    new = EventStats.participant_counters(instance.registration_status, instance.payment_status)
+    EventStats.adjust(instance.event_id, **_counter_deltas(new, old))
+
+    instance._loaded_registration_status = instance.registration_status
+    instance._loaded_payment_status = instance.payment_status
+    instance._seat_reserved = False
+
+
+@receiver(post_delete, sender=Participant)
+def update_confirmed_count_on_delete(sender, instance, origin=None, **kwargs):
+    """Release the seat of a deleted confirmed participant"""
+    # Nothing to maintain when the event itself is being deleted
+    if _deleted_with_event(origin):
+        return
+    if instance.registration_status == 'confirmed':
+        Event.adjust_confirmed_count(instance.event_id, -1)
+
+
+@receiver(post_delete, sender=Participant)
+def update_event_stats_on_participant_delete(sender, instance, origin=None, **kwargs):
+    if _deleted_with_event(origin):
+        return
+    removed = EventStats.participant_counters(instance.registration_status, instance.payment_status)
+    EventStats.adjust(instance.event_id, **{field: -count for field, count in removed.items()})
+
+
+@receiver(pre_save, sender=ODList)
+def load_previous_od_flags(sender, instance, raw=False, **kwargs):
+    """Fetch the stored flags for OD entries that were not loaded through the ORM"""
+    if raw or instance._state.adding or hasattr(instance, '_loaded_flags'):
+        return
+    instance._loaded_flags = (
+        ODList.objects.filter(pk=instance.pk).values_list('qr_sent', 'attendance').first()
+    ) or (None, None)
+
+
+@receiver(post_save, sender=ODList)
+def update_event_stats_on_od_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    old = {} if created else EventStats.od_counters(*instance._loaded_flags)
+    new = EventStats.od_counters(instance.qr_sent, instance.attendance)
+    EventStats.adjust(instance.event_id, **_counter_deltas(new, old))
+    instance._loaded_flags = (instance.qr_sent, instance.attendance)
+
+
+@receiver(post_delete, sender=ODList)
+def update_event_stats_on_od_delete(sender, instance, origin=None, **kwargs):
+    if _deleted_with_event(origin):
+        return
+    removed = EventStats.od_counters(instance.qr_sent, instance.attendance)
+    EventStats.adjust(instance.event_id, **{field: -count for field, count in removed.items()})
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_responses(sender, instance, **kwargs):
+    invalidate_tags(event_tag(instance.pk), EVENT_LIST_TAG)
+
+
+@receiver(post_save, sender=EventQuestion)
+@receiver(post_delete, sender=EventQuestion)
+def invalidate_question_responses(sender, instance, **kwargs):
+    invalidate_tags(event_tag(instance.event_id))
+
+
+@receiver(post_save, sender=EventGuide)
+@receiver(post_delete, sender=EventGuide)
+def invalidate_guide_responses(sender, instance, **kwargs):
+    invalidate_tags(event_guide_tag(instance.event_id))
+
+
+@receiver(post_save, sender=EventCategory)
+@receiver(post_delete, sender=EventCategory)
+def invalidate_category_responses(sender, instance, **kwargs):
+    invalidate_tags(EVENT_CATEGORIES_TAG, event_category_tag(instance.pk))
@@ -1 +1,1706 @@
-from django.test import TestCase
+import base64
+import gzip
+import importlib
+import io
+import json
+import os
+import re
+import resource
+import shutil
+import smtplib
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import timedelta
+from unittest import mock, skipUnless
+
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.core import mail
+from django.core.cache import cache
+from django.core.mail.backends import locmem
+from django.core.mail.backends.base import BaseEmailBackend
+from django.core.management import call_command
+from django.db import OperationalError, connection
+from django.db.models import QuerySet
+from django.test import SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.encoding import force_bytes
+from django.utils.http import http_date, urlsafe_base64_encode
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from . import admin_jobs
+from .admin_jobs import claim_admin_jobs, process_admin_jobs
+from .admission import admit_ticket, enqueue_registration, process_admission_queue, promote_waitlist
+from .attendance import mark_attendance_batch
+from .bulk_mail import send_registration_emails_bulk
+from .email_services import create_participant_with_od, enqueue_email, process_mail_outbox, send_registration_email
+from .exports import _get_college_stats, _get_department_stats, _get_year_stats, _summary_counts
+from .live import attendance_delta
+from .models import AdminJob, AdmissionTicket, Event, EventCategory, EventQuestion, EventStats, ODList, OutboundEmail, Participant, ReportJob
+from .qr_codes import PRERENDER_POOL_THRESHOLD, get_qr_png, prerender_qr_codes
+from .reports import process_report_jobs
+from .search import icontains_search, search_backend, search_events
+from .tickets import make_ticket_token, token_index_key, verify_ticket_token
+from .views import Scanner
+from authentication.forms import CustomPasswordResetForm
+from users.choice_lookups import get_choice_tables, invalidate_choice_lookups
+
+User = get_user_model()
+
+
+class TempQRCacheMixin:
+    """Render QR images into a throwaway cache directory"""
+
+    def setUp(self):
+        super().setUp()
+        self.qr_cache_dir = tempfile.mkdtemp(prefix='qr_cache_test_')
+        self.addCleanup(shutil.rmtree, self.qr_cache_dir, ignore_errors=True)
+        override = self.settings(QR_CACHE_DIR=self.qr_cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+class TempMediaMixin:
+    """Store generated report files in a throwaway media directory"""
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp(prefix='media_test_')
+        self.addCleanup(shutil.rmtree, self.media_root, ignore_errors=True)
+        override = self.settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+
+
+def make_event(**kwargs):
+    category, _ = EventCategory.objects.get_or_create(code='workshop', defaults={'display_name': 'Workshop'})
+    defaults = {
+        'event_name': 'Test Event',
+        'description': 'Test event',
+        'event_date': timezone.now() + timedelta(days=7),
+        'event_type': category,
+    }
+    defaults.update(kwargs)
+    return Event.objects.create(**defaults)
+
+
+class RegistrationConcurrencyTests(TransactionTestCase):
+    """Parallel registrations must never oversell an event"""
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('Needs a file-backed or server test database for parallel connections')
+
+    WORKERS = 200
+    CAPACITY = 50
+
+    def _register_in_parallel(self, event, users):
+        barrier = threading.Barrier(len(users))
+        results = []
+        lock = threading.Lock()
+
+        def register(user):
+            try:
+                barrier.wait()
+                for _ in range(20):
+                    result = create_participant_with_od(user, event, send_email=False)
+                    # error_code is None only for unexpected errors such as
+                    # database lock timeouts; retry those
+                    if result['success'] or result['error_code']:
+                        break
+                with lock:
+                    results.append(result)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=register, args=(user,)) for user in users]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        return results
+
+    def test_parallel_registrations_fill_event_exactly(self):
+        event = make_event(max_participants=self.CAPACITY)
+        users = [User.objects.create(username=f'rush{i}') for i in range(self.WORKERS)]
+
+        results = self._register_in_parallel(event, users)
+
+        succeeded = [r for r in results if r['success']]
+        full = [r for r in results if r['error_code'] == 'event_full']
+        self.assertEqual(len(succeeded), self.CAPACITY)
+        self.assertEqual(len(full), self.WORKERS - self.CAPACITY)
+
+        event.refresh_from_db()
+        self.assertEqual(event.confirmed_count, self.CAPACITY)
+        self.assertEqual(Participant.objects.filter(event=event).count(), self.CAPACITY)
+
+    def test_parallel_duplicate_registrations_create_one_participant(self):
+        event = make_event(max_participants=self.CAPACITY)
+        user = User.objects.create(username='repeat')
+
+        results = self._register_in_parallel(event, [user] * 20)
+
+        self.assertEqual(len([r for r in results if r['success']]), 1)
+        self.assertTrue(all(r['error_code'] == 'already_registered' for r in results if not r['success']))
+
+        event.refresh_from_db()
+        self.assertEqual(event.confirmed_count, 1)
+        self.assertEqual(Participant.objects.filter(event=event).count(), 1)
+
+
+class ReserveSeatTests(TestCase):
+
+    def test_reserve_seat_stops_at_capacity(self):
+        event = make_event(max_participants=2)
+        self.assertTrue(Event.reserve_seat(event.pk))
+        self.assertTrue(Event.reserve_seat(event.pk))
+        self.assertFalse(Event.reserve_seat(event.pk))
+        event.refresh_from_db()
+        self.assertEqual(event.confirmed_count, 2)
+
+    def test_reserve_seat_without_limit(self):
+        event = make_event(max_participants=None)
+        for _ in range(5):
+            self.assertTrue(Event.reserve_seat(event.pk))
+        event.refresh_from_db()
+        self.assertEqual(event.confirmed_count, 5)
+
+    def test_staff_booking_overbooks_full_event(self):
+        event = make_event(max_participants=1)
+        first, second, third = [User.objects.create(username=f'seat{i}') for i in range(3)]
+        self.assertTrue(create_participant_with_od(first, event, send_email=False)['success'])
+        self.assertEqual(create_participant_with_od(second, event, send_email=False)['error_code'], 'event_full')
+
+        result = create_participant_with_od(third, event, send_email=False, overbook=True)
+
+        self.assertTrue(result['success'])
+        event.refresh_from_db()
+        self.assertEqual(event.confirmed_count, 2)
+
+    def test_admin_internal_booking_overbooks(self):
+        event = make_event(max_participants=1)
+        Event.adjust_confirmed_count(event.pk, 1)
+        guests = [User.objects.create(username=f'guest{i}', email=f'guest{i}@example.com') for i in range(2)]
+        job = AdminJob.objects.create(
+            action='internal_booking', object_ids=[guest.pk for guest in guests], total=2,
+            params={'event_id': event.pk},
+        )
+
+        process_admin_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.failed), ('done', 2, 0))
+        event.refresh_from_db()
+        self.assertEqual(event.confirmed_count, 3)
+
+
+class AdmissionQueueTests(TestCase):
+
+    def setUp(self):
+        self.event = make_event(max_participants=2, admission_queue_enabled=True)
+        self.users = [User.objects.create(username=f'queued{i}', email=f'queued{i}@example.com') for i in range(4)]
+
+    def test_worker_admits_in_order_and_waitlists_overflow(self):
+        tickets = [enqueue_registration(user, self.event)[0] for user in self.users]
+        self.assertEqual(enqueue_registration(self.users[0], self.event), (tickets[0], False))
+        self.assertEqual(tickets[3].queue_position, 4)
+
+        counts = process_admission_queue()
+
+        self.assertEqual(counts['admitted'], 2)
+        self.assertEqual(counts['waitlisted'], 2)
+        statuses = [AdmissionTicket.objects.get(pk=t.pk).status for t in tickets]
+        self.assertEqual(statuses, ['admitted', 'admitted', 'waitlisted', 'waitlisted'])
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.confirmed_count, 2)
+
+    def test_unregister_promotes_first_waitlisted(self):
+        for user in self.users:
+            enqueue_registration(user, self.event)
+        process_admission_queue()
+
+        Participant.objects.get(user=self.users[0], event=self.event).delete()
+        promoted = promote_waitlist(self.event)
+
+        self.assertEqual([p.user_id for p in promoted], [self.users[2].id])
+        self.assertEqual(
+            Participant.objects.get(user=self.users[2], event=self.event).registration_status, 'confirmed'
+        )
+        self.assertTrue(ODList.objects.filter(participant__user=self.users[2], event=self.event).exists())
+        self.event.refresh_from_db()
+        self.assertEqual(self.event.confirmed_count, 2)
+
+    def test_overlapping_worker_skips_claimed_event(self):
+        tickets = [enqueue_registration(user, self.event)[0] for user in self.users]
+        overlapping = []
+
+        def admit_during_second_pass(ticket):
+            if not overlapping:
+                # A second worker starts while the first is admitting the head ticket
+                overlapping.append(process_admission_queue())
+            return admit_ticket(ticket)
+
+        with mock.patch('event.admission.admit_ticket', side_effect=admit_during_second_pass):
+            counts = process_admission_queue()
+
+        self.assertEqual(overlapping, [{'admitted': 0, 'waitlisted': 0, 'rejected': 0, 'failed': 0}])
+        self.assertEqual(counts, {'admitted': 2, 'waitlisted': 2, 'rejected': 0, 'failed': 0})
+        statuses = [AdmissionTicket.objects.get(pk=t.pk).status for t in tickets]
+        self.assertEqual(statuses, ['admitted', 'admitted', 'waitlisted', 'waitlisted'])
+
+    @override_settings(ADMISSION_MAX_ATTEMPTS=2)
+    def test_failing_ticket_is_retried_then_failed(self):
+        tickets = [enqueue_registration(user, self.event)[0] for user in self.users[:2]]
+        real_create = create_participant_with_od
+
+        def create(user, *args, **kwargs):
+            if user == self.users[0]:
+                raise RuntimeError('database hiccup')
+            return real_create(user, *args, **kwargs)
+
+        with mock.patch('event.admission.create_participant_with_od', side_effect=create):
+            first = process_admission_queue()
+            head = AdmissionTicket.objects.get(pk=tickets[0].pk)
+            self.assertEqual((head.status, head.attempts), ('queued', 1))
+            self.assertEqual(AdmissionTicket.objects.get(pk=tickets[1].pk).status, 'queued')
+
+            second = process_admission_queue()
+
+        self.assertEqual(first['failed'], 1)
+        self.assertEqual((second['failed'], second['admitted']), (1, 1))
+        head.refresh_from_db()
+        self.assertEqual((head.status, head.attempts, head.message), ('failed', 2, 'RuntimeError: database hiccup'))
+        self.assertEqual(AdmissionTicket.objects.get(pk=tickets[1].pk).status, 'admitted')
+        # A new attempt by the same user gets a fresh ticket
+        self.assertTrue(enqueue_registration(self.users[0], self.event)[1])
+
+    def test_stale_claim_is_taken_over(self):
+        ticket = enqueue_registration(self.users[0], self.event)[0]
+        AdmissionTicket.objects.filter(pk=ticket.pk).update(
+            status='processing', locked_at=timezone.now() - timedelta(minutes=1), attempts=1
+        )
+        self.assertEqual(process_admission_queue()['admitted'], 0)
+
+        counts = process_admission_queue(stale_after=timedelta(seconds=30))
+
+        self.assertEqual(counts['admitted'], 1)
+        ticket.refresh_from_db()
+        self.assertEqual((ticket.status, ticket.attempts, ticket.locked_at), ('admitted', 2, None))
+
+
+class AdmissionWorkerConcurrencyTests(TransactionTestCase):
+    """Parallel admission workers must admit every ticket exactly once"""
+
+    WORKERS = 4
+
+    def setUp(self):
+        if connection.vendor == 'sqlite' and connection.is_in_memory_db():
+            self.skipTest('Needs a file-backed or server test database for parallel connections')
+
+    def test_parallel_workers_admit_each_ticket_once(self):
+        event = make_event(max_participants=5, admission_queue_enabled=True)
+        users = [User.objects.create(username=f'worker{i}', email=f'worker{i}@example.com') for i in range(8)]
+        tickets = [enqueue_registration(user, event)[0] for user in users]
+        barrier = threading.Barrier(self.WORKERS)
+        results = []
+        lock = threading.Lock()
+
+        def work():
+            try:
+                barrier.wait()
+                for _ in range(200):
+                    if not AdmissionTicket.objects.filter(status__in=AdmissionTicket.OPEN_STATUSES).exists():
+                        break
+                    try:
+                        counts = process_admission_queue()
+                    except OperationalError:
+                        # Lock timeouts on SQLite; retry the pass
+                        continue
+                    with lock:
+                        results.append(counts)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=work) for _ in range(self.WORKERS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(sum(counts['admitted'] for counts in results), 5)
+        self.assertEqual(sum(counts['waitlisted'] for counts in results), 3)
+        self.assertEqual(sum(counts['rejected'] for counts in results), 0)
+        statuses = [AdmissionTicket.objects.get(pk=t.pk).status for t in tickets]
+        self.assertEqual(statuses, ['admitted'] * 5 + ['waitlisted'] * 3)
+        event.refresh_from_db()
+        self.assertEqual(event.confirmed_count, 5)
+
+
+class FailingEmailBackend(BaseEmailBackend):
+
+    def send_messages(self, email_messages):
+        raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+
+
+class CountingEmailBackend(locmem.EmailBackend):
+    """
+    locmem backend that opens connections like the SMTP backend: send_messages()
+    on a closed connection opens one just for that call.
+    """
+
+    lock = threading.Lock()
+    opened = 0
+    # Sends that drop the connection with SMTPServerDisconnected, like an idle timeout
+    disconnects = 0
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.is_open = False
+
+    def open(self):
+        if self.is_open:
+            return False
+        with self.lock:
+            CountingEmailBackend.opened += 1
+        self.is_open = True
+        return True
+
+    def close(self):
+        self.is_open = False
+
+    def send_messages(self, email_messages):
+        new_connection = self.open()
+        try:
+            with self.lock:
+                disconnect = CountingEmailBackend.disconnects > 0
+                CountingEmailBackend.disconnects -= disconnect
+            if disconnect:
+                raise smtplib.SMTPServerDisconnected('Connection unexpectedly closed')
+            return super().send_messages(email_messages)
+        finally:
+            if new_connection:
+                self.close()
+
+
+@override_settings(MAIL_OUTBOX_MAX_ATTEMPTS=2, MAIL_OUTBOX_BACKOFF_SECONDS=30)
+class MailOutboxTests(TempQRCacheMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.event = make_event()
+        self.user = User.objects.create(username='mailer', email='mailer@example.com')
+
+    def test_registration_queues_email_and_worker_delivers_it(self):
+        result = create_participant_with_od(self.user, self.event)
+        self.assertEqual(len(mail.outbox), 0)
+        outbound = OutboundEmail.objects.get(od_list=result['od_list'])
+        self.assertEqual(outbound.status, 'pending')
+
+        self.assertEqual(process_mail_outbox(), {'sent': 1, 'failed': 0})
+
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ['mailer@example.com'])
+        outbound.refresh_from_db()
+        self.assertEqual(outbound.status, 'sent')
+        self.assertTrue(ODList.objects.get(pk=result['od_list'].pk).qr_sent)
+
+    def test_failed_delivery_backs_off_then_dead_letters(self):
+        outbound = enqueue_email('Subject', 'Body', 'someone@example.com')
+
+        with self.settings(EMAIL_BACKEND='event.tests.FailingEmailBackend'):
+            self.assertEqual(process_mail_outbox(), {'sent': 0, 'failed': 1})
+            outbound.refresh_from_db()
+            self.assertEqual(outbound.status, 'pending')
+            self.assertGreater(outbound.next_attempt_at, timezone.now() + timedelta(seconds=20))
+            self.assertIn('SMTPServerDisconnected', outbound.last_error)
+
+            # Not due yet
+            self.assertEqual(process_mail_outbox(), {'sent': 0, 'failed': 0})
+
+            OutboundEmail.objects.filter(pk=outbound.pk).update(next_attempt_at=timezone.now())
+            process_mail_outbox()
+            outbound.refresh_from_db()
+            self.assertEqual(outbound.status, 'dead')
+            self.assertEqual(outbound.attempts, 2)
+
+    def test_password_reset_is_queued_without_the_link(self):
+        form = CustomPasswordResetForm(data={'email': self.user.email})
+        self.assertTrue(form.is_valid())
+        form.save()
+        form.save()
+
+        # Nothing sent in the request; one row that holds only the user
+        self.assertEqual(len(mail.outbox), 0)
+        outbound = OutboundEmail.objects.get()
+        self.assertEqual((outbound.kind, outbound.user, outbound.to_email), ('password_reset', self.user, self.user.email))
+        self.assertEqual((outbound.subject, outbound.body, outbound.html_body), ('', '', ''))
+
+        self.assertEqual(process_mail_outbox(), {'sent': 1, 'failed': 0})
+
+        message = mail.outbox[0]
+        self.assertEqual(message.to, [self.user.email])
+        link = re.search(r'https://\S+/reset-password\?uid=(\S+)&token=(\S+)', message.body)
+        self.assertEqual(link.group(1), urlsafe_base64_encode(force_bytes(self.user.pk)))
+        self.assertTrue(default_token_generator.check_token(self.user, link.group(2)))
+        outbound.refresh_from_db()
+        self.assertNotIn(link.group(2), outbound.body + outbound.html_body + outbound.subject)
+
+    def test_admin_cannot_edit_message(self):
+        outbound = enqueue_email('Receipt', 'Paid in full', 'someone@example.com')
+        self.client.force_login(User.objects.create_superuser('postmaster', 'postmaster@example.com', 'password'))
+
+        response = self.client.get(f'/admin/event/outboundemail/{outbound.pk}/change/')
+
+        self.assertContains(response, 'Paid in full')
+        for field in ('to_email', 'subject', 'body', 'html_body'):
+            self.assertNotContains(response, f'name="{field}"')
+
+
+class SMTPSinkHandler(socketserver.StreamRequestHandler):
+    """Minimal SMTP server that accepts and discards mail"""
+
+    def handle(self):
+        # Stand-in for the TCP + TLS + AUTH cost of a real provider connection
+        time.sleep(self.server.connect_delay)
+        self.wfile.write(b'220 sink ESMTP\r\n')
+        in_data = False
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                break
+            if in_data:
+                if line == b'.\r\n':
+                    in_data = False
+                    with self.server.lock:
+                        self.server.received += 1
+                    self.wfile.write(b'250 OK\r\n')
+                continue
+            command = line[:4].upper()
+            if command == b'DATA':
+                in_data = True
+                self.wfile.write(b'354 End data with <CR><LF>.<CR><LF>\r\n')
+            elif command == b'QUIT':
+                self.wfile.write(b'221 Bye\r\n')
+                break
+            else:
+                self.wfile.write(b'250 OK\r\n')
+
+
+class QRCacheTests(TempQRCacheMixin, SimpleTestCase):
+
+    def cached_files(self):
+        return [name for _, _, files in os.walk(self.qr_cache_dir) for name in files]
+
+    def test_qr_is_rendered_once_per_hash_and_variant(self):
+        first = get_qr_png('a' * 64, 'email')
+        self.assertTrue(first.startswith(b'\x89PNG'))
+        self.assertEqual(get_qr_png('a' * 64, 'email'), first)
+        self.assertEqual(len(self.cached_files()), 1)
+
+        self.assertNotEqual(get_qr_png('a' * 64, 'full'), first)
+        self.assertEqual(len(self.cached_files()), 2)
+
+    def test_prerender_renders_only_missing_images(self):
+        values = [f'{i:064x}' for i in range(PRERENDER_POOL_THRESHOLD + 4)]
+        get_qr_png(values[0], 'email')
+
+        self.assertEqual(prerender_qr_codes(values, processes=2), len(values) - 1)
+        self.assertEqual(len(self.cached_files()), len(values))
+        self.assertEqual(prerender_qr_codes(values), 0)
+
+
+class BulkQREmailTests(TempQRCacheMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.event = make_event()
+        self.od_lists = []
+        for i in range(3):
+            user = User.objects.create(username=f'bulk{i}', email=f'bulk{i}@example.com')
+            participant = Participant.objects.create(user=user, event=self.event, payment_status=True)
+            self.od_lists.append(ODList.objects.create(participant=participant, event=self.event))
+
+    def test_bulk_send_reports_each_recipient_and_marks_sent(self):
+        results = send_registration_emails_bulk(self.od_lists, workers=2, rate_limit=0)
+
+        self.assertEqual([r['email'] for r in results], ['bulk0@example.com', 'bulk1@example.com', 'bulk2@example.com'])
+        self.assertTrue(all(r['success'] for r in results))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(ODList.objects.filter(event=self.event, qr_sent=True).count(), 3)
+
+    def test_bulk_send_reports_failures(self):
+        with self.settings(EMAIL_BACKEND='event.tests.FailingEmailBackend'):
+            results = send_registration_emails_bulk(self.od_lists, workers=2, rate_limit=0)
+
+        self.assertFalse(any(r['success'] for r in results))
+        self.assertIn('SMTPServerDisconnected', results[0]['error'])
+        self.assertFalse(ODList.objects.filter(event=self.event, qr_sent=True).exists())
+
+    @override_settings(EMAIL_BACKEND='event.tests.CountingEmailBackend')
+    def test_each_worker_reuses_one_connection(self):
+        for i in range(3, 10):
+            user = User.objects.create(username=f'bulk{i}', email=f'bulk{i}@example.com')
+            participant = Participant.objects.create(user=user, event=self.event, payment_status=True)
+            self.od_lists.append(ODList.objects.create(participant=participant, event=self.event))
+        CountingEmailBackend.opened = 0
+
+        results = send_registration_emails_bulk(self.od_lists, workers=2, rate_limit=0)
+
+        self.assertTrue(all(r['success'] for r in results))
+        self.assertEqual(len(mail.outbox), 10)
+        self.assertEqual(CountingEmailBackend.opened, 2)
+
+    @override_settings(EMAIL_BACKEND='event.tests.CountingEmailBackend')
+    def test_dropped_connection_is_reopened_and_reused(self):
+        CountingEmailBackend.opened = 0
+        CountingEmailBackend.disconnects = 1
+
+        results = send_registration_emails_bulk(self.od_lists, workers=1, rate_limit=0)
+
+        self.assertTrue(all(r['success'] for r in results))
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(CountingEmailBackend.opened, 2)
+
+
+@skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Set RUN_BENCHMARKS=1 to run benchmarks')
+class BulkQREmailBenchmark(TempQRCacheMixin, TestCase):
+    """Compare one-connection-per-mail sending with the pooled bulk sender against a local SMTP sink"""
+
+    RECIPIENTS = 100
+    CONNECT_DELAY = 0.05
+
+    def setUp(self):
+        super().setUp()
+        self.sink = socketserver.ThreadingTCPServer(('127.0.0.1', 0), SMTPSinkHandler)
+        self.sink.daemon_threads = True
+        self.sink.connect_delay = self.CONNECT_DELAY
+        self.sink.received = 0
+        self.sink.lock = threading.Lock()
+        threading.Thread(target=self.sink.serve_forever, daemon=True).start()
+        self.addCleanup(self.sink.server_close)
+        self.addCleanup(self.sink.shutdown)
+
+        event = make_event()
+        self.od_lists = []
+        for i in range(self.RECIPIENTS):
+            user = User.objects.create(username=f'bench{i}', email=f'bench{i}@example.com')
+            participant = Participant.objects.create(user=user, event=event, payment_status=True)
+            self.od_lists.append(ODList.objects.create(participant=participant, event=event))
+
+    def test_pooled_sender_speedup(self):
+        smtp_settings = {
+            'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST': '127.0.0.1',
+            'EMAIL_PORT': self.sink.server_address[1],
+            'EMAIL_USE_TLS': False,
+            'EMAIL_HOST_USER': '',
+            'EMAIL_HOST_PASSWORD': '',
+        }
+        with self.settings(**smtp_settings), redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for od_list in self.od_lists:
+                send_registration_email(od_list)
+            sequential = time.perf_counter() - start
+
+            start = time.perf_counter()
+            results = send_registration_emails_bulk(self.od_lists, workers=4, rate_limit=0)
+            pooled = time.perf_counter() - start
+
+        self.assertTrue(all(r['success'] for r in results))
+        self.assertEqual(self.sink.received, 2 * self.RECIPIENTS)
+        print(f"\n{self.RECIPIENTS} QR emails: sequential {sequential:.2f}s, pooled {pooled:.2f}s "
+              f"({sequential / pooled:.1f}x)")
+        self.assertLess(pooled, sequential)
+
+
+def make_attended_participants(event, count, prefix):
+    """Bulk-create `count` participants with OD entries, every other one attended"""
+    users = User.objects.bulk_create(
+        User(username=f'{prefix}{i}', email=f'23{i:07d}@example.com', first_name=f'First{i}')
+        for i in range(count)
+    )
+    participants = Participant.objects.bulk_create(
+        Participant(user=user, event=event, payment_status=True) for user in users
+    )
+    ODList.objects.bulk_create(
+        ODList(participant=participant, event=event, hash=f'{prefix}{participant.pk:060d}', attendance=i % 2 == 0)
+        for i, participant in enumerate(participants)
+    )
+    # bulk_create sends no signals
+    EventStats.refresh(event.pk)
+
+
+class CSVExportTests(TempMediaMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.event = make_event(event_date=timezone.now() - timedelta(days=1))
+        make_attended_participants(self.event, 5, 'csv')
+        self.staff = User.objects.create(username='staff', is_staff=True, is_superuser=True)
+        self.client.force_login(self.staff)
+
+    def _download(self, url):
+        """Queue the report, build it with the worker and download the stored file"""
+        queued = self.client.get(url)
+        self.assertEqual(queued.status_code, 202)
+        self.assertEqual(process_report_jobs(), {'built': 1, 'failed': 0})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_od_list_download_serves_every_entry(self):
+        lines = self._download(f'/api/events/{self.event.id}/od-list/download/').splitlines()
+
+        self.assertEqual(lines[2].split(',')[0], 'Username')
+        self.assertEqual(len(lines), 3 + 5)
+        self.assertEqual(sum(line.endswith(',Yes') for line in lines), 3)
+
+    def test_analysis_download_serves_report(self):
+        content = self._download(f'/api/events/{self.event.id}/analysis/download/')
+
+        self.assertIn('Total Registrations:,5', content)
+        self.assertIn('Total Present:,3', content)
+        self.assertIn('2023,5,3,2,60.0%', content)
+
+    def test_repeat_downloads_share_one_job(self):
+        url = f'/api/events/{self.event.id}/analysis/download/'
+        first = self.client.get(url).json()
+        second = self.client.get(url).json()
+
+        self.assertEqual(first['job_id'], second['job_id'])
+        self.assertEqual(ReportJob.objects.count(), 1)
+        status_data = self.client.get(first['status_url']).json()
+        self.assertEqual(status_data['status'], 'queued')
+        self.assertIsNone(status_data['download_url'])
+
+        process_report_jobs()
+        status_data = self.client.get(first['status_url']).json()
+        self.assertEqual(status_data['status'], 'done')
+        response = self.client.get(status_data['download_url'])
+        self.assertEqual(response.status_code, 200)
+        # Served from the stored file, no new job for unchanged data
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(ReportJob.objects.count(), 1)
+
+    def test_attendance_change_invalidates_report(self):
+        url = f'/api/events/{self.event.id}/od-list/download/'
+        self._download(url)
+        old_job = ReportJob.objects.get()
+        old_path = old_job.file.path
+
+        # Admin bulk updates bypass save(), the fingerprint must still change
+        ODList.objects.filter(event=self.event).update(attendance=True)
+        queued = self.client.get(url)
+        self.assertEqual(queued.status_code, 202)
+        self.assertNotEqual(queued.json()['job_id'], str(old_job.token))
+
+        process_report_jobs()
+        content = b''.join(self.client.get(url).streaming_content).decode()
+        self.assertEqual(content.count(',Yes'), 5)
+        # The superseded artifact is cleaned up
+        self.assertFalse(ReportJob.objects.filter(pk=old_job.pk).exists())
+        self.assertFalse(os.path.exists(old_path))
+
+
+class AnalysisStatsTests(TestCase):
+
+    def setUp(self):
+        from authentication.models import UserProfile
+
+        self.event = make_event(event_date=timezone.now() - timedelta(days=1))
+        make_attended_participants(self.event, 6, 'stats')
+        other = User.objects.create(username='other', email='not-a-rollno@example.com')
+        Participant.objects.create(user=other, event=self.event)
+        # Whether UsersConfig's post_save receiver still creates profiles depends on garbage collection
+        with_profile = ['stats0', 'stats1', 'stats2']
+        UserProfile.objects.exclude(user__username__in=with_profile).delete()
+        for user in User.objects.filter(username__in=with_profile):
+            UserProfile.objects.update_or_create(user=user, defaults={'department': 'CSE', 'college_name': 'REC'})
+        self.participants = Participant.objects.filter(event=self.event)
+
+    def test_groups_are_counted_in_the_database(self):
+        # Department names come from the warm choice lookup table
+        invalidate_choice_lookups()
+        get_choice_tables()
+
+        # One query per section, however many participants there are
+        with self.assertNumQueries(4):
+            summary = _summary_counts(self.participants)
+            departments = _get_department_stats(self.participants)
+            years = _get_year_stats(self.participants)
+            colleges = _get_college_stats(self.participants)
+
+        self.assertEqual(summary, {'total': 7, 'present': 3, 'paid': 6})
+        self.assertEqual(departments['Computer Science & Engineering'], {'total': 3, 'present': 2, 'absent': 1})
+        self.assertEqual(departments['Unknown'], {'total': 4, 'present': 1, 'absent': 3})
+        self.assertEqual(years, {
+            '2023': {'total': 6, 'present': 3, 'absent': 3},
+            'Unknown': {'total': 1, 'present': 0, 'absent': 1},
+        })
+        self.assertEqual(colleges['REC'], {'total': 3, 'present': 2, 'absent': 1})
+        self.assertEqual(colleges['Unknown']['total'], 4)  # no profile at all: stats3-stats5 and other
+
+
+class AttendanceBatchTests(TestCase):
+
+    def setUp(self):
+        self.event = make_event(event_date=timezone.now())
+        make_attended_participants(self.event, 4, 'gate')
+        self.scanner = User.objects.create(username='scanner', is_staff=True)
+        self.client.force_login(self.scanner)
+        self.url = f'/api/events/{self.event.id}/mark-attendance/batch/'
+        # gate0 and gate2 are already attended
+        self.hashes = list(ODList.objects.filter(event=self.event).order_by('participant_id').values_list('hash', flat=True))
+
+    def test_batch_reports_each_hash(self):
+        scanned_at = timezone.now() - timedelta(minutes=10)
+        scans = [
+            {'hash': self.hashes[1], 'scanned_at': scanned_at.isoformat(), 'device_id': 'gate-a'},
+            {'hash': self.hashes[0], 'scanned_at': scanned_at.isoformat(), 'device_id': 'gate-a'},
+            {'hash': 'not-a-ticket', 'device_id': 'gate-b'},
+            {'hash': self.hashes[3], 'scanned_at': 'yesterday', 'device_id': 'gate-b'},
+        ]
+
+        response = self.client.post(self.url, {'scans': scans}, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual([r['status'] for r in data['results']], ['marked', 'already_marked', 'unknown', 'invalid'])
+        self.assertEqual(data['summary'], {'marked': 1, 'already_marked': 1, 'unknown': 1, 'invalid': 1})
+        entry = ODList.objects.get(hash=self.hashes[1])
+        self.assertTrue(entry.attendance)
+        self.assertEqual(entry.attendance_marked_at, scanned_at)
+        self.assertEqual(entry.attendance_device, 'gate-a')
+        self.assertFalse(ODList.objects.get(hash=self.hashes[3]).attendance)
+
+    def test_duplicate_offline_scans_keep_earliest_time(self):
+        early = timezone.now() - timedelta(minutes=30)
+        late = timezone.now() - timedelta(minutes=5)
+        scans = [
+            {'hash': self.hashes[3], 'scanned_at': late.isoformat(), 'device_id': 'gate-b'},
+            {'hash': self.hashes[3], 'scanned_at': early.isoformat(), 'device_id': 'gate-a'},
+        ]
+
+        # SAVEPOINT, lookup, UPDATE, stats UPDATE, RELEASE SAVEPOINT, however large the batch
+        with self.assertNumQueries(5):
+            results = mark_attendance_batch(self.event, scans)
+
+        self.assertEqual([r['status'] for r in results], ['marked', 'already_marked'])
+        entry = ODList.objects.get(hash=self.hashes[3])
+        self.assertEqual(entry.attendance_marked_at, early)
+        self.assertEqual(entry.attendance_device, 'gate-a')
+
+    def test_other_event_hashes_are_unknown(self):
+        other_event = make_event(event_name='Other')
+        results = mark_attendance_batch(other_event, [{'hash': self.hashes[1]}])
+
+        self.assertEqual(results[0]['status'], 'unknown')
+        self.assertFalse(ODList.objects.get(hash=self.hashes[1]).attendance)
+
+    def test_rejects_oversized_batch(self):
+        with self.settings(ATTENDANCE_BATCH_MAX_SCANS=2):
+            response = self.client.post(
+                self.url, {'scans': [{'hash': h} for h in self.hashes]}, content_type='application/json'
+            )
+        self.assertEqual(response.status_code, 400)
+
+
+class TicketIndexTests(TestCase):
+
+    def setUp(self):
+        self.event = make_event(event_date=timezone.now())
+        self.participants = []
+        for i in range(3):
+            user = User.objects.create(username=f'ticket{i}', first_name='Ticket', last_name=str(i))
+            participant = Participant.objects.create(user=user, event=self.event)
+            self.participants.append((participant, ODList.objects.create(participant=participant, event=self.event)))
+        self.scanner = User.objects.create(username='scanner', is_staff=True)
+        self.client.force_login(self.scanner)
+        self.url = f'/api/events/{self.event.id}/ticket-index/'
+
+    def test_full_index_keys_tickets_by_hash_prefix(self):
+        # Enough tickets for gzip to win over its randomly padded header (BREACH mitigation)
+        for i in range(3, 20):
+            user = User.objects.create(username=f'ticket{i}', first_name='Ticket', last_name=str(i))
+            participant = Participant.objects.create(user=user, event=self.event)
+            ODList.objects.create(participant=participant, event=self.event)
+
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        data = json.loads(gzip.decompress(response.content))
+        self.assertTrue(data['full'])
+        self.assertEqual(data['fields'], ['name', 'rollno', 'department', 'year', 'attended'])
+        od_list = self.participants[1][1]
+        self.assertEqual(data['tickets'][od_list.hash[:data['prefix_length']]][0], 'Ticket 1')
+        self.assertEqual(len(data['tickets']), 20)
+
+    def test_delta_carries_changes_and_valid_prefixes(self):
+        synced_at = self.client.get(self.url).json()['synced_at']
+        changed_od, removed_participant = self.participants[0][1], self.participants[2][0]
+
+        # Sync overlap window: move the untouched tickets well before the last sync
+        self._age_tickets()
+        mark_attendance_batch(self.event, [{'hash': changed_od.hash}])
+        removed_participant.delete()
+
+        data = self.client.get(self.url, {'since': synced_at}).json()
+
+        self.assertFalse(data['full'])
+        prefix_length = data['prefix_length']
+        self.assertEqual(list(data['tickets']), [changed_od.hash[:prefix_length]])
+        self.assertTrue(data['tickets'][changed_od.hash[:prefix_length]][4])
+        self.assertEqual(len(data['valid']), 2)
+
+    def _age_tickets(self):
+        """Move every ticket well before the sync overlap window"""
+        an_hour_ago = timezone.now() - timedelta(hours=1)
+        Participant.objects.filter(event=self.event).update(updated_at=an_hour_ago)
+        ODList.objects.filter(event=self.event).update(updated_at=an_hour_ago)
+
+    def test_delta_carries_late_uploaded_scans(self):
+        scanned_at = (timezone.now() - timedelta(minutes=30)).isoformat()
+        self._age_tickets()
+        synced_at = self.client.get(self.url).json()['synced_at']
+        late_od = self.participants[1][1]
+
+        # A device that was offline uploads a scan made before the last sync
+        mark_attendance_batch(self.event, [{'hash': late_od.hash, 'scanned_at': scanned_at}])
+
+        data = self.client.get(self.url, {'since': synced_at}).json()
+        prefix = late_od.hash[:data['prefix_length']]
+        self.assertEqual(list(data['tickets']), [prefix])
+        self.assertTrue(data['tickets'][prefix][4])
+
+    def test_delta_carries_unmarked_attendance(self):
+        marked_od = self.participants[0][1]
+        mark_attendance_batch(self.event, [{'hash': marked_od.hash}])
+        self._age_tickets()
+        synced_at = self.client.get(self.url).json()['synced_at']
+
+        self.client.force_login(User.objects.create_superuser('odadmin', 'odadmin@example.com', 'password'))
+        self.client.post(
+            '/admin/event/odlist/', {'action': 'unmark_attendance', '_selected_action': [marked_od.pk]}
+        )
+
+        data = self.client.get(self.url, {'since': synced_at}).json()
+        prefix = marked_od.hash[:data['prefix_length']]
+        self.assertEqual(list(data['tickets']), [prefix])
+        self.assertFalse(data['tickets'][prefix][4])
+
+    def test_rejects_bad_since(self):
+        self.assertEqual(self.client.get(self.url, {'since': 'yesterday'}).status_code, 400)
+
+    @override_settings(TICKET_QR_FORMAT='token')
+    def test_offline_lookup_of_token_qr(self):
+        od_list = self.participants[1][1]
+        data = self.client.get(self.url).json()
+
+        # What a device does with a scanned token, without the server secret
+        prefix = data['token_keys'][token_index_key(od_list.qr_value)]
+        self.assertEqual(prefix, od_list.hash[:data['prefix_length']])
+        self.assertEqual(data['tickets'][prefix][0], 'Ticket 1')
+
+        forged = make_ticket_token(self.event.id, od_list.participant_id, 2)
+        self.assertNotIn(token_index_key(forged), data['token_keys'])
+
+    @override_settings(TICKET_QR_FORMAT='token')
+    def test_index_cannot_mint_tokens(self):
+        data = self.client.get(self.url).json()
+        self.assertTrue(data['token_keys'])
+
+        for participant, od_list in self.participants:
+            mac = base64.b32decode(od_list.ticket_token + '=' * (-len(od_list.ticket_token) % 8))[-10:]
+            self.assertNotIn(mac.hex(), data['token_keys'])
+
+            # The public payload plus an index key, as a holder of the export would try
+            payload = struct.pack('>BIIH', 1, self.event.id, participant.pk, od_list.ticket_version)
+            for key in data['token_keys']:
+                candidate = base64.b32encode(payload + bytes.fromhex(key).ljust(10, b'\0')).decode().rstrip('=')
+                self.assertIsNone(verify_ticket_token(candidate, self.event.id))
+
+    def test_delta_replaces_token_key_of_revoked_ticket(self):
+        od_list = self.participants[0][1]
+        old_key = token_index_key(od_list.ticket_token)
+        self._age_tickets()
+        synced_at = self.client.get(self.url).json()['synced_at']
+
+        od_list.ticket_version = 2
+        od_list.save()
+
+        data = self.client.get(self.url, {'since': synced_at}).json()
+        prefix = od_list.hash[:data['prefix_length']]
+        self.assertEqual(data['token_keys'], {token_index_key(od_list.ticket_token): prefix})
+        self.assertNotIn(old_key, data['token_keys'])
+
+
+class TicketTokenTests(TestCase):
+
+    def setUp(self):
+        self.event = make_event(event_date=timezone.now())
+        make_attended_participants(self.event, 2, 'token')
+        self.od_list = ODList.objects.filter(event=self.event, attendance=False).get()
+        self.scanner = User.objects.create(username='scanner', is_staff=True)
+        self.client.force_login(self.scanner)
+        self.url = f'/api/events/{self.event.id}/mark-attendance/'
+
+    def test_token_is_verified_in_memory(self):
+        token = self.od_list.ticket_token
+        tampered = token[:-1] + ('A' if token[-1] != 'A' else 'B')
+
+        self.assertEqual(len(token), 34)
+        with self.assertNumQueries(0):
+            self.assertEqual(verify_ticket_token(token, self.event.id), (self.od_list.participant_id, 1))
+            self.assertIsNone(verify_ticket_token(token, self.event.id + 1))
+            self.assertIsNone(verify_ticket_token(tampered, self.event.id))
+            self.assertIsNone(verify_ticket_token('not base32!', self.event.id))
+
+    def test_scanner_marks_attendance_from_token(self):
+        response = self.client.put(self.url, {'hash': self.od_list.ticket_token}, content_type='application/json')
+
+        self.assertEqual(response.status_code, 200)
+        self.od_list.refresh_from_db()
+        self.assertTrue(self.od_list.attendance)
+
+    def test_wrong_event_and_revoked_tokens_are_rejected(self):
+        other_event = make_event(event_name='Other')
+        wrong_event = make_ticket_token(other_event.id, self.od_list.participant_id)
+        response = self.client.put(self.url, {'hash': wrong_event}, content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+
+        old_token = self.od_list.ticket_token
+        ODList.objects.filter(pk=self.od_list.pk).update(ticket_version=2)
+        response = self.client.put(self.url, {'hash': old_token}, content_type='application/json')
+        self.assertEqual(response.status_code, 404)
+
+    def test_batch_accepts_tokens(self):
+        results = mark_attendance_batch(self.event, [
+            {'hash': self.od_list.ticket_token},
+            {'hash': self.od_list.hash},
+            {'hash': make_ticket_token(self.event.id + 1, self.od_list.participant_id)},
+        ])
+
+        self.assertEqual([r['status'] for r in results], ['marked', 'already_marked', 'unknown'])
+
+    @override_settings(TICKET_QR_FORMAT='token')
+    def test_qr_payload_follows_setting(self):
+        self.assertEqual(self.od_list.qr_value, self.od_list.ticket_token)
+
+
+class ScanQueryBudgetTests(TestCase):
+    """Pin the single-scan path to a handful of queries"""
+
+    MAX_QUERIES = 3
+
+    def setUp(self):
+        from authentication.models import UserProfile
+
+        self.event = make_event(event_date=timezone.now())
+        user = User.objects.create(username='attendee', first_name='Ada', last_name='Lovelace')
+        UserProfile.objects.update_or_create(user=user, defaults={'rollno': '230701001', 'department': 'CSE'})
+        participant = Participant.objects.create(user=user, event=self.event)
+        self.od_list = ODList.objects.create(participant=participant, event=self.event)
+        self.scanner = User.objects.create(username='scanner', is_staff=True)
+        # Warm the choice lookup table used for the department name
+        invalidate_choice_lookups()
+        get_choice_tables()
+
+    def _scan(self, value):
+        request = APIRequestFactory().put(
+            f'/api/events/{self.event.id}/mark-attendance/', {'hash': value}, format='json'
+        )
+        force_authenticate(request, user=self.scanner)
+        with CaptureQueriesContext(connection) as queries:
+            response = Scanner.as_view()(request, event_id=self.event.id)
+        self.assertLessEqual(len(queries), self.MAX_QUERIES, [q['sql'] for q in queries])
+        return response
+
+    def test_scan_returns_lean_result(self):
+        response = self._scan(self.od_list.hash)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['participant']['name'], 'Ada Lovelace')
+        self.assertEqual(response.data['participant']['rollno'], '230701001')
+        self.assertEqual(response.data['participant']['department'], 'Computer Science & Engineering')
+        self.assertIsNotNone(response.data['participant']['attendance_marked_at'])
+        self.assertNotIn('event', response.data['participant'])
+
+    def test_repeat_scan_is_already_reported(self):
+        self._scan(self.od_list.ticket_token)
+        response = self._scan(self.od_list.hash)
+
+        self.assertEqual(response.status_code, 208)
+        self.assertTrue(response.data['participant']['attendance'])
+
+
+class AttendanceStreamTests(TestCase):
+
+    def setUp(self):
+        self.event = make_event(event_date=timezone.now())
+        make_attended_participants(self.event, 4, 'live')
+        self.staff = User.objects.create(username='staff', is_staff=True)
+        self.client.force_login(self.staff)
+
+    def test_delta_carries_new_marks_and_totals(self):
+        known_ids = set(ODList.objects.filter(event=self.event, attendance=True).values_list('id', flat=True))
+        self.assertEqual(attendance_delta(self.event, known_ids)[0], None)
+
+        od_list = ODList.objects.filter(event=self.event, attendance=False).first()
+        mark_attendance_batch(self.event, [{'hash': od_list.hash}])
+        delta, known_ids = attendance_delta(self.event, known_ids)
+
+        self.assertEqual([row['id'] for row in delta['marked']], [od_list.id])
+        self.assertEqual(delta['unmarked'], [])
+        self.assertEqual(delta['totals']['present'], 3)
+        self.assertEqual(delta['totals']['absent'], 1)
+        self.assertIn(od_list.id, known_ids)
+
+        ODList.objects.filter(pk=od_list.pk).update(attendance=False)
+        delta, _ = attendance_delta(self.event, known_ids)
+        self.assertEqual(delta['unmarked'], [od_list.id])
+
+    def test_stream_opens_with_totals(self):
+        response = self.client.get(
+            f'/api/events/{self.event.id}/attendance/stream/', HTTP_ACCEPT='text/event-stream'
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        first = async_to_sync(response.streaming_content.__anext__)()
+        self.assertIn(b'event: totals', first)
+        self.assertIn(b'"present": 2', first)
+
+
+class EventStatsTests(TempQRCacheMixin, TestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.event = make_event(event_date=timezone.now())
+        self.users = [User.objects.create(username=f'stats{i}', email=f'stats{i}@example.com') for i in range(3)]
+
+    def assertStats(self, **expected):
+        stats = EventStats.objects.get(event=self.event)
+        self.assertEqual({field: getattr(stats, field) for field in expected}, expected)
+        self.assertEqual(EventStats.count(self.event.pk), {
+            field: getattr(stats, field) for field in EventStats.COUNTER_FIELDS
+        })
+
+    def test_registration_and_payment_paths(self):
+        participants = [Participant.objects.create(user=user, event=self.event) for user in self.users]
+        self.assertStats(registered=3, paid=0)
+
+        participants[0].payment_status = True
+        participants[0].save()
+        self.assertStats(registered=3, paid=1)
+
+        participants[1].payment_status = True
+        participants[1].save()
+        participants[0].registration_status = 'cancelled'
+        participants[0].save()
+        self.assertStats(registered=3, paid=1)
+
+        participants[1].delete()
+        self.assertStats(registered=2, paid=0)
+
+    def test_od_entries_and_attendance(self):
+        participant = Participant.objects.create(user=self.users[0], event=self.event, payment_status=True)
+        od_list = ODList.objects.create(participant=participant, event=self.event)
+        self.assertStats(od_created=1, qr_sent=0, attended=0)
+
+        send_registration_emails_bulk([od_list])
+        send_registration_emails_bulk([od_list])
+        self.assertStats(qr_sent=1)
+
+        mark_attendance_batch(self.event, [{'hash': od_list.hash}, {'hash': od_list.hash}])
+        self.assertStats(attended=1)
+
+        od_list.refresh_from_db()
+        od_list.attendance = False
+        od_list.save()
+        self.assertStats(od_created=1, qr_sent=1, attended=0)
+
+        od_list.delete()
+        self.assertStats(od_created=0, qr_sent=0, attended=0)
+
+    def test_drifted_row_is_rebuilt(self):
+        Participant.objects.create(user=self.users[0], event=self.event)
+        EventStats.objects.filter(event=self.event).update(registered=0)
+
+        # Would go negative: recounted instead
+        Participant.objects.get(user=self.users[0]).delete()
+        self.assertStats(registered=0)
+
+    def test_reconcile_command(self):
+        Participant.objects.bulk_create(Participant(user=user, event=self.event) for user in self.users)
+        EventStats.objects.filter(event=self.event).delete()
+
+        out = io.StringIO()
+        call_command('reconcile_event_stats', '--event', str(self.event.pk), stdout=out)
+
+        self.assertIn('registered None -> 3', out.getvalue())
+        self.assertStats(registered=3)
+
+    def test_migration_backfills_existing_events(self):
+        from django.apps import apps
+        migration = importlib.import_module('event.migrations.0015_event_stats')
+        participants = [Participant.objects.create(user=user, event=self.event, payment_status=True) for user in self.users]
+        ODList.objects.create(participant=participants[0], event=self.event, qr_sent=True, attendance=True)
+        empty_event = make_event(event_name='Empty')
+        EventStats.objects.all().delete()
+
+        migration.create_event_stats(apps, None)
+
+        self.assertStats(registered=3, paid=3, od_created=1, qr_sent=1, attended=1)
+        self.assertEqual(EventStats.count(empty_event.pk), {
+            field: getattr(EventStats.objects.get(event=empty_event), field) for field in EventStats.COUNTER_FIELDS
+        })
+
+    def test_od_status_detail_counts_eligible_participants_missing_od(self):
+        from django.contrib.admin.sites import site
+        unpaid = Participant.objects.create(user=self.users[0], event=self.event)
+        ODList.objects.create(participant=unpaid, event=self.event)
+        Participant.objects.create(user=self.users[1], event=self.event, payment_status=True)
+
+        detail = site._registry[Event].od_status_detail(self.event)
+
+        self.assertIn('Eligible participants: 1', detail)
+        self.assertIn('1 eligible participants missing OD entries', detail)
+
+
+class AdminChangelistQueryTests(TestCase):
+    """Changelist pages must not run queries per row"""
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.admin_user)
+
+    def _changelist_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_participant_changelist(self):
+        event = make_event()
+        make_attended_participants(event, 2, 'few')
+        few = self._changelist_queries('/admin/event/participant/')
+
+        make_attended_participants(make_event(event_name='Second'), 10, 'many')
+        Participant.objects.create(user=User.objects.create(username='no-od'), event=event)
+        self.assertEqual(self._changelist_queries('/admin/event/participant/'), few)
+
+    def test_event_changelist(self):
+        make_attended_participants(make_event(), 3, 'one')
+        few = self._changelist_queries('/admin/event/event/')
+
+        for i in range(5):
+            make_attended_participants(make_event(event_name=f'Event {i}'), 2, f'ev{i}_')
+        self.assertEqual(self._changelist_queries('/admin/event/event/'), few)
+
+    def test_participant_status_columns(self):
+        event = make_event()
+        make_attended_participants(event, 2, 'cols')
+        ODList.objects.filter(participant__user__username='cols0').update(qr_sent=True)
+        Participant.objects.create(user=User.objects.create(username='cols-no-od'), event=event)
+
+        response = self.client.get('/admin/event/participant/')
+
+        content = response.content.decode()
+        self.assertEqual(content.count('No OD'), 2)  # od_status and qr_status of the same row
+        self.assertIn('Sent', content)
+        self.assertIn('Not Attended', content)
+
+
+class AdminJobTests(TempQRCacheMixin, TestCase):
+    """Bulk admin actions run in the worker, in chunks"""
+
+    def setUp(self):
+        super().setUp()
+        self.admin_user = User.objects.create_superuser('admin', 'admin@example.com', 'password')
+        self.client.force_login(self.admin_user)
+        self.event = make_event()
+        users = [User.objects.create(username=f'bulk{i}', email=f'bulk{i}@example.com') for i in range(5)]
+        self.participants = [Participant.objects.create(user=user, event=self.event) for user in users]
+
+    def _run_action(self, url, action, ids):
+        response = self.client.post(url, {'action': action, '_selected_action': ids})
+        job = AdminJob.objects.get()
+        self.assertRedirects(response, f'/admin/admin-jobs/{job.token}/', fetch_redirect_response=False)
+        return job
+
+    @override_settings(ADMIN_JOB_CHUNK_SIZE=2)
+    def test_mark_as_paid_runs_in_background(self):
+        job = self._run_action('/admin/event/participant/', 'mark_as_paid', [p.pk for p in self.participants])
+
+        self.assertEqual(job.total, 5)
+        self.assertFalse(Participant.objects.filter(payment_status=True).exists())
+
+        process_admin_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed, job.failed), ('done', 5, 0))
+        self.assertEqual(Participant.objects.filter(payment_status=True).count(), 5)
+        self.assertEqual(EventStats.objects.get(event=self.event).paid, 5)
+
+        response = self.client.get(f'/admin/admin-jobs/{job.token}/')
+        self.assertContains(response, 'Processed: <strong>5</strong>')
+        self.assertNotContains(response, 'http-equiv="refresh"')
+
+    def test_failures_are_logged_per_record(self):
+        calls = []
+
+        def flaky(ids, params):
+            calls.append(list(ids))
+            if 3 in ids:
+                raise RuntimeError('boom')
+            return [f'{object_id}: skipped' for object_id in ids if object_id == 1]
+
+        job = AdminJob.objects.create(action='test_flaky', object_ids=[1, 2, 3, 4, 5], total=5)
+        with mock.patch.dict(admin_jobs._handlers, {'test_flaky': flaky}), self.settings(ADMIN_JOB_CHUNK_SIZE=2):
+            process_admin_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual(calls, [[1, 2], [3, 4], [5]])
+        self.assertEqual((job.processed, job.failed), (2, 3))
+        self.assertEqual(job.error_log.splitlines(), ['1: skipped', '3: RuntimeError: boom', '4: RuntimeError: boom'])
+
+        response = self.client.get(f'/admin/admin-jobs/{job.token}/errors/')
+        self.assertEqual(response['Content-Type'], 'text/plain; charset=utf-8')
+        self.assertIn(b'RuntimeError: boom', response.content)
+
+    def test_stale_job_is_reclaimed_by_one_worker(self):
+        job = AdminJob.objects.create(
+            action='mark_as_paid', object_ids=[1], total=1,
+            status='running', started_at=timezone.now() - timedelta(hours=1),
+        )
+        update = QuerySet.update
+        overlapping = []
+
+        def update_after_second_worker(queryset, **kwargs):
+            # Another worker read the same stale row and claims it first
+            if not overlapping:
+                overlapping.append(None)
+                overlapping[0] = claim_admin_jobs()
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, 'update', autospec=True, side_effect=update_after_second_worker):
+            claimed = claim_admin_jobs()
+
+        self.assertEqual(overlapping, [[job]])
+        self.assertEqual(claimed, [])
+
+    def test_event_qr_emails_job(self):
+        Participant.objects.filter(pk=self.participants[0].pk).update(payment_status=True)
+        job = self._run_action('/admin/event/event/', 'send_qr_emails_bulk', [self.event.pk])
+
+        self.assertEqual(job.object_ids, [self.participants[0].pk])
+        process_admin_jobs()
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.processed), ('done', 1))
+        self.assertTrue(ODList.objects.get(participant=self.participants[0]).qr_sent)
+        self.assertEqual(len(mail.outbox), 1)
+
+
+class KeysetPaginationTests(TestCase):
+
+    def setUp(self):
+        self.event = make_event()
+        make_attended_participants(self.event, 25, 'page')
+        self.staff = User.objects.create(username='staff', is_staff=True)
+        self.client.force_login(self.staff)
+        self.url = f'/api/events/{self.event.id}/participants/'
+
+    def test_cursor_pages_cover_every_row_once(self):
+        expected = list(
+            Participant.objects.filter(event=self.event).order_by('-registered_at', '-id').values_list('id', flat=True)
+        )
+        seen = []
+        response = self.client.get(self.url, {'paginate': 'cursor', 'page_size': 10})
+        while True:
+            data = response.json()
+            self.assertNotIn('count', data)
+            seen.extend(row['id'] for row in data['results'])
+            if not data['next']:
+                break
+            response = self.client.get(data['next'])
+
+        self.assertEqual(seen, expected)
+
+    def test_count_on_request(self):
+        response = self.client.get(self.url, {'paginate': 'cursor', 'with_count': '1', 'attendance': 'true'})
+
+        self.assertEqual(response.json()['count'], 13)
+        self.assertEqual(len(response.json()['results']), 10)
+
+    def test_page_number_mode_unchanged(self):
+        response = self.client.get(self.url, {'page': 3})
+
+        data = response.json()
+        self.assertEqual(data['count'], 25)
+        self.assertEqual(len(data['results']), 5)
+        self.assertIsNone(data['next'])
+
+    def test_invalid_cursor(self):
+        response = self.client.get(self.url, {'cursor': 'not-a-cursor'})
+
+        self.assertEqual(response.status_code, 404)
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        invalidate_choice_lookups()
+        self.event = make_event()
+        EventQuestion.objects.create(event=self.event, label='T-shirt size', order=1)
+
+    def _revalidate(self, url, response):
+        return self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+
+    def test_detail_not_modified_until_event_changes(self):
+        url = f'/api/events/{self.event.id}/'
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('max-age=10', response['Cache-Control'])
+        self.assertNotIn('Last-Modified', response)
+
+        not_modified = self._revalidate(url, response)
+        self.assertEqual(not_modified.status_code, 304)
+        self.assertEqual(not_modified.content, b'')
+        self.assertEqual(not_modified['ETag'], response['ETag'])
+
+        # Seat counter moves with a bare UPDATE, without touching updated_at
+        Event.adjust_confirmed_count(self.event.id, 1)
+        self.assertEqual(self._revalidate(url, response).status_code, 200)
+
+    def test_if_modified_since_alone_never_answers_304(self):
+        since = http_date(time.time() + 3600)
+        other = make_event(event_name='Other event')
+        for url, change in [
+            (f'/api/events/{self.event.id}/', lambda: Event.adjust_confirmed_count(self.event.id, 1)),
+            ('/api/events/', other.delete),
+        ]:
+            self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+            change()
+            self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=since).status_code, 200)
+
+    def test_list_revalidates_on_question_edit(self):
+        url = '/api/events/'
+        response = self.client.get(url)
+        self.assertEqual(self._revalidate(url, response).status_code, 304)
+
+        question = EventQuestion.objects.get(event=self.event)
+        question.label = 'Hoodie size'
+        question.save()
+        self.assertEqual(self._revalidate(url, response).status_code, 200)
+
+    def test_questions_and_categories(self):
+        for url in [f'/api/events/{self.event.id}/questions/', '/api/events/categories/']:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(self._revalidate(url, response).status_code, 304)
+
+        url = '/api/events/categories/'
+        response = self.client.get(url)
+        EventCategory.objects.create(code='talk', display_name='Talk', order=5)
+        self.assertEqual(self._revalidate(url, response).status_code, 200)
+
+
+class ResponseCacheTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.event = make_event()
+        EventQuestion.objects.create(event=self.event, label='T-shirt size', order=1)
+        self.detail_url = f'/api/events/{self.event.id}/'
+
+    def test_warm_entry_served_without_queries(self):
+        for url in [self.detail_url, '/api/events/', '/api/events/categories/']:
+            first = self.client.get(url)
+            with self.assertNumQueries(0):
+                second = self.client.get(url)
+            self.assertEqual(second.status_code, 200)
+            self.assertEqual(second.json(), first.json())
+            self.assertEqual(second['ETag'], first['ETag'])
+
+    def test_question_edit_invalidates_detail_and_list(self):
+        list_url = '/api/events/?expand=questions'
+        detail = self.client.get(self.detail_url)
+        listing = self.client.get(list_url)
+
+        question = EventQuestion.objects.get(event=self.event)
+        question.label = 'Hoodie size'
+        question.save()
+
+        self.assertEqual(self.client.get(self.detail_url).json()['data']['questions'][0]['label'], 'Hoodie size')
+        self.assertNotEqual(self.client.get(self.detail_url)['ETag'], detail['ETag'])
+        self.assertEqual(self.client.get(list_url).json()['results'][0]['questions'][0]['label'], 'Hoodie size')
+        self.assertNotEqual(self.client.get(list_url)['ETag'], listing['ETag'])
+
+    def test_seat_counter_update_invalidates_detail(self):
+        before = self.client.get(self.detail_url).json()['data']['confirmed_count']
+        Event.adjust_confirmed_count(self.event.id, 1)
+        self.assertEqual(self.client.get(self.detail_url).json()['data']['confirmed_count'], before + 1)
+
+    def test_other_events_stay_cached(self):
+        other = make_event(event_name='Other event')
+        self.client.get(self.detail_url)
+        self.client.get(f'/api/events/{other.id}/')
+
+        other.venue = 'Hall B'
+        other.save()
+        with self.assertNumQueries(0):
+            self.client.get(self.detail_url)
+
+    def test_entries_are_kept_per_scheme(self):
+        make_event(event_name='Other event')
+        secure = self.client.get('/api/events/', {'page_size': 1}, secure=True)
+        self.assertTrue(secure.json()['next'].startswith('https://'))
+
+        with CaptureQueriesContext(connection) as queries:
+            plain = self.client.get('/api/events/', {'page_size': 1})
+
+        self.assertTrue(queries.captured_queries)
+        self.assertTrue(plain.json()['next'].startswith('http://'))
+
+
+class EventSearchTests(TestCase):
+
+    def setUp(self):
+        if search_backend() is None:
+            self.skipTest('Needs PostgreSQL or SQLite with FTS5')
+        cache.clear()
+        self.workshop = make_event(event_name='Django workshop', description='Build and deploy a web application.')
+        self.meetup = make_event(
+            event_name='Robotics meetup',
+            description='Show your robots, then a short talk on Django signals for hardware dashboards.',
+        )
+        self.chess = make_event(event_name='Chess open', description='Rapid rounds, all levels welcome.')
+
+    def _names(self, text):
+        return [event.event_name for event in search_events(Event.objects.all(), text)]
+
+    def test_name_matches_rank_above_description_matches(self):
+        self.assertEqual(self._names('django'), ['Django workshop', 'Robotics meetup'])
+        self.assertEqual(self._names('robot'), ['Robotics meetup'])
+
+    def test_results_are_highlighted(self):
+        response = self.client.get('/api/events/', {'search': 'signals'})
+
+        results = response.json()['results']
+        self.assertEqual([result['id'] for result in results], [self.meetup.id])
+        self.assertIn('<mark>', results[0]['search_headline'])
+        self.assertIn('search_rank', results[0])
+        self.assertNotIn('search_headline', self.client.get('/api/events/').json()['results'][0])
+
+    def test_index_follows_saves_and_deletes(self):
+        self.chess.event_name = 'Blitz chess open'
+        self.chess.save()
+        self.assertEqual(self._names('blitz'), ['Blitz chess open'])
+
+        Event.objects.filter(pk=self.chess.pk).update(description='Bullet rounds only.')
+        self.assertEqual(self._names('bullet'), ['Blitz chess open'])
+        self.assertEqual(self._names('rapid'), [])
+
+        self.chess.delete()
+        self.assertEqual(self._names('blitz'), [])
+
+    def test_operators_in_input_are_plain_text(self):
+        for text in ['django"', 'c++ AND (', 'NOT -robots*']:
+            list(search_events(Event.objects.all(), text))
+
+
+class SparseFieldsetTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        for i in range(3):
+            self._add_event(i)
+
+    def _add_event(self, i):
+        event = make_event(event_name=f'Event {i}')
+        EventQuestion.objects.create(event=event, label='T-shirt size', order=1)
+        EventQuestion.objects.create(event=event, label='Dietary needs', order=2)
+        return event
+
+    def _list(self, **params):
+        cache.clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/events/', params)
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results'], len(queries)
+
+    def test_list_renders_card_fields_without_questions(self):
+        results, _ = self._list()
+        self.assertNotIn('questions', results[0])
+        self.assertEqual(results[0]['event_type_display'], 'Workshop')
+
+    def test_questions_on_demand_are_prefetched(self):
+        results, query_count = self._list(expand='questions')
+        self.assertEqual([question['label'] for question in results[0]['questions']], ['T-shirt size', 'Dietary needs'])
+
+        for i in range(3, 8):
+            self._add_event(i)
+        results, more_events_query_count = self._list(expand='questions')
+        self.assertEqual(len(results), 8)
+        self.assertEqual(more_events_query_count, query_count)
+
+    def test_fields_parameter(self):
+        results, _ = self._list(fields='id,event_name')
+        self.assertEqual(set(results[0]), {'id', 'event_name'})
+
+        results, _ = self._list(fields='id,questions')
+        self.assertEqual(set(results[0]), {'id', 'questions'})
+
+        event = Event.objects.first()
+        data = self.client.get(f'/api/events/{event.id}/', {'fields': 'id,seats_left'}).json()['data']
+        self.assertEqual(set(data), {'id', 'seats_left'})
+
+
+class RegistrationWindowTests(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        now = timezone.now()
+        self.open = make_event(event_name='Open', registration_deadline=now + timedelta(days=2), max_participants=10)
+        self.full = make_event(event_name='Full', max_participants=1)
+        Event.adjust_confirmed_count(self.full.id, 1)
+        self.closed = make_event(event_name='Closed', registration_deadline=now - timedelta(days=2))
+        self.no_deadline = make_event(event_name='No deadline')
+        self.past = make_event(event_name='Past', event_date=now - timedelta(days=1))
+
+    def _names(self, url, **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return {event['event_name'] for event in response.json()['results']}
+
+    def test_closes_at_is_stored_on_save(self):
+        deadline = timezone.localtime(self.open.registration_deadline)
+        self.assertEqual(
+            self.open.registration_closes_at, deadline.replace(hour=23, minute=59, second=59, microsecond=0)
+        )
+        self.assertEqual(self.no_deadline.registration_closes_at, self.no_deadline.event_date)
+
+        self.no_deadline.registration_deadline = timezone.now() - timedelta(days=3)
+        self.no_deadline.save(update_fields=['registration_deadline'])
+        self.no_deadline.refresh_from_db()
+        self.assertLess(self.no_deadline.registration_closes_at, timezone.now())
+        self.assertFalse(self.no_deadline.is_registration_open)
+
+    def test_queryset_matches_is_registration_open(self):
+        events = Event.objects.all()
+        with self.assertNumQueries(1):
+            open_events = set(events.registration_open())
+        self.assertEqual(open_events, {self.open, self.no_deadline})
+        self.assertEqual(open_events, {event for event in events if event.is_registration_open})
+        self.assertEqual(set(events.registration_open(False)), {self.full, self.closed, self.past})
+        self.assertEqual(set(events.with_free_seats(False)), {self.full})
+
+    def test_list_filters(self):
+        self.assertEqual(self._names('/api/events/', registration_open='true'), {'Open', 'No deadline'})
+        self.assertEqual(self._names('/api/events/', registration_open='false'), {'Full', 'Closed', 'Past'})
+        self.assertEqual(self._names('/api/events/', has_seats='false'), {'Full'})
+        self.assertEqual(
+            self._names('/api/events/upcoming/', has_seats='true'), {'Open', 'Closed', 'No deadline'}
+        )
+
+    def test_freed_seat_refreshes_cached_filtered_list(self):
+        self.assertNotIn('Full', self._names('/api/events/', registration_open='true'))
+        Event.adjust_confirmed_count(self.full.id, -1)
+        self.assertIn('Full', self._names('/api/events/', registration_open='true'))
+
+
+@skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Set RUN_BENCHMARKS=1 to run benchmarks')
+class EventSearchBenchmark(TestCase):
+    """Compare the icontains scan with the full-text index on 10k events"""
+
+    EVENTS = 10000
+    ROUNDS = 20
+
+    @classmethod
+    def setUpTestData(cls):
+        category, _ = EventCategory.objects.get_or_create(code='workshop', defaults={'display_name': 'Workshop'})
+        filler = 'Hands-on session covering tooling, practice problems and a short quiz at the end. ' * 12
+        now = timezone.now()
+        Event.objects.bulk_create(
+            Event(
+                event_name=f'Event {i}',
+                description=filler + ('Bring a soldering iron.' if i % 1000 == 0 else ''),
+                event_date=now + timedelta(days=i % 90),
+                event_type=category,
+            )
+            for i in range(cls.EVENTS)
+        )
+
+    def _time(self, search):
+        start = time.perf_counter()
+        for _ in range(self.ROUNDS):
+            rows = list(search(Event.objects.all(), 'soldering')[:10])
+        return (time.perf_counter() - start) / self.ROUNDS, rows
+
+    def test_index_beats_icontains(self):
+        if search_backend() is None:
+            self.skipTest('Needs PostgreSQL or SQLite with FTS5')
+
+        scan, scan_rows = self._time(icontains_search)
+        indexed, indexed_rows = self._time(search_events)
+
+        self.assertEqual({event.pk for event in indexed_rows}, {event.pk for event in scan_rows})
+        print(f"\n{self.EVENTS} events: icontains {scan * 1000:.1f}ms, full-text {indexed * 1000:.1f}ms "
+              f"({scan / indexed:.1f}x)")
+        self.assertLess(indexed, scan)
+
+
+@skipUnless(os.environ.get('RUN_BENCHMARKS'), 'Set RUN_BENCHMARKS=1 to run benchmarks')
+class CSVExportBenchmark(TempMediaMixin, TestCase):
+    """Build reports for a synthetic 50k-participant event and check memory stays flat"""
+
+    PARTICIPANTS = 50000
+    MAX_PEAK_BYTES = 32 * 1024 * 1024
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.event = make_event(event_date=timezone.now() - timedelta(days=1))
+        make_attended_participants(cls.event, cls.PARTICIPANTS, 'bench')
+        cls.staff = User.objects.create(username='staff', is_staff=True, is_superuser=True)
+
+    def _measure(self, url):
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(url).status_code, 202)
+
+        rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        tracemalloc.start()
+        try:
+            start = time.perf_counter()
+            process_report_jobs()
+            build_time = time.perf_counter() - start
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        rss_growth_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+
+        start = time.perf_counter()
+        response = self.client.get(url)
+        size = sum(len(chunk) for chunk in response.streaming_content)
+        serve_time = time.perf_counter() - start
+        print(f"\n{url}: built {size / 1e6:.1f} MB in {build_time:.2f}s (peak traced {peak / 1e6:.1f} MB, "
+              f"peak RSS growth {rss_growth_kb / 1024:.1f} MB), repeat download served in {serve_time * 1000:.0f} ms")
+        return peak
+
+    def test_od_list_export_memory(self):
+        peak = self._measure(f'/api/events/{self.event.id}/od-list/download/')
+        self.assertLess(peak, self.MAX_PEAK_BYTES)
+
+    def test_analysis_export_memory(self):
+        peak = self._measure(f'/api/events/{self.event.id}/analysis/download/')
+        self.assertLess(peak, self.MAX_PEAK_BYTES)
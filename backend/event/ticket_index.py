@@ -0,0 +1,97 @@
+"""
+Per-event ticket index for offline-first scanning.
+
+Scanner devices download the event's valid ticket hashes once (keyed by a
+hash prefix, with just enough participant info to show at the gate),
+validate scans locally, and upload attendance later through the batch
+endpoint. Later downloads with `since` only carry the tickets that changed.
+
+QR codes carry either the hash or a signed ticket token (TICKET_QR_FORMAT,
+and earlier mails may still carry the other). A scanned hash is looked up by
+its prefix; a scanned token by tickets.token_index_key() (a digest of its
+MAC, so the index cannot mint tokens) in 'token_keys', which points at the
+ticket's hash prefix. A ticket has one current token
+key: devices replace any key they hold for a changed ticket's prefix, so a
+revoked token (ticket_version bumped) stops matching.
+"""
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+
+from users.choice_lookups import department_display_name, year_display_name
+
+from .models import ODList
+from .tickets import ticket_index_key
+
+TICKET_FIELDS = ['name', 'rollno', 'department', 'year', 'attended']
+
+# Registrations committed while a sync was running can carry an updated_at
+# slightly before that sync's synced_at; re-sending this window catches them
+SYNC_OVERLAP = timedelta(minutes=2)
+
+
+def _ticket_row(first_name, last_name, username, rollno, department, year, attendance):
+    name = f'{first_name} {last_name}'.strip() or username
+    return [
+        name,
+        rollno or '',
+        (department_display_name(department) or department) if department else '',
+        (year_display_name(year) or year) if year else '',
+        attendance,
+    ]
+
+
+def build_ticket_index(event, since=None):
+    """
+    Build the ticket index of an event, or the delta since a previous sync.
+
+    Returns:
+        dict: 'tickets' maps hash prefix -> row of TICKET_FIELDS for every
+        (changed) ticket, 'token_keys' token key -> hash prefix for the same
+        tickets. Delta responses also list all currently 'valid'
+        prefixes so devices can drop cancelled tickets. 'synced_at' is the
+        value to send as `since` next time.
+    """
+    prefix_length = settings.TICKET_INDEX_PREFIX_LENGTH
+    synced_at = timezone.now()
+    entries = ODList.objects.filter(participant__event=event).order_by()
+
+    changed = entries
+    if since is not None:
+        changed_since = since - SYNC_OVERLAP
+        # updated_at, not attendance_marked_at: that is the device's scan time, which
+        # can predate the last sync when a batch is uploaded late, and unmarking clears it
+        changed = entries.filter(Q(participant__updated_at__gt=changed_since) | Q(updated_at__gt=changed_since))
+
+    rows = changed.values_list(
+        'hash',
+        'participant_id',
+        'ticket_version',
+        'participant__user__first_name',
+        'participant__user__last_name',
+        'participant__user__username',
+        'participant__user__profile__rollno',
+        'participant__user__profile__department',
+        'participant__user__profile__year',
+        'attendance',
+    )
+    tickets = {}
+    token_keys = {}
+    for hash_value, participant_id, ticket_version, *fields in rows.iterator():
+        prefix = hash_value[:prefix_length]
+        tickets[prefix] = _ticket_row(*fields)
+        token_keys[ticket_index_key(event.id, participant_id, ticket_version)] = prefix
+    index = {
+        'event_id': event.id,
+        'synced_at': synced_at,
+        'full': since is None,
+        'prefix_length': prefix_length,
+        'fields': TICKET_FIELDS,
+        'tickets': tickets,
+        'token_keys': token_keys,
+    }
+    if since is not None:
+        index['valid'] = sorted(hash_value[:prefix_length] for hash_value in entries.values_list('hash', flat=True))
+    return index
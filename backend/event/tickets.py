@@ -0,0 +1,98 @@
+"""
+Signed ticket tokens.
+
+A token packs the event id, participant id and the OD entry's ticket
+version with a truncated HMAC into a short base32 string. The scanner can
+check authenticity and the event in memory, so forged and wrong-event codes
+are rejected without touching the database, and the QR payload is about
+half the length of the 64-hex hash (and alphanumeric, which QR encodes more
+densely). Bumping ODList.ticket_version revokes earlier tokens.
+
+Offline scanners cannot verify a token (that takes the server secret), so
+the ticket index maps a one-way digest of each ticket's token MAC to its
+row: a device decodes the scanned token, digests its MAC and looks that up,
+and only tickets the server signed are found. The index never holds a MAC
+itself, so it cannot be turned back into valid tokens. See token_index_key().
+"""
+import base64
+import binascii
+import hashlib
+import hmac
+import struct
+
+from django.utils.crypto import salted_hmac
+
+TOKEN_FORMAT = 1
+_PAYLOAD = struct.Struct('>BIIH')  # format, event id, participant id, ticket version
+_MAC_BYTES = 10
+_INDEX_KEY_BYTES = 8
+_KEY_SALT = 'event.tickets.token'
+
+
+def _mac(payload):
+    return salted_hmac(_KEY_SALT, payload, algorithm='sha256').digest()[:_MAC_BYTES]
+
+
+def make_ticket_token(event_id, participant_id, version=1):
+    """Return the base32 ticket token (34 characters, no padding)"""
+    payload = _PAYLOAD.pack(TOKEN_FORMAT, event_id, participant_id, version)
+    return base64.b32encode(payload + _mac(payload)).decode().rstrip('=')
+
+
+def _decode(token):
+    """Split a token into (payload, mac), or None when malformed"""
+    try:
+        raw = base64.b32decode(token.strip().upper() + '=' * (-len(token.strip()) % 8))
+    except (binascii.Error, ValueError):
+        return None
+    if len(raw) != _PAYLOAD.size + _MAC_BYTES:
+        return None
+    return raw[:_PAYLOAD.size], raw[_PAYLOAD.size:]
+
+
+def _index_key(mac):
+    return hashlib.sha256(mac).digest()[:_INDEX_KEY_BYTES].hex()
+
+
+def ticket_index_key(event_id, participant_id, version=1):
+    """Key of a ticket in the index's token_keys: a digest of its token MAC, in hex"""
+    return _index_key(_mac(_PAYLOAD.pack(TOKEN_FORMAT, event_id, participant_id, version)))
+
+
+def token_index_key(token):
+    """
+    The index key a scanned token is looked up under, or None when malformed.
+
+    Needs no secret, so offline devices compute it the same way: base32
+    decode (pad to a multiple of 8), take the trailing 10 bytes and hex the
+    first 8 bytes of their SHA-256.
+    """
+    decoded = _decode(token)
+    return _index_key(decoded[1]) if decoded else None
+
+
+def is_ticket_token(value):
+    """Whether a scanned value is a token rather than a legacy 64-hex hash"""
+    return isinstance(value, str) and len(value) != 64
+
+
+def verify_ticket_token(token, event_id):
+    """
+    Check a token's signature and event without any database access.
+
+    Returns:
+        tuple: (participant_id, version), or None for forged, malformed or
+        other-event tokens
+    """
+    decoded = _decode(token)
+    if decoded is None:
+        return None
+
+    payload, mac = decoded
+    if not hmac.compare_digest(mac, _mac(payload)):
+        return None
+    token_format, token_event_id, participant_id, version = _PAYLOAD.unpack(payload)
+    if token_format != TOKEN_FORMAT or token_event_id != event_id:
+        return None
+    return participant_id, version
+
@@ -22,6 +22,9 @@ urlpatterns = [
     # Admin-only unregister (Admin can remove any user's registration)
     path('events/<int:event_id>/admin-unregister/', views.EventAdminUnregisterAPIView.as_view(), name='admin_event_unregister'),
     path('events/<int:event_id>/registration-status/', views.EventRegistrationStatusAPIView.as_view(), name='event_registration_status'),
+
+    # Admission queue ticket status (polled by clients of queued events)
+    path('events/admission-tickets/<uuid:token>/', views.AdmissionTicketStatusAPIView.as_view(), name='admission_ticket_status'),
     
     # User registrations
     path('user/registrations/', views.UserRegistrationsAPIView.as_view(), name='user_registrations'),
@@ -41,6 +44,10 @@ urlpatterns = [
     # Event OD list (Staff only)
     path('events/<int:event_id>/od-list/', views.EventODListAPIView.as_view(), name='event_od_list'),
     path('events/<int:event_id>/od-list/download/', views.EventODListDownloadAPIView.as_view(), name='event_od_list_download'),
+
+    # Report jobs behind the analysis / OD list downloads (Staff only)
+    path('events/report-jobs/<uuid:token>/', views.ReportJobStatusAPIView.as_view(), name='report_job_status'),
+    path('events/report-jobs/<uuid:token>/download/', views.ReportJobDownloadAPIView.as_view(), name='report_job_download'),
     
     # ========== EVENT GUIDE ENDPOINTS ==========
     # Public endpoint to get event guide
@@ -51,6 +58,9 @@ urlpatterns = [
 
     # Scan and mark attendance
     path('events/<int:event_id>/mark-attendance/' , views.Scanner.as_view() , name='attendance_qr'),
+    path('events/<int:event_id>/mark-attendance/batch/', views.BatchScanner.as_view(), name='attendance_qr_batch'),
+    path('events/<int:event_id>/ticket-index/', views.TicketIndexAPIView.as_view(), name='ticket_index'),
+    path('events/<int:event_id>/attendance/stream/', views.AttendanceStreamAPIView.as_view(), name='attendance_stream'),
     
     # ========== EVENT QUESTIONS ENDPOINTS ==========
     # Manage event questions (Admin creates, users can view)
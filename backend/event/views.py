@@ -1,22 +1,44 @@
+import json
+
 from django.shortcuts import get_object_or_404
 from rest_framework.permissions import AllowAny, IsAdminUser, IsAuthenticated, BasePermission
+from rest_framework.renderers import BaseRenderer, JSONRenderer
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.views import APIView
+from rest_framework.exceptions import NotFound
 from django.contrib.auth import get_user_model
+from django.conf import settings
 from django.db import transaction
 from django.utils import timezone
-from .models import Event, Participant, ODList, EventGuide, EventQuestion
-from .serializers import EventSerializer, EventListSerializer, ParticipantSerializer, EventGuideSerializer, EventQuestionSerializer, FormResponseSerializer
+from django.utils.dateparse import parse_datetime
+from django.utils.decorators import method_decorator
+from django.views.decorators.gzip import gzip_page
+from .models import Event, EventStats, Participant, ODList, EventGuide, EventQuestion, AdmissionTicket, ReportJob
+from .serializers import EventSerializer, EventListSerializer, ParticipantSerializer, EventGuideSerializer, EventQuestionSerializer, FormResponseSerializer, ScanResultSerializer
 from rest_framework.generics import ListAPIView, RetrieveAPIView
 from rest_framework import serializers
-from rest_framework.pagination import PageNumberPagination
-from django.db.models import Q
-from .email_services import create_participant_with_od, format_csv_row, create_error_response, create_success_response, _extract_year_from_email
+from django.db.models import Min, Q
+from .email_services import create_participant_with_od, create_error_response, create_success_response
+from .admission import enqueue_registration, promote_waitlist
+from .attendance import mark_attendance_batch
+from .conditional import (
+    conditional_get, event_categories_validator, event_detail_validator, event_guide_validator,
+    event_list_validator, event_questions_validator,
+)
+from .live import attendance_event_stream
+from .pagination import EventPagination, KeysetPagination, paginate
+from .search import search_events
+from .response_cache import (
+    EVENT_CATEGORIES_TAG, EVENT_LIST_TAG, EVENT_SEATS_TAG, cached_get, event_category_tag, event_guide_tag, event_tag,
+    event_tags,
+)
+from .reports import get_or_queue_report
+from .ticket_index import build_ticket_index
+from .tickets import is_ticket_token, verify_ticket_token
 from django.db.models import Q
-from django.http import HttpResponse
-import csv
-from collections import defaultdict
+from django.http import FileResponse, Http404, StreamingHttpResponse
+from django.urls import reverse
 from authentication.models import UserProfile
 
 User = get_user_model()
@@ -63,10 +85,46 @@ class IsQRScannerOrAdmin(BasePermission):
         except UserProfile.DoesNotExist:
             return False
 
-class EventPagination(PageNumberPagination):
-    page_size = 10
-    page_size_query_param = 'page_size'
-    max_page_size = 100
+def _next_list_change(events, registration_filtered=False):
+    """
+    When the listed events next change on their own, or None: the next event
+    start (is_upcoming flips) and, for lists filtered on registration, the
+    next registration close.
+    """
+    now = timezone.now()
+    moments = {'next_start': Min('event_date', filter=Q(event_date__gt=now))}
+    if registration_filtered:
+        moments['next_close'] = Min('registration_closes_at', filter=Q(registration_closes_at__gt=now))
+    moments = [moment for moment in events.order_by().aggregate(**moments).values() if moment]
+    return min(moments) if moments else None
+
+
+def _filter_registration(events, request):
+    """
+    Apply ?registration_open= (window open and a seat left) and ?has_seats=
+    (a seat left) to an event list.
+
+    Returns:
+        tuple: (events, extra cache tags)
+    """
+    tags = []
+    registration_open = request.GET.get('registration_open', '').lower()
+    if registration_open in ('true', 'false'):
+        events = events.registration_open(registration_open == 'true')
+        tags.append(EVENT_SEATS_TAG)
+
+    has_seats = request.GET.get('has_seats', '').lower()
+    if has_seats in ('true', 'false'):
+        events = events.with_free_seats(has_seats == 'true')
+        tags.append(EVENT_SEATS_TAG)
+    return events, tags
+
+
+def _next_flag_change(event):
+    """When is_upcoming or is_registration_open of `event` next flips on their own, or None"""
+    now = timezone.now()
+    moments = [moment for moment in (event.event_date, event.registration_closes_at) if moment and moment > now]
+    return min(moments) if moments else None
 
 # ========== CLASS-BASED VIEWS ==========
 
@@ -76,6 +134,7 @@ class EventListAPIView(APIView):
     GET /api/events/v2/
     """
     permission_classes = [AllowAny]
+    query_budget = 12
     
     def get(self, request):
         try:
@@ -104,22 +163,33 @@ class EventListAPIView(APIView):
             
             search = request.GET.get('search')
             if search:
-                events = events.filter(
-                    Q(event_name__icontains=search) | 
-                    Q(description__icontains=search)
-                )
+                events = search_events(events, search)
             
             is_active = request.GET.get('is_active')
             if is_active and is_active.lower() == 'true':
                 events = events.filter(is_active=True)
             elif is_active and is_active.lower() == 'false':
                 events = events.filter(is_active=False)
+
+            events, registration_tags = _filter_registration(events, request)
             
-            paginator = EventPagination()
-            paginated_events = paginator.paginate_queryset(events, request)
+            def build():
+                etag = event_list_validator(events)
+                paginator = EventPagination()
+                paginated_events = paginator.paginate_queryset(
+                    EventListSerializer.setup_queryset(events, request), request
+                )
 
-            serializer = EventListSerializer(paginated_events, many=True, context={'request': request})
-            return paginator.get_paginated_response(serializer.data)
+                serializer = EventListSerializer(paginated_events, many=True, context={'request': request})
+                response = paginator.get_paginated_response(serializer.data)
+                return (
+                    response, etag, event_tags(paginated_events),
+                    _next_list_change(events, registration_filtered='registration_open' in request.GET),
+                )
+
+            return cached_get(
+                request, 'event_list', build, tags=[EVENT_LIST_TAG, *registration_tags], public=True, max_age=30
+            )
             
         except Exception as e:
             return create_error_response(f'Failed to fetch events: {str(e)}', 500)
@@ -130,12 +200,21 @@ class EventDetailAPIView(APIView):
     GET /api/events/v2/{id}/
     """
     permission_classes = [AllowAny]
+    query_budget = 10
     
     def get(self, request, pk):
         try:
-            event = get_object_or_404(Event, pk=pk)
-            serializer = EventSerializer(event, context={'request': request})
-            return create_success_response(data=serializer.data)
+            def build():
+                event = get_object_or_404(EventSerializer.setup_queryset(Event.objects.all(), request), pk=pk)
+                serializer = EventSerializer(event, context={'request': request})
+                response = create_success_response(data=serializer.data)
+                return (
+                    response, event_detail_validator(event),
+                    [event_category_tag(event.event_type_id)], _next_flag_change(event),
+                )
+
+            # Short max-age: the payload carries the live seat count
+            return cached_get(request, 'event_detail', build, tags=[event_tag(pk)], public=True, max_age=10)
             
         except Exception as e:
             return create_error_response(f'Failed to fetch event: {str(e)}', 500)
@@ -147,6 +226,7 @@ class EventCreateAPIView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    query_budget = 30
     
     def post(self, request):
         try:
@@ -222,6 +302,7 @@ class EventUpdateAPIView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    query_budget = 30
     
     def put(self, request, pk):
         return self._update_event(request, pk, partial=False)
@@ -285,6 +366,7 @@ class EventDeleteAPIView(APIView):
     """
 
     permission_classes = [IsAuthenticated]
+    query_budget = 40
     
     def delete(self, request, pk):
         try:
@@ -309,6 +391,7 @@ class UpcomingEventsAPIView(APIView):
     GET /api/events/v2/upcoming/
     """
     permission_classes = [AllowAny]
+    query_budget = 12
     
     def get(self, request):
         try:
@@ -324,16 +407,27 @@ class UpcomingEventsAPIView(APIView):
             
             search = request.GET.get('search')
             if search:
-                events = events.filter(
-                    Q(event_name__icontains=search) | 
-                    Q(description__icontains=search)
-                )
+                events = search_events(events, search)
+
+            events, registration_tags = _filter_registration(events, request)
             
-            paginator = EventPagination()
-            paginated_events = paginator.paginate_queryset(events, request)
+            def build():
+                etag = event_list_validator(events)
+                paginator = EventPagination()
+                paginated_events = paginator.paginate_queryset(
+                    EventListSerializer.setup_queryset(events, request), request
+                )
 
-            serializer = EventListSerializer(paginated_events, many=True, context={'request': request})
-            return paginator.get_paginated_response(serializer.data)
+                serializer = EventListSerializer(paginated_events, many=True, context={'request': request})
+                response = paginator.get_paginated_response(serializer.data)
+                return (
+                    response, etag, event_tags(paginated_events),
+                    _next_list_change(events, registration_filtered='registration_open' in request.GET),
+                )
+
+            return cached_get(
+                request, 'upcoming_events', build, tags=[EVENT_LIST_TAG, *registration_tags], public=True, max_age=30
+            )
             
         except Exception as e:
             return Response(
@@ -356,18 +450,23 @@ class EventRegistrationAPIView(APIView):
     }
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 30
     
     def post(self, request, event_id):
         try:
             event = get_object_or_404(Event, pk=event_id, is_active=True)
 
-            # Check if registration is still open
-            if not event.is_registration_open:
+            # Check if registration is still open (queued events accept overflow onto the waitlist)
+            registration_open = event.is_registration_window_open if event.admission_queue_enabled else event.is_registration_open
+            if not registration_open:
                 return Response({'error': 'Registration is closed for this event'}, status=status.HTTP_400_BAD_REQUEST)
 
             if Participant.objects.filter(user=request.user, event=event).exists():
                 return Response({'error': 'Already registered'}, status=status.HTTP_400_BAD_REQUEST)
 
+            if event.admission_queue_enabled:
+                return self._enqueue(request, event)
+
             clash_type, clash_message = event.check_time_clash(request.user)
             if clash_type == 'block':
                 return Response({
@@ -402,7 +501,7 @@ class EventRegistrationAPIView(APIView):
                         response_data['clash_type'] = 'warn'
                     return Response(response_data, status=status.HTTP_201_CREATED)
                 else:
-                    return Response({'error': result['message']}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                    return self._registration_error_response(result)
             else:
                 # Free event: create participant as usual
                 result = create_participant_with_od(request.user, event, send_email=True, answers=answers_snapshot)
@@ -417,10 +516,40 @@ class EventRegistrationAPIView(APIView):
                         response_data['clash_type'] = 'warn'
                     return Response(response_data, status=status.HTTP_201_CREATED)
                 else:
-                    return Response({'error': result['message']}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+                    return self._registration_error_response(result)
         except Exception as e:
             return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
-    
+
+    def _enqueue(self, request, event):
+        """Validate the form and hand out an admission ticket instead of registering inline"""
+        answers_data = request.data.get('answers', [])
+        questions = EventQuestion.objects.filter(event=event).order_by('order', 'id')
+        answers_snapshot = []
+        if questions.exists():
+            validation_result = self._validate_answers(answers_data, questions)
+            if not validation_result['valid']:
+                return Response({'error': validation_result['error']}, status=status.HTTP_400_BAD_REQUEST)
+            answers_snapshot = validation_result['answers_snapshot']
+
+        ticket, created = enqueue_registration(request.user, event, answers_snapshot)
+        return Response({
+            'success': True,
+            'queued': True,
+            'message': 'Registration queued. Poll the ticket status for the result.',
+            'ticket': str(ticket.token),
+            'status_url': reverse('event:admission_ticket_status', kwargs={'token': ticket.token}),
+            'position': ticket.queue_position
+        }, status=status.HTTP_202_ACCEPTED)
+
+    def _registration_error_response(self, result):
+        """Map a failed create_participant_with_od result to an HTTP response"""
+        error_code = result.get('error_code')
+        if error_code == 'already_registered':
+            return Response({'error': 'Already registered', 'code': error_code}, status=status.HTTP_400_BAD_REQUEST)
+        if error_code == 'event_full':
+            return Response({'error': 'Event is full', 'code': error_code}, status=status.HTTP_409_CONFLICT)
+        return Response({'error': result['message']}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+
     def _validate_answers(self, answers_data, questions):
         """Validate user's answers against event questions"""
         qmap = {q.id: q for q in questions}
@@ -492,6 +621,7 @@ class EventRegistrationStatusAPIView(APIView):
     GET /api/events/<event_id>/registration-status/
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 8
     
     def get(self, request, event_id):
         """Get user's registration status for an event"""
@@ -522,12 +652,55 @@ class EventRegistrationStatusAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+class AdmissionTicketStatusAPIView(APIView):
+    """
+    Poll the outcome of a queued registration
+    GET /api/events/admission-tickets/<token>/
+    """
+    permission_classes = [IsAuthenticated]
+    query_budget = 8
+
+    def get(self, request, token):
+        """Get status and queue position of the user's admission ticket"""
+        try:
+            ticket = get_object_or_404(
+                AdmissionTicket.objects.only('id', 'event_id', 'status', 'message', 'participant_id', 'processed_at'),
+                token=token,
+                user=request.user
+            )
+            response_data = {
+                'ticket': str(token),
+                'event_id': ticket.event_id,
+                'status': ticket.status,
+                'message': ticket.message,
+                'position': ticket.queue_position,
+                'participant_id': ticket.participant_id,
+                'processed_at': ticket.processed_at
+            }
+            if ticket.status == 'waitlisted' and ticket.participant_id:
+                response_data['waitlist_position'] = Participant.objects.filter(
+                    event_id=ticket.event_id,
+                    registration_status='waitlisted',
+                    id__lte=ticket.participant_id
+                ).count()
+            return Response(response_data)
+
+        except Http404:
+            return Response({'error': 'Ticket not found'}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response(
+                {'error': f'Failed to fetch ticket status: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
 class EventAdminUnregisterAPIView(APIView):
     """
     Admin endpoint to unregister a user from an event
     DELETE /api/events/<event_id>/admin-unregister/
     """
     permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 30
 
     def delete(self, request, event_id):
         """Admin unregister a specific user from an event"""
@@ -551,13 +724,19 @@ class EventAdminUnregisterAPIView(APIView):
 
             try:
                 participant = Participant.objects.get(user=user, event=event)
+                freed_seat = participant.registration_status == 'confirmed'
 
                 participant.delete()
 
-                return Response({
+                response_data = {
                     'success': True,
                     'message': f'Successfully unregistered {user.get_full_name() or user.username} from {event.event_name}'
-                }, status=status.HTTP_200_OK)
+                }
+                if freed_seat:
+                    promoted = promote_waitlist(event)
+                    response_data['promoted_from_waitlist'] = [p.user_id for p in promoted]
+
+                return Response(response_data, status=status.HTTP_200_OK)
 
             except Participant.DoesNotExist:
                 return Response({
@@ -571,17 +750,30 @@ class EventAdminUnregisterAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+# Keyset order of participant lists (`?paginate=cursor`), newest registration first
+REGISTRATION_KEYSET = ('-registered_at', '-id')
+
+
+class ParticipantKeysetPagination(KeysetPagination):
+    ordering = REGISTRATION_KEYSET
+
+
 class UserRegistrationsAPIView(APIView):
     """
     Get all registrations for the authenticated user
     GET /api/user/registrations/
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 10
 
     def get(self, request):
         """Get all event registrations for authenticated user"""
         try:
-            participants = Participant.objects.filter(user=request.user).select_related('event')
+            participants = (
+                Participant.objects.filter(user=request.user)
+                .select_related('user', 'event__event_type')
+                .prefetch_related('registered_participants', 'event__questions')
+            )
 
             status_filter = request.GET.get('status')
             if status_filter:
@@ -592,14 +784,16 @@ class UserRegistrationsAPIView(APIView):
                 now = timezone.now()
                 participants = participants.filter(event__event_date__gte=now)
 
-            paginator = EventPagination()
-            paginated_participants = paginator.paginate_queryset(participants, request)
+            paginator, paginated_participants = paginate(request, participants, REGISTRATION_KEYSET)
 
             # Use the full ParticipantSerializer to include event details
             serializer = ParticipantSerializer(paginated_participants, many=True, context={'request': request})
 
             return paginator.get_paginated_response(serializer.data)
 
+        except NotFound:
+            # Invalid pagination cursor
+            raise
         except Exception as e:
             return Response(
                 {'error': f'Failed to fetch user registrations: {str(e)}'},
@@ -612,6 +806,7 @@ class EventParticipantsAPIView(APIView):
     GET /api/events/<event_id>/participants/
     """
     permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 12
     
     def get(self, request, event_id):
         """Get all participants for an event"""
@@ -621,8 +816,8 @@ class EventParticipantsAPIView(APIView):
             participants = (
                 Participant.objects
                 .filter(event=event)
-                .select_related('user')
-                .prefetch_related('registered_participants')
+                .select_related('user', 'event__event_type')
+                .prefetch_related('registered_participants', 'event__questions')
             )
 
             status_filter = request.GET.get('status')
@@ -643,12 +838,14 @@ class EventParticipantsAPIView(APIView):
                 else:
                     participants = participants.exclude(id__in=attended_participant_ids)
 
-            paginator = EventPagination()
-            paginated_participants = paginator.paginate_queryset(participants, request)
+            paginator, paginated_participants = paginate(request, participants, REGISTRATION_KEYSET)
 
             serializer = ParticipantSerializer(paginated_participants, many=True)
             return paginator.get_paginated_response(serializer.data)
 
+        except NotFound:
+            # Invalid pagination cursor
+            raise
         except Exception as e:
             return Response(
                 {'error': f'Failed to fetch event participants: {str(e)}'},
@@ -662,6 +859,7 @@ class InternalBookingAPIView(APIView):
     POST /api/events/<event_id>/internal-book/
     """
     permission_classes = [IsAdminUser]
+    query_budget = 30
 
     def post(self, request, event_id):
         """Add a participant to event with payment bypass (Admin only)"""
@@ -772,15 +970,31 @@ class InternalBookingAPIView(APIView):
             )
 
 
+def report_download_response(request, event, kind):
+    """Serve the stored report for the event's current data, or queue it and return 202"""
+    job = get_or_queue_report(event, kind, request.user)
+    if job.status == 'done':
+        return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.filename, content_type='text/csv')
+    return Response(
+        {
+            'job_id': str(job.token),
+            'status': job.status,
+            'status_url': reverse('event:report_job_status', kwargs={'token': job.token}),
+        },
+        status=status.HTTP_202_ACCEPTED
+    )
+
+
 class EventAnalysisDownloadAPIView(APIView):
     """
     Download comprehensive event analysis as CSV (Admin only)
     GET /api/events/<event_id>/analysis/download/
     """
     permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 14
 
     def get(self, request, event_id):
-        """Generate and download event analysis CSV"""
+        """Download the event analysis CSV, or queue it and return the job (202)"""
         try:
             event = get_object_or_404(Event, id=event_id)
 
@@ -791,24 +1005,13 @@ class EventAnalysisDownloadAPIView(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            participants = Participant.objects.filter(event=event).select_related(
-                'user', 'user__profile'
-            ).prefetch_related('registered_participants')
-
-            if not participants.exists():
+            if not Participant.objects.filter(event=event).exists():
                 return Response(
                     {'error': 'No participants found for this event'},
                     status=status.HTTP_404_NOT_FOUND
                 )
 
-            response = HttpResponse(content_type='text/csv')
-            response['Content-Disposition'] = f'attachment; filename="{event.event_name}_analysis_{timezone.now().strftime("%Y%m%d_%H%M%S")}.csv"'
-
-            writer = csv.writer(response)
-
-            self._write_analysis_to_csv(writer, event, participants)
-
-            return response
+            return report_download_response(request, event, 'analysis')
 
         except Exception as e:
             return Response(
@@ -823,6 +1026,7 @@ class EventODListAPIView(APIView):
     GET /api/events/<event_id>/od-list/
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 10
 
     def get(self, request, event_id):
         """Return event OD list data as JSON."""
@@ -898,9 +1102,10 @@ class EventODListDownloadAPIView(APIView):
     GET /api/events/<event_id>/od-list/download/
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 14
 
     def get(self, request, event_id):
-        """Generate and download event OD list CSV (only for attended participants)."""
+        """Download the event OD list CSV, or queue it and return the job (202)."""
         try:
             print(f"[OD_LIST_DEBUG] Starting OD list download for event_id: {event_id}")
             print(f"[OD_LIST_DEBUG] User: {request.user.username}, is_staff: {request.user.is_staff}, is_superuser: {request.user.is_superuser}")
@@ -922,32 +1127,15 @@ class EventODListDownloadAPIView(APIView):
             event = get_object_or_404(Event, id=event_id)
             print(f"[OD_LIST_DEBUG] Event found: {event.event_name} (ID: {event.id})")
 
-            # Get all ODList entries for the event (not just attended ones)
-            od_list_entries = (
-                ODList.objects.filter(event=event)
-                .select_related('participant', 'participant__user', 'participant__user__profile')
-                .order_by('participant__user__first_name', 'participant__user__last_name')
-            )
-            print(f"[OD_LIST_DEBUG] Found {od_list_entries.count()} OD list entries")
-
-            if not od_list_entries.exists():
+            # The report covers all ODList entries for the event (not just attended ones)
+            if not ODList.objects.filter(event=event).exists():
                 print(f"[OD_LIST_DEBUG] No participants registered for event {event_id}")
                 return Response(
                     {'error': 'No participants registered for this event'},
                     status=status.HTTP_404_NOT_FOUND
                 )
 
-            print(f"[OD_LIST_DEBUG] Generating CSV for {od_list_entries.count()} participants")
-            response = HttpResponse(content_type='text/csv')
-            filename = f"{event.event_name}_od_list_{timezone.now().strftime('%Y%m%d_%H%M%S')}.csv"
-            response['Content-Disposition'] = f'attachment; filename="{filename}"'
-            print(f"[OD_LIST_DEBUG] CSV filename: {filename}")
-
-            writer = csv.writer(response)
-            self._write_od_list_to_csv(writer, event, od_list_entries)
-            print(f"[OD_LIST_DEBUG] CSV generation completed successfully")
-
-            return response
+            return report_download_response(request, event, 'od_list')
 
         except Exception as e:
             print(f"[OD_LIST_DEBUG] Error in OD list download: {str(e)}")
@@ -958,218 +1146,63 @@ class EventODListDownloadAPIView(APIView):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
-    def _write_od_list_to_csv(self, writer, event, od_list_entries):
-        """Write event OD list to CSV"""
-        print(f"[OD_LIST_DEBUG] Writing CSV for event: {event.event_name}")
-        print(f"[OD_LIST_DEBUG] Number of OD list entries to write: {od_list_entries.count()}")
-
-        # Header
-        writer.writerow([f'{event.event_name} - OD list'])
-        writer.writerow([])  # Empty row
-
-        # Column headers
-        writer.writerow([
-            'Username',
-            'User Email',
-            'Roll Number',
-            'Degree',
-            'Year',
-            'Department',
-            'College Name',
-            'Attended'
-        ])
-        print(f"[OD_LIST_DEBUG] CSV headers written")
-
-        # OD list entry data
-        entry_count = 0
-        for od_entry in od_list_entries:
-            participant = od_entry.participant
-            profile = getattr(participant.user, 'profile', None)
-            entry_count += 1
-
-            row_data = [
-                participant.user.username,
-                participant.user.email,
-                profile.rollno if profile else 'Unknown',
-                profile.degree if profile and profile.degree else 'Unknown',
-                profile.year if profile and profile.year else 'Unknown',
-                profile.department if profile and profile.department else 'Unknown',
-                profile.college_name if profile else 'Unknown',
-                'Yes' if od_entry.attendance else 'No'
-            ]
-
-            writer.writerow(row_data)
-            print(f"[OD_LIST_DEBUG] Wrote row {entry_count}: {row_data}")
-
-        print(f"[OD_LIST_DEBUG] Completed writing {entry_count} OD list entries to CSV")
-    
-    def _write_analysis_to_csv(self, writer, event, participants):
-        """Write comprehensive event analysis to CSV"""
-        
-        # SECTION 1: Event Summary
-        writer.writerow(['=' * 80])
-        writer.writerow([f'EVENT ANALYSIS REPORT: {event.event_name}'])
-        writer.writerow(['=' * 80])
-        writer.writerow(['Generated on:', timezone.now().strftime('%Y-%m-%d %H:%M:%S')])
-        writer.writerow(['Event Date:', event.event_date.strftime('%Y-%m-%d %H:%M:%S')])
-        writer.writerow(['Event Type:', event.get_event_type_display()])
-        writer.writerow(['Payment Type:', event.get_payment_type_display()])
-        writer.writerow(['Participation Type:', event.get_participation_type_display()])
-        writer.writerow([])
-        
-        # Calculate summary statistics using ODList for attendance
-        total_registered = participants.count()
-        
-        # Get attendance from ODList
-        attended_participants = ODList.objects.filter(
-            participant__event=event,
-            attendance=True
-        ).count()
-        
-        total_present = attended_participants
-        total_absent = total_registered - total_present
-        attendance_rate = (total_present / total_registered * 100) if total_registered > 0 else 0
-        
-        writer.writerow(['📊 EVENT SUMMARY'])
-        writer.writerow(['-' * 40])
-        writer.writerow(['Total Registrations:', total_registered])
-        writer.writerow(['Total Present:', total_present])
-        writer.writerow(['Total Absent:', total_absent])
-        writer.writerow(['Attendance Rate:', f'{attendance_rate:.2f}%'])
-        writer.writerow([])
-        
-        # SECTION 2: Department-wise Analysis
-        writer.writerow(['🏛️ DEPARTMENT-WISE ANALYSIS'])
-        writer.writerow(['-' * 50])
-        writer.writerow(['Department', 'Registered', 'Present', 'Absent', 'Attendance %'])
-        
-        dept_stats = self._get_department_stats(participants)
-        for dept, stats in dept_stats.items():
-            attendance_pct = (stats['present'] / stats['total'] * 100) if stats['total'] > 0 else 0
-            writer.writerow([
-                dept, 
-                stats['total'], 
-                stats['present'], 
-                stats['absent'], 
-                f'{attendance_pct:.1f}%'
-            ])
-        writer.writerow([])
-        
-        # SECTION 3: Year-wise Analysis
-        writer.writerow(['📅 YEAR-WISE ANALYSIS'])
-        writer.writerow(['-' * 40])
-        writer.writerow(['Year', 'Registered', 'Present', 'Absent', 'Attendance %'])
-        
-        year_stats = self._get_year_stats(participants)
-        for year, stats in sorted(year_stats.items()):
-            attendance_pct = (stats['present'] / stats['total'] * 100) if stats['total'] > 0 else 0
-            writer.writerow([
-                year, 
-                stats['total'], 
-                stats['present'], 
-                stats['absent'], 
-                f'{attendance_pct:.1f}%'
-            ])
-        writer.writerow([])
-        
-        # SECTION 4: College-wise Analysis
-        writer.writerow(['🏫 COLLEGE-WISE ANALYSIS'])
-        writer.writerow(['-' * 40])
-        writer.writerow(['College', 'Registered', 'Present', 'Absent', 'Attendance %'])
-        
-        college_stats = self._get_college_stats(participants)
-        for college, stats in college_stats.items():
-            attendance_pct = (stats['present'] / stats['total'] * 100) if stats['total'] > 0 else 0
-            writer.writerow([
-                college, 
-                stats['total'], 
-                stats['present'], 
-                stats['absent'], 
-                f'{attendance_pct:.1f}%'
-            ])
-        writer.writerow([])
-        
-        # SECTION 5: Payment Analysis (if applicable)
-        if event.payment_type == 'paid':
-            writer.writerow(['💳 PAYMENT ANALYSIS'])
-            writer.writerow(['-' * 30])
-            paid_count = participants.filter(payment_status=True).count()
-            unpaid_count = participants.filter(payment_status=False).count()
-            payment_rate = (paid_count / total_registered * 100) if total_registered > 0 else 0
-            
-            writer.writerow(['Total Paid:', paid_count])
-            writer.writerow(['Total Unpaid:', unpaid_count])
-            writer.writerow(['Payment Rate:', f'{payment_rate:.2f}%'])
-            writer.writerow([])
-        
-        # SECTION 6: Complete Participants List
-        writer.writerow(['👥 COMPLETE PARTICIPANTS LIST'])
-        writer.writerow(['=' * 80])
-        writer.writerow([
-            'S.No', 'Name', 'Email', 'Roll No', 'Degree', 'Year', 'Department',
-            'College', 'Phone', 'Registration Date', 'Attendance Status',
-            'Payment Status', 'Team Name', 'Special Requirements'
-        ])
-        
-        for idx, participant in enumerate(participants.order_by('user__first_name'), 1):
-            row_data = format_csv_row(participant, event, idx)
-            writer.writerow(row_data)
-    
-    def _get_department_stats(self, participants):
-        """Calculate department-wise statistics"""
-        dept_stats = defaultdict(lambda: {'total': 0, 'present': 0, 'absent': 0})
-        
-        for participant in participants:
-            profile = getattr(participant.user, 'profile', None)
-            dept = profile.get_department_display() if profile and profile.department else 'Unknown'
-            
-            dept_stats[dept]['total'] += 1
-            
-            # Check attendance from prefetched ODList data
-            od_entry = participant.registered_participants.first()
-            if od_entry and od_entry.attendance:
-                dept_stats[dept]['present'] += 1
-            else:
-                dept_stats[dept]['absent'] += 1
-        
-        return dict(dept_stats)
-    
-    def _get_year_stats(self, participants):
-        """Calculate year-wise statistics"""
-        year_stats = defaultdict(lambda: {'total': 0, 'present': 0, 'absent': 0})
-        
-        for participant in participants:
-            year = _extract_year_from_email(participant.user.email)
-            
-            year_stats[year]['total'] += 1
-            
-            # Check attendance from prefetched ODList data
-            od_entry = participant.registered_participants.first()
-            if od_entry and od_entry.attendance:
-                year_stats[year]['present'] += 1
-            else:
-                year_stats[year]['absent'] += 1
-        
-        return dict(year_stats)
-    
-    def _get_college_stats(self, participants):
-        """Calculate college-wise statistics"""
-        college_stats = defaultdict(lambda: {'total': 0, 'present': 0, 'absent': 0})
-        
-        for participant in participants:
-            profile = getattr(participant.user, 'profile', None)
-            college = profile.college_name if profile else 'Unknown'
-            
-            college_stats[college]['total'] += 1
-            
-            # Check attendance from prefetched ODList data
-            od_entry = participant.registered_participants.first()
-            if od_entry and od_entry.attendance:
-                college_stats[college]['present'] += 1
-            else:
-                college_stats[college]['absent'] += 1
-        
-        return dict(college_stats)
+
+class ReportJobStatusAPIView(APIView):
+    """
+    Poll a queued report download
+    GET /api/events/report-jobs/<token>/
+    """
+    permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 6
+
+    def get(self, request, token):
+        """Get the report job status and, once built, its download URL"""
+        try:
+            job = get_object_or_404(ReportJob, token=token)
+            response_data = {
+                'job_id': str(job.token),
+                'event_id': job.event_id,
+                'kind': job.kind,
+                'status': job.status,
+                'error': job.error,
+                'created_at': job.created_at,
+                'finished_at': job.finished_at,
+                'download_url': None
+            }
+            if job.status == 'done':
+                response_data['download_url'] = reverse('event:report_job_download', kwargs={'token': job.token})
+            return Response(response_data)
+
+        except Http404:
+            return Response({'error': 'Report job not found'}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response(
+                {'error': f'Failed to fetch report job: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+class ReportJobDownloadAPIView(APIView):
+    """
+    Download the artifact of a finished report job
+    GET /api/events/report-jobs/<token>/download/
+    """
+    permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 6
+
+    def get(self, request, token):
+        """Serve the stored CSV file"""
+        try:
+            job = get_object_or_404(ReportJob, token=token, status='done')
+            return FileResponse(job.file.open('rb'), as_attachment=True, filename=job.filename, content_type='text/csv')
+
+        except (Http404, FileNotFoundError):
+            return Response({'error': 'Report not available'}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response(
+                {'error': f'Failed to download report: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
 
 # ========== EVENT GUIDE ENDPOINTS ==========
@@ -1180,6 +1213,7 @@ class EventGuideDetailAPIView(APIView):
     GET /api/events/<int:event_id>/eventdesc/
     """
     permission_classes = [AllowAny]
+    query_budget = 8
     
     def get(self, request, event_id):
         try:
@@ -1209,6 +1243,7 @@ class EventGuideCreateUpdateAPIView(APIView):
     POST/PUT /api/events/<int:event_id>/eventdesc/admin/
     """
     permission_classes = [IsEventStaffOrAdmin]
+    query_budget = {'GET': 8, 'POST': 15, 'PUT': 15, 'PATCH': 15, 'DELETE': 15}
     
     def post(self, request, event_id):
         """Create new event guide"""
@@ -1264,6 +1299,7 @@ class EventQuestionsManageAPIView(APIView):
     POST /api/events/<int:event_id>/questions/ - Create/update questions in bulk
     GET /api/events/<int:event_id>/questions/ - Get all questions for an event
     """
+    query_budget = {'GET': 10, 'POST': 30}
     
     def get_permissions(self):
         """Allow anyone to GET questions, require auth for POST"""
@@ -1275,12 +1311,16 @@ class EventQuestionsManageAPIView(APIView):
         """Get all questions for an event (public access)"""
         try:
             event = get_object_or_404(Event, id=event_id)
-            questions = EventQuestion.objects.filter(event=event).order_by('order', 'id')
-            serializer = EventQuestionSerializer(questions, many=True)
-            return Response({
-                'success': True,
-                'data': serializer.data
-            }, status=status.HTTP_200_OK)
+
+            def respond():
+                questions = EventQuestion.objects.filter(event=event).order_by('order', 'id')
+                serializer = EventQuestionSerializer(questions, many=True)
+                return Response({
+                    'success': True,
+                    'data': serializer.data
+                }, status=status.HTTP_200_OK)
+
+            return conditional_get(request, event_questions_validator(event), respond, public=True, max_age=60)
             
         except Exception as e:
             return Response(
@@ -1345,6 +1385,7 @@ class EventQuestionDetailAPIView(APIView):
     DELETE /api/events/questions/<int:question_id>/ - Delete question
     """
     permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 12
     
     def put(self, request, question_id):
         """Update a specific question"""
@@ -1421,10 +1462,10 @@ class Scanner(APIView):
     PUT/PATCH /api/events/<int:event_id>/mark-attendance/
     """
     permission_classes = [IsQRScannerOrAdmin]
+    query_budget = 8
 
     def put(self, request, event_id):
         try:
-            event = get_object_or_404(Event, id=event_id)
             hash_value = request.data.get('hash')
 
             if not hash_value:
@@ -1433,34 +1474,48 @@ class Scanner(APIView):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            od_obj = ODList.objects.get(hash=hash_value, participant__event=event)
-            if hash_value == od_obj.hash:
-                from .serializers import ParticipantSerializer
-                participant_data = ParticipantSerializer(od_obj.participant).data
-                if od_obj.attendance == True:
-                    return Response(
-                        {
-                            'message': 'Attendance was already marked',
-                            'participant': participant_data
-                        },
-                        status=status.HTTP_208_ALREADY_REPORTED
-                    )
-                od_obj.attendance = True
-                od_obj.attendance_marked_at = timezone.now()
-                od_obj.save()
-                participant_data = ParticipantSerializer(od_obj.participant).data
+            # Signed tokens are checked in memory: forged or other-event codes never reach the DB
+            ticket = None
+            if is_ticket_token(hash_value):
+                ticket = verify_ticket_token(hash_value, event_id)
+                if ticket is None:
+                    raise ODList.DoesNotExist
+
+            # One query for the entry and everything the scan result shows
+            entries = ODList.objects.select_related('participant__user__profile').filter(participant__event_id=event_id)
+            if ticket:
+                participant_id, version = ticket
+                od_obj = entries.get(participant_id=participant_id, ticket_version=version)
+            else:
+                od_obj = entries.get(hash=hash_value)
+
+            # Conditional UPDATE: of two simultaneous scans only one marks the ticket
+            marked_at = timezone.now()
+            marked = not od_obj.attendance and ODList.objects.filter(pk=od_obj.pk, attendance=False).update(
+                attendance=True,
+                attendance_marked_at=marked_at,
+                updated_at=marked_at
+            )
+            if marked:
+                EventStats.adjust(od_obj.event_id, attended=1)
+            else:
                 return Response(
                     {
-                        'message': 'Attendance marked successfully',
-                        'participant': participant_data
+                        'message': 'Attendance was already marked',
+                        'participant': ScanResultSerializer(od_obj).data
                     },
-                    status=status.HTTP_200_OK
-                )
-            else:
-                return Response(
-                    {'error': 'Invalid hash'},
-                    status=status.HTTP_400_BAD_REQUEST
+                    status=status.HTTP_208_ALREADY_REPORTED
                 )
+
+            od_obj.attendance = True
+            od_obj.attendance_marked_at = marked_at
+            return Response(
+                {
+                    'message': 'Attendance marked successfully',
+                    'participant': ScanResultSerializer(od_obj).data
+                },
+                status=status.HTTP_200_OK
+            )
         except ODList.DoesNotExist:
             return Response(
                 {'error': 'Invalid hash or participant not found for this event'},
@@ -1474,6 +1529,118 @@ class Scanner(APIView):
 
 
 
+class BatchScanner(APIView):
+    """
+    Mark attendance for a batch of queued scans
+    POST /api/events/<int:event_id>/mark-attendance/batch/
+    Body: {"scans": [{"hash": "...", "scanned_at": "<ISO 8601>", "device_id": "..."}, ...]}
+    """
+    permission_classes = [IsQRScannerOrAdmin]
+    query_budget = 15
+
+    def post(self, request, event_id):
+        try:
+            event = get_object_or_404(Event, id=event_id)
+            scans = request.data.get('scans') if isinstance(request.data, dict) else request.data
+
+            if not isinstance(scans, list) or not scans:
+                return Response(
+                    {'error': 'A non-empty list of scans is required'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            max_scans = settings.ATTENDANCE_BATCH_MAX_SCANS
+            if len(scans) > max_scans:
+                return Response(
+                    {'error': f'At most {max_scans} scans can be sent in one batch'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+            results = mark_attendance_batch(event, scans)
+            summary = {key: 0 for key in ('marked', 'already_marked', 'unknown', 'invalid')}
+            for result in results:
+                summary[result['status']] += 1
+            return Response(
+                {
+                    'message': f"{summary['marked']} attendance(s) marked",
+                    'summary': summary,
+                    'results': results
+                },
+                status=status.HTTP_200_OK
+            )
+        except Http404:
+            return Response({'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response(
+                {'error': f'Failed to mark attendance: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+
+@method_decorator(gzip_page, name='dispatch')
+class TicketIndexAPIView(APIView):
+    """
+    Ticket index for offline scanning, gzip-compressed for clients that accept it
+    GET /api/events/<int:event_id>/ticket-index/
+    GET /api/events/<int:event_id>/ticket-index/?since=<synced_at of the previous sync>
+    """
+    permission_classes = [IsQRScannerOrAdmin]
+    query_budget = 8
+
+    def get(self, request, event_id):
+        try:
+            event = get_object_or_404(Event, id=event_id)
+
+            since = request.query_params.get('since')
+            if since:
+                since = parse_datetime(since)
+                if since is None:
+                    return Response(
+                        {'error': 'since must be an ISO 8601 timestamp'},
+                        status=status.HTTP_400_BAD_REQUEST
+                    )
+                if timezone.is_naive(since):
+                    since = timezone.make_aware(since)
+
+            return Response(build_ticket_index(event, since=since or None), status=status.HTTP_200_OK)
+        except Http404:
+            return Response({'error': 'Event not found'}, status=status.HTTP_404_NOT_FOUND)
+        except Exception as e:
+            return Response(
+                {'error': f'Failed to build ticket index: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Lets EventSource clients (Accept: text/event-stream) through content negotiation"""
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data)
+
+
+class AttendanceStreamAPIView(APIView):
+    """
+    Live attendance totals and deltas for check-in dashboards (server-sent events)
+    GET /api/events/<int:event_id>/attendance/stream/
+    """
+    permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 6
+    renderer_classes = [JSONRenderer, EventStreamRenderer]
+
+    def get(self, request, event_id):
+        event = get_object_or_404(Event, id=event_id)
+        response = StreamingHttpResponse(attendance_event_stream(event), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'  # stop nginx from buffering the stream
+        return response
+
+
+
 # ========== EVENT GUIDE VIEWS ==========
 
 class EventGuideDetailAPIView(APIView):
@@ -1482,18 +1649,25 @@ class EventGuideDetailAPIView(APIView):
     GET /api/events/<event_id>/eventdesc/
     """
     permission_classes = [AllowAny]
+    query_budget = 8
 
     def get(self, request, event_id):
         """Get event guide for a specific event"""
         try:
-            event = get_object_or_404(Event, id=event_id)
-            
-            try:
-                guide = event.guide
+            def build():
+                event = get_object_or_404(Event, id=event_id)
+
+                try:
+                    guide = event.guide
+                except EventGuide.DoesNotExist:
+                    return create_error_response('Event guide not found for this event', 404), (None, None), (), None
+
                 serializer = EventGuideSerializer(guide, context={'request': request})
-                return create_success_response(data=serializer.data)
-            except EventGuide.DoesNotExist:
-                return create_error_response('Event guide not found for this event', 404)
+                return create_success_response(data=serializer.data), event_guide_validator(guide), (), None
+
+            return cached_get(
+                request, 'event_guide', build, tags=[event_guide_tag(event_id)], public=True, max_age=300
+            )
                 
         except Exception as e:
             return create_error_response(f'Failed to fetch event guide: {str(e)}', 500)
@@ -1505,6 +1679,7 @@ class EventGuideCreateUpdateAPIView(APIView):
     POST/PUT/PATCH /api/events/<event_id>/eventdesc/admin/
     """
     permission_classes = [IsAuthenticated]
+    query_budget = {'GET': 8, 'POST': 15, 'PUT': 15, 'PATCH': 15, 'DELETE': 15}
 
     def post(self, request, event_id):
         """Create event guide"""
@@ -1602,6 +1777,7 @@ class AvailableUsersForBookingAPIView(ListAPIView):
     NIGGA GET THIS ENDPOINT - /api/events/<event_id>/available-users/
     """
     permission_classes = [IsAdminUser]
+    query_budget = 8
     serializer_class = AvailableUsersForBookingSerializer
 
     def get_queryset(self):
@@ -1617,12 +1793,15 @@ class EventFormResponsesAPIView(ListAPIView):
     Returns all form responses (answers) for participants of an event (admin only)
     """
     permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 8
     serializer_class = FormResponseSerializer
+    # Unpaginated list unless the client asks for keyset pages
+    pagination_class = ParticipantKeysetPagination
 
     def get_queryset(self):
         event_id = self.kwargs["event_id"]
         event = get_object_or_404(Event, id=event_id)
-        return Participant.objects.filter(event=event).exclude(answers=None)
+        return Participant.objects.filter(event=event).exclude(answers=None).select_related('user')
 
 class ParticipantFormResponseAPIView(RetrieveAPIView):
     """
@@ -1630,6 +1809,7 @@ class ParticipantFormResponseAPIView(RetrieveAPIView):
     Returns a single participant's form response for an event (admin only)
     """
     permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 8
     serializer_class = FormResponseSerializer
 
     def get_object(self):
@@ -1647,20 +1827,24 @@ class EventCategoryListAPIView(APIView):
     GET /api/events/categories/
     """
     permission_classes = [AllowAny]
+    query_budget = 10
     
     def get(self, request):
         """Get all active event categories"""
         try:
-            from .models import EventCategory
-            categories = EventCategory.objects.filter(is_active=True).order_by('order')
-            
-            data = [{
-                'code': cat.code,
-                'display_name': cat.display_name,
-                'description': cat.description
-            } for cat in categories]
-            
-            return create_success_response(data=data)
+            from users.choice_lookups import get_choice_tables
+
+            def build():
+                data = [{
+                    'code': cat['code'],
+                    'display_name': cat['display_name'],
+                    'description': cat['description']
+                } for cat in get_choice_tables()['event_categories']]
+                return create_success_response(data=data), event_categories_validator(), (), None
+
+            return cached_get(
+                request, 'event_categories', build, tags=[EVENT_CATEGORIES_TAG], public=True, max_age=300
+            )
             
         except Exception as e:
             return create_error_response(f'Failed to fetch event categories: {str(e)}', 500)
@@ -1672,6 +1856,7 @@ class EventCategoryCreateAPIView(APIView):
     POST /api/events/categories/create/
     """
     permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 12
     
     def post(self, request):
         """Create a new event category"""
@@ -1720,6 +1905,7 @@ class EventCategoryUpdateAPIView(APIView):
     PUT/PATCH /api/events/categories/<category_id>/update/
     """
     permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 12
     
     def put(self, request, category_id):
         """Update event category"""
@@ -1785,6 +1971,7 @@ class EventCategoryDeleteAPIView(APIView):
     DELETE /api/events/categories/<category_id>/delete/
     """
     permission_classes = [IsEventStaffOrAdmin]
+    query_budget = 12
     
     def delete(self, request, category_id):
         """Delete event category"""
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-17 11:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('payment', '0002_alter_paymentconfiguration_options_and_more'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='payment',
+            index=models.Index(fields=['user', 'created_at', 'id'], name='payment_pay_user_id_feaf0e_idx'),
+        ),
+    ]
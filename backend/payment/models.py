@@ -160,6 +160,8 @@ class Payment(models.Model):
             models.Index(fields=['status']),
             models.Index(fields=['user', 'status']),
             models.Index(fields=['user', 'event']),
+            # Keyset pages of a user's payments (event/pagination.py)
+            models.Index(fields=['user', 'created_at', 'id']),
         ]
 
     def __str__(self):
@@ -12,6 +12,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.decorators import api_view, permission_classes
+from rest_framework.exceptions import NotFound
 from django.views.decorators.csrf import csrf_exempt
 
 
@@ -22,6 +23,8 @@ from .serializers import (
     PaymentConfigurationSerializer
 )
 from event.models import Participant
+from event.pagination import paginate
+from radiumB.query_budget import query_budget
 
 try:
     from cashfree_pg.api_client import ApiClient
@@ -444,6 +447,7 @@ class PaymentInitiateView(APIView):
     POST /api/payment/initiate/
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 25
 
     def post(self, request):
         # Accept either participant_id (free events) or event_id (paid events)
@@ -659,10 +663,11 @@ class PaymentStatusView(APIView):
     GET /api/payment/status/{order_id}/
     """
     permission_classes = [AllowAny]  # Allow anyone to check payment status with order_id
+    query_budget = 8
 
     def get(self, request, order_id):
         try:
-            payment = get_object_or_404(Payment, order_id=order_id)
+            payment = get_object_or_404(Payment.objects.select_related('user', 'event', 'participant'), order_id=order_id)
             
             print(f"[PAYMENT_STATUS_DEBUG] Payment {order_id}: status={payment.status}, is_successful={payment.is_successful}")
             print(f"[PAYMENT_STATUS_DEBUG] Participant: {payment.participant}, payment_status: {payment.participant.payment_status if payment.participant else 'No participant'}")
@@ -694,6 +699,7 @@ class PaymentWebhookView(APIView):
     POST /api/payment/webhook/
     """
     permission_classes = [AllowAny]  # Webhooks don't require authentication
+    query_budget = 25
 
     def post(self, request):
         try:
@@ -842,28 +848,36 @@ class PaymentListView(APIView):
     GET /api/payment/list/
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 8
 
     def get(self, request):
         try:
-            payments = Payment.objects.filter(user=request.user).select_related('event', 'participant')
+            payments = Payment.objects.filter(user=request.user).select_related('user', 'event', 'participant')
 
             # Filter by status if provided
             status_filter = request.GET.get('status')
             if status_filter:
                 payments = payments.filter(status=status_filter)
 
+            # Whole list as before, or keyset pages with ?paginate=cursor
+            paginator, payments = paginate(request, payments, ('-created_at', '-id'), fallback=None)
+
             serializer = PaymentSerializer(payments, many=True)
             return Response({
                 'success': True,
+                **(paginator.get_paginated_data() if paginator else {}),
                 'payments': serializer.data
             }, status=status.HTTP_200_OK)
 
+        except NotFound:
+            raise
         except Exception as e:
             return Response({
                 'error': f'Failed to fetch payments: {str(e)}'
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@query_budget(4)
 @api_view(['GET'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def payment_config(request):
@@ -878,6 +892,7 @@ def payment_config(request):
     })
 
 
+@query_budget(20)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def create_test_payment(request):
@@ -958,6 +973,7 @@ def create_test_payment(request):
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@query_budget(12)
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def test_payment_success(request):
@@ -1039,6 +1055,7 @@ class PaymentConfigurationView(APIView):
     POST /api/payment/config-admin/ - Update configuration
     """
     permission_classes = [IsAuthenticated, IsAdminUser]
+    query_budget = {'GET': 8, 'POST': 12}
 
     def get(self, request):
         """Get current payment configuration"""
@@ -1094,18 +1111,21 @@ class PaymentConfigurationListView(APIView):
     GET /api/payment/config-list/
     """
     permission_classes = [IsAuthenticated, IsAdminUser]
+    query_budget = 8
 
     def get(self, request):
         """Get all payment configurations"""
-        configs = PaymentConfiguration.objects.all()
+        configs = PaymentConfiguration.objects.select_related('updated_by')
         serializer = PaymentConfigurationSerializer(configs, many=True)
+        active_config = PaymentConfiguration.get_active_config()
         return Response({
             'success': True,
             'configurations': serializer.data,
-            'active_config': PaymentConfiguration.get_active_config().id if PaymentConfiguration.get_active_config() else None
+            'active_config': active_config.id if active_config else None
         })
 
 
+@query_budget(10)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def switch_payment_config(request):
@@ -1137,6 +1157,7 @@ def switch_payment_config(request):
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@query_budget(25)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def process_payment_confirmation(request):
@@ -1165,7 +1186,7 @@ def process_payment_confirmation(request):
         
         # Create OD entry and send QR email
         from event.models import ODList
-        from event.email_services import send_qr_email_to_participant
+        from event.email_services import queue_qr_email_to_participant
         
         od_entry, created = ODList.objects.get_or_create(
             participant=payment.participant,
@@ -1180,12 +1201,12 @@ def process_payment_confirmation(request):
         else:
             actions_performed.append('OD entry already exists')
         
-        # Send QR email
-        email_result = send_qr_email_to_participant(payment.participant, force=True)
+        # Queue QR email for the mail worker
+        email_result = queue_qr_email_to_participant(payment.participant, force=True)
         if email_result['success']:
-            actions_performed.append('QR email sent successfully')
+            actions_performed.append('QR email queued')
         else:
-            actions_performed.append(f'Failed to send QR email: {email_result["message"]}')
+            actions_performed.append(f'Failed to queue QR email: {email_result["message"]}')
         
         return Response({
             'success': True,
@@ -1200,6 +1221,7 @@ def process_payment_confirmation(request):
         return Response({'error': str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@query_budget(8)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def payment_debug(request):
@@ -1262,6 +1284,7 @@ def payment_debug(request):
         }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
 
 
+@query_budget(12)
 @api_view(['POST'])
 @permission_classes([IsAuthenticated, IsAdminUser])
 def cleanup_corrupted_payments(request):
@@ -1308,6 +1331,7 @@ def cleanup_corrupted_payments(request):
 
 
 @csrf_exempt
+@query_budget(20)
 @api_view(['POST', 'GET'])
 @permission_classes([AllowAny])
 def payu_success_response(request):
@@ -1390,6 +1414,7 @@ def payu_success_response(request):
 
 
 @csrf_exempt
+@query_budget(12)
 @api_view(['POST', 'GET'])
 @permission_classes([AllowAny])
 def payu_failure_response(request):
@@ -1434,6 +1459,7 @@ def payu_failure_response(request):
     except Exception as e:
         print(f"[PAYU_FAILURE] Error processing PayU failure: {str(e)}")
         return Response({'error': f'Processing failed: {str(e)}'}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+@query_budget(20)
 @api_view(['POST'])
 @permission_classes([AllowAny])
 def simulate_payu_response(request):
@@ -0,0 +1,140 @@
+"""
+Per-endpoint SQL query budgets.
+
+A view declares the most queries one request to it may run, session and
+user lookups included:
+
+    class EventListAPIView(APIView):
+        query_budget = 8                        # every method
+        query_budget = {'GET': 8, 'POST': 20}   # per method
+
+    @query_budget(3)                            # function views
+    @api_view(['GET'])
+    def get_year_choices(request): ...
+
+    path('user/', query_budget(4)(UserDetailsView.as_view()))   # third-party views
+
+QueryBudgetMiddleware counts the queries of every request on every
+database connection and, when a view goes over its budget, logs a warning
+(QUERY_BUDGET_MODE='log') or raises QueryBudgetExceeded ('raise', for
+tests). api_tester/tests.py holds every API route to its budget against
+seeded data, so a new N+1 fails the build instead of reaching production.
+"""
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+# Statements kept for the report of an overflowing request
+MAX_REPORTED_QUERIES = 50
+
+
+class QueryBudgetExceeded(Exception):
+    def __init__(self, view_name, method, count, budget, queries):
+        self.view_name = view_name
+        self.method = method
+        self.count = count
+        self.budget = budget
+        self.queries = queries
+        super().__init__(
+            f'{method} {view_name} ran {count} queries (budget {budget}):\n' + '\n'.join(queries)
+        )
+
+
+def query_budget(budget):
+    """
+    Declare the query budget of a view function, view class or handler method.
+
+    Sets the `query_budget` attribute and returns the view unchanged, so it
+    works above or below @api_view and on the result of as_view().
+
+    Args:
+        budget: int for every method, or {method: int}
+    """
+    def decorator(view):
+        view.query_budget = budget
+        return view
+    return decorator
+
+
+def _declared_budget(declared, method):
+    if isinstance(declared, dict):
+        return declared.get(method)
+    return declared
+
+
+def get_query_budget(view_func, method):
+    """
+    Budget of `method` requests to a resolved view function, or None when undeclared.
+
+    Looks at the handler method, then the view class, then the view function
+    itself. HEAD requests share the GET budget.
+    """
+    method = 'GET' if method.upper() == 'HEAD' else method.upper()
+    view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+
+    candidates = []
+    if view_class is not None:
+        candidates += [getattr(view_class, method.lower(), None), view_class]
+    candidates.append(view_func)
+
+    for candidate in candidates:
+        declared = getattr(candidate, 'query_budget', None)
+        if declared is not None:
+            budget = _declared_budget(declared, method)
+            if budget is not None:
+                return budget
+    return None
+
+
+class _QueryCounter:
+    """connection.execute_wrapper() hook counting the statements of one request"""
+
+    def __init__(self):
+        self.count = 0
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        if len(self.queries) < MAX_REPORTED_QUERIES:
+            self.queries.append(sql)
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMiddleware:
+    """
+    Hold each request to its view's query budget.
+
+    Goes first in MIDDLEWARE so the session, authentication and any other
+    middleware queries count too. Streaming responses are only counted up to
+    the point the view returns them.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        mode = settings.QUERY_BUDGET_MODE
+        if mode not in ('log', 'raise'):
+            return self.get_response(request)
+
+        counter = _QueryCounter()
+        with ExitStack() as stack:
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(counter))
+            response = self.get_response(request)
+
+        match = getattr(request, 'resolver_match', None)
+        budget = get_query_budget(match.func, request.method) if match else None
+        if budget is not None and counter.count > budget:
+            view_name = match.view_name or match._func_path
+            if mode == 'raise':
+                raise QueryBudgetExceeded(view_name, request.method, counter.count, budget, counter.queries)
+            logger.warning(
+                'Query budget exceeded: %s %s ran %d queries (budget %d)',
+                request.method, view_name, counter.count, budget,
+            )
+        return response
@@ -87,6 +87,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'radiumB.query_budget.QueryBudgetMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -141,6 +142,8 @@ SOCIALACCOUNT_ADAPTER = 'authentication.adapters.SocialAccountAdapter'
 
 # Site domain for password reset emails (frontend URL)
 SITE_DOMAIN = os.getenv('SITE_DOMAIN', 'radium.devsrec.com')
+# Scheme of the reset links, which the mail worker builds outside any request
+SITE_PROTOCOL = os.getenv('SITE_PROTOCOL', 'https')
 SITE_NAME = os.getenv('SITE_NAME', 'DEVS Radium')
 SITE_ID = 1
 
@@ -287,15 +290,38 @@ def get_database_config():
                 print("Using SQLite3 database (fallback)")
             print(f"SQLite3 database path: {sqlite_db_path}")
         
+        # Tests use a file-backed database so that threaded tests get real,
+        # independently locking connections instead of a shared-cache in-memory DB
+        sqlite_test_db_path = os.getenv('SQLITE_TEST_DB_PATH', str(BASE_DIR / 'test_db.sqlite3'))
+
         return {
             'ENGINE': 'django.db.backends.sqlite3',
             'NAME': sqlite_db_path,
+            'TEST': {
+                'NAME': sqlite_test_db_path,
+            },
         }
 
 DATABASES = {
     "default": get_database_config()
 }
 
+# Shared cache (choice lookup stamps, public event responses); per-process memory when REDIS_URL is unset
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -418,6 +444,38 @@ REST_FRAMEWORK = {
 MEDIA_URL = '/media/'
 MEDIA_ROOT = os.path.join(BASE_DIR, 'media')
 
+# Rendered QR ticket images, cached on disk by content (see event/qr_codes.py)
+QR_CACHE_DIR = os.getenv('QR_CACHE_DIR', os.path.join(MEDIA_ROOT, 'qr_cache'))
+QR_PRERENDER_PROCESSES = int(os.getenv('QR_PRERENDER_PROCESSES', 0)) or None  # None = one per CPU
+
+# Largest batch a scanner may flush to /mark-attendance/batch/ in one request
+ATTENDANCE_BATCH_MAX_SCANS = int(os.getenv('ATTENDANCE_BATCH_MAX_SCANS', 1000))
+
+# Live attendance stream (event/live.py): change poll interval and lifetime of one connection
+ATTENDANCE_STREAM_POLL_SECONDS = float(os.getenv('ATTENDANCE_STREAM_POLL_SECONDS', 2))
+ATTENDANCE_STREAM_MAX_SECONDS = int(os.getenv('ATTENDANCE_STREAM_MAX_SECONDS', 600))
+
+# QR ticket payload: 'hash' (64-hex OD hash) or 'token' (short signed token, see event/tickets.py).
+# The scanner endpoints accept both, so switching only affects newly sent QR codes.
+TICKET_QR_FORMAT = os.getenv('TICKET_QR_FORMAT', 'hash')
+
+# Hash prefix length (hex characters) used as the key of the offline ticket index
+TICKET_INDEX_PREFIX_LENGTH = int(os.getenv('TICKET_INDEX_PREFIX_LENGTH', 16))
+
+# Year/Department/Category/EventCategory lookup tables are cached per process (see users/choice_lookups.py);
+# each process re-checks the shared version stamp at most this often
+CHOICE_LOOKUP_CHECK_SECONDS = float(os.getenv('CHOICE_LOOKUP_CHECK_SECONDS', 5))
+
+# Background admin actions (see event/admin_jobs.py) save their progress after every chunk of this many records
+ADMIN_JOB_CHUNK_SIZE = int(os.getenv('ADMIN_JOB_CHUNK_SIZE', 100))
+
+# Public event responses (see event/response_cache.py) are rebuilt at least this often even without a change
+RESPONSE_CACHE_SECONDS = int(os.getenv('RESPONSE_CACHE_SECONDS', 300))
+
+# Requests running more SQL queries than their view's budget (see radiumB/query_budget.py):
+# 'log' a warning, 'raise' QueryBudgetExceeded, or 'off'
+QUERY_BUDGET_MODE = os.getenv('QUERY_BUDGET_MODE', 'log' if DEBUG else 'off')
+
 # File upload settings
 FILE_UPLOAD_MAX_MEMORY_SIZE = 10485760  # 10MB
 FILE_UPLOAD_PERMISSIONS = 0o644
@@ -448,6 +506,18 @@ DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER)
 EMAIL_USE_SSL = False  # Gmail uses TLS, not SSL
 SERVER_EMAIL = EMAIL_HOST_USER  # Server email for error messages
 
+# Transactional mail outbox (delivered by `manage.py run_mail_worker`)
+MAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('MAIL_OUTBOX_MAX_ATTEMPTS', 6))
+MAIL_OUTBOX_BACKOFF_SECONDS = int(os.getenv('MAIL_OUTBOX_BACKOFF_SECONDS', 30))  # doubled after each failed attempt
+MAIL_OUTBOX_MAX_BACKOFF_SECONDS = int(os.getenv('MAIL_OUTBOX_MAX_BACKOFF_SECONDS', 3600))
+
+# Admission queue worker: a ticket whose admission keeps raising is marked failed after this many attempts
+ADMISSION_MAX_ATTEMPTS = int(os.getenv('ADMISSION_MAX_ATTEMPTS', 5))
+
+# Bulk QR email actions: parallel pooled SMTP connections and overall send rate cap (messages/second, 0 = no cap)
+BULK_EMAIL_WORKERS = int(os.getenv('BULK_EMAIL_WORKERS', 4))
+BULK_EMAIL_RATE_LIMIT = float(os.getenv('BULK_EMAIL_RATE_LIMIT', 10))
+
 # Debug email configuration in debug mode
 if DEBUG:
     print("Email Configuration:")
@@ -1,5 +1,6 @@
 from authentication.models import UserProfile
 from .dynamic_choices_models import Year, Department
+from .choice_lookups import year_display_name
 
 # UserProfile admin registration
 
@@ -14,7 +15,8 @@ from django.contrib.admin.views.decorators import staff_member_required
 from django.utils.decorators import method_decorator
 from django.views import View
 from event.models import Event, Participant, ODList
-from event.email_services import send_registration_email
+from event.bulk_mail import send_registration_emails_bulk
+from event.admin_jobs import admin_job_handler, start_admin_job
 from import_export.admin import ImportExportModelAdmin
 from import_export import resources
 
@@ -70,6 +72,7 @@ class InternalBookingView(View):
 
         success_count = 0
         error_messages = []
+        booked = []
 
         for user in users:
             try:
@@ -94,14 +97,9 @@ class InternalBookingView(View):
                     action = 'Successfully booked'
 
                 if participant.can_attend:
-                    od_list = ODList.objects.create(participant=participant)
-                    try:
-                        send_registration_email(od_list)
-                        messages.success(request, f'{action} {user.get_full_name() or user.username} for {event.event_name}.')
-                        success_count += 1
-                    except Exception as e:
-                        messages.warning(request, f'{action} {user.get_full_name() or user.username} but email failed: {str(e)}')
-                        success_count += 1
+                    od_list, _ = ODList.objects.get_or_create(participant=participant, event=event)
+                    booked.append((user, action, od_list))
+                    success_count += 1
                 else:
                     messages.info(request, f'{action} {user.get_full_name() or user.username} for {event.event_name} but OD not created yet.')
                     success_count += 1
@@ -109,6 +107,14 @@ class InternalBookingView(View):
             except Exception as e:
                 messages.error(request, f'Error booking {user.username}: {str(e)}')
 
+        # Send all QR emails together over pooled SMTP connections
+        results = send_registration_emails_bulk([od_list for _, _, od_list in booked])
+        for (user, action, _), result in zip(booked, results):
+            if result['success']:
+                messages.success(request, f'{action} {user.get_full_name() or user.username} for {event.event_name}.')
+            else:
+                messages.warning(request, f'{action} {user.get_full_name() or user.username} but email failed: {result["error"]}')
+
         messages.success(request, f'Processed {success_count} user(s) for {event.event_name}.')
         return redirect('/admin/users/user/')
 
@@ -194,6 +200,23 @@ class UserProfileResource(resources.ModelResource):
         export_order = fields
 
 
+@admin_job_handler('update_graduation_year_from_rollno')
+def update_graduation_year_job(profile_ids, params):
+    """Set the graduation year detected from the roll number; profiles without one are left as is"""
+    errors = []
+    for profile in UserProfile.objects.filter(id__in=profile_ids).select_related('user'):
+        if not profile.rollno:
+            continue
+        detected_year = profile.get_year_from_rollno()
+        if detected_year and detected_year != profile.year:
+            try:
+                profile.year = detected_year
+                profile.save()
+            except Exception as e:
+                errors.append(f"{profile.user.username} (Roll: {profile.rollno}): {str(e)}")
+    return errors
+
+
 @admin.register(UserProfile)
 class UserProfileAdmin(ImportExportModelAdmin):
     resource_class = UserProfileResource
@@ -235,30 +258,12 @@ class UserProfileAdmin(ImportExportModelAdmin):
     
     def update_graduation_year_from_rollno(self, request, queryset):
         """Admin action to update graduation year based on roll number for selected profiles"""
-        updated_count = 0
-        skipped_count = 0
-        
-        for profile in queryset:
-            if profile.rollno:
-                detected_year = profile.get_year_from_rollno()
-                if detected_year and detected_year != profile.year:
-                    old_year = profile.year or 'None'
-                    profile.year = detected_year
-                    profile.save()
-                    updated_count += 1
-                    messages.success(
-                        request, 
-                        f"Updated {profile.user.username} (Roll: {profile.rollno}): {old_year} → {detected_year}"
-                    )
-                else:
-                    skipped_count += 1
-            else:
-                skipped_count += 1
-        
-        if updated_count > 0:
-            messages.success(request, f"Successfully updated {updated_count} user profiles.")
-        if skipped_count > 0:
-            messages.info(request, f"Skipped {skipped_count} profiles (no roll number or graduation year already correct).")
+        return start_admin_job(
+            request,
+            'update_graduation_year_from_rollno',
+            queryset.order_by('id').values_list('id', flat=True),
+            description='Update graduation year from roll number',
+        )
     
     update_graduation_year_from_rollno.short_description = "Update graduation year from roll number for selected profiles"
     
@@ -269,11 +274,7 @@ class UserProfileAdmin(ImportExportModelAdmin):
             if detected:
                 # Get the display name for the detected year
                 # Get year display name from dynamic Year model
-                try:
-                    year_obj = Year.objects.get(code=detected, is_active=True)
-                    year_name = year_obj.display_name
-                except Year.DoesNotExist:
-                    year_name = detected
+                year_name = year_display_name(detected) or detected
                 
                 if detected == obj.year:
                     return f"{year_name} ✓"
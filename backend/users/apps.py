@@ -1,5 +1,5 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 
 class UsersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
@@ -16,3 +16,11 @@ class UsersConfig(AppConfig):
                 UserProfile.objects.create(user=instance)
         post_save.connect(create_user_profile, sender=User)
 
+        from event.models import EventCategory
+        from .choice_lookups import invalidate_choice_lookups
+        from .dynamic_choices_models import Category, Department, Year
+
+        for model in (Year, Department, Category, EventCategory):
+            post_save.connect(invalidate_choice_lookups, sender=model, dispatch_uid=f'choice_lookups_save_{model.__name__}')
+            post_delete.connect(invalidate_choice_lookups, sender=model, dispatch_uid=f'choice_lookups_delete_{model.__name__}')
+
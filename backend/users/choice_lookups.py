@@ -0,0 +1,140 @@
+"""
+In-process lookup tables for the dynamic choice models.
+
+Year, Department, Category and EventCategory rarely change but are read on
+every profile serialization and report row. Each process keeps one snapshot
+of the active rows as plain dicts, so display lookups are dict hits.
+
+The snapshot is tagged with a version stamp kept in the shared Django cache.
+Saving or deleting any of the four models writes a new stamp (see
+`invalidate_choice_lookups`), and every process compares its snapshot with
+the stamp at most every CHOICE_LOOKUP_CHECK_SECONDS and reloads on mismatch.
+queryset.update() and bulk_create() send no signals; call
+`invalidate_choice_lookups()` after using them on these models.
+"""
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+VERSION_CACHE_KEY = 'choice_lookups:version'
+
+# (version, checked_at, tables) of this process; replaced as a whole, never mutated
+_snapshot = (None, 0.0, None)
+
+
+def _shared_version():
+    """Current version stamp from the shared cache, creating one if missing"""
+    version = cache.get(VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+        version = cache.get(VERSION_CACHE_KEY)
+    return version
+
+
+def _load_tables():
+    """Read the active rows of all four choice models (four queries)"""
+    from event.models import EventCategory
+    from users.dynamic_choices_models import Category, Department, Year
+
+    years = list(Year.objects.filter(is_active=True).order_by('order').values('code', 'display_name'))
+    categories = list(Category.objects.filter(is_active=True).order_by('order').values('code', 'display_name'))
+    departments = list(
+        Department.objects.filter(is_active=True)
+        .order_by('category__order', 'order')
+        .values('code', 'full_name', 'category__code', 'category__is_active')
+    )
+    event_categories = list(
+        EventCategory.objects.filter(is_active=True).order_by('order').values('code', 'display_name', 'description')
+    )
+    return {
+        'years': years,
+        'year_names': {year['code']: year['display_name'] for year in years},
+        'categories': categories,
+        'departments': departments,
+        'department_names': {dept['code']: dept['full_name'] for dept in departments},
+        'event_categories': event_categories,
+    }
+
+
+def get_choice_tables():
+    """
+    Return the lookup tables, reloading them if another process changed the data.
+
+    Returns:
+        dict: 'years', 'categories', 'departments' and 'event_categories' as
+        ordered lists of dicts, plus 'year_names' and 'department_names'
+        code -> display name maps. Treat them as read-only.
+    """
+    global _snapshot
+    version, checked_at, tables = _snapshot
+    now = time.monotonic()
+    if tables is not None and now - checked_at < getattr(settings, 'CHOICE_LOOKUP_CHECK_SECONDS', 5):
+        return tables
+
+    shared_version = _shared_version()
+    # Read the stamp before the rows: a change landing in between just triggers another reload
+    if tables is None or shared_version != version:
+        tables = _load_tables()
+    _snapshot = (shared_version, now, tables)
+    return tables
+
+
+def choice_tables_version():
+    """The shared version stamp (one cache read); changes whenever any of the tables does"""
+    return _shared_version()
+
+
+def _bump_version():
+    global _snapshot
+    cache.set(VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    _snapshot = (None, 0.0, None)
+
+
+def invalidate_choice_lookups(sender=None, **kwargs):
+    """
+    Signal receiver: drop this process' tables and publish a new version stamp.
+
+    Bumped again on commit, so workers that reloaded while the change was
+    still uncommitted pick up the committed rows as well.
+    """
+    _bump_version()
+    transaction.on_commit(_bump_version)
+
+
+def year_choices():
+    """Active years as (code, display_name) choices"""
+    return [(year['code'], year['display_name']) for year in get_choice_tables()['years']]
+
+
+def category_choices():
+    """Active department categories as (code, display_name) choices"""
+    return [(cat['code'], cat['display_name']) for cat in get_choice_tables()['categories']]
+
+
+def department_choices(category_code=None):
+    """Active departments as (code, full_name) choices, optionally for one active category"""
+    departments = get_choice_tables()['departments']
+    if category_code:
+        departments = [
+            dept for dept in departments
+            if dept['category__code'] == category_code and dept['category__is_active']
+        ]
+    return [(dept['code'], dept['full_name']) for dept in departments]
+
+
+def event_category_choices():
+    """Active event categories as (code, display_name) choices"""
+    return [(cat['code'], cat['display_name']) for cat in get_choice_tables()['event_categories']]
+
+
+def year_display_name(code):
+    """Display name of an active year, or None"""
+    return get_choice_tables()['year_names'].get(code)
+
+
+def department_display_name(code):
+    """Full name of an active department, or None"""
+    return get_choice_tables()['department_names'].get(code)
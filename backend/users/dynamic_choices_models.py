@@ -26,7 +26,8 @@ class Category(models.Model):
     @classmethod
     def get_choices(cls):
         """Get active categories as choices for form fields"""
-        return [(cat.code, cat.display_name) for cat in cls.objects.filter(is_active=True).order_by('order')]
+        from users.choice_lookups import category_choices
+        return category_choices()
 
     @classmethod
     def populate_defaults(cls):
@@ -62,7 +63,8 @@ class Year(models.Model):
     @classmethod
     def get_choices(cls):
         """Get active years as choices for form fields"""
-        return [(year.code, year.display_name) for year in cls.objects.filter(is_active=True).order_by('order')]
+        from users.choice_lookups import year_choices
+        return year_choices()
 
     @classmethod
     def populate_defaults(cls):
@@ -107,16 +109,14 @@ class Department(models.Model):
     @classmethod
     def get_choices(cls):
         """Get active departments as choices for form fields"""
-        return [(dept.code, dept.full_name) for dept in cls.objects.filter(is_active=True).order_by('category__order', 'order')]
+        from users.choice_lookups import department_choices
+        return department_choices()
 
     @classmethod
     def get_choices_by_category(cls, category_code):
         """Get active departments filtered by category code"""
-        return [(dept.code, dept.full_name) for dept in cls.objects.filter(
-            is_active=True, 
-            category__code=category_code,
-            category__is_active=True
-        ).order_by('order')]
+        from users.choice_lookups import department_choices
+        return department_choices(category_code)
 
     @classmethod
     def populate_defaults(cls):
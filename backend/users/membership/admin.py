@@ -111,6 +111,9 @@ class PremiumMembershipSlotAdmin(ImportExportModelAdmin):
     )
     
     actions = ['open_slots', 'close_slots']
+
+    def get_queryset(self, request):
+        return super().get_queryset(request).with_allocation()
     
     def allocated_slots_display(self, obj):
         return f"{obj.allocated_slots}/{obj.total_slots}"
@@ -79,6 +79,15 @@ class DevsMembership(models.Model):
         return True, "Successfully upgraded to premium membership"
 
 
+class PremiumMembershipSlotQuerySet(models.QuerySet):
+
+    def with_allocation(self):
+        """Count approved applications up front, so listing slots runs no query per slot"""
+        return self.annotate(
+            approved_count=models.Count('applications', filter=models.Q(applications__status='approved'))
+        )
+
+
 class PremiumMembershipSlot(models.Model):
     """Premium membership slot management"""
     
@@ -90,6 +99,8 @@ class PremiumMembershipSlot(models.Model):
     closes_at = models.DateTimeField(null=True, blank=True, help_text="When this slot closes")
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+
+    objects = PremiumMembershipSlotQuerySet.as_manager()
     
     class Meta:
         verbose_name = "Premium Membership Slot"
@@ -103,6 +114,8 @@ class PremiumMembershipSlot(models.Model):
     @property
     def allocated_slots(self):
         """Number of slots already allocated"""
+        if hasattr(self, 'approved_count'):
+            return self.approved_count
         return self.applications.filter(status='approved').count()
     
     @property
@@ -1,3 +1,80 @@
-from django.test import TestCase
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
 
-# Create your tests here.
+from authentication.models import UserProfile
+from event.models import EventCategory
+
+from .choice_lookups import VERSION_CACHE_KEY, get_choice_tables, invalidate_choice_lookups
+from .dynamic_choices_models import Category, Department, Year
+from .serializers import UserProfileSerializer
+
+User = get_user_model()
+
+
+class ChoiceLookupTests(TestCase):
+
+    def setUp(self):
+        # Rolled-back rows from other tests send no signals
+        invalidate_choice_lookups()
+        self.year = Year.objects.create(code='2', display_name='Year II', order=2)
+        self.category = Category.objects.create(code='UG', display_name='Undergraduate', order=1)
+        self.department = Department.objects.create(code='CSE', full_name='Computer Science', category=self.category)
+
+    def make_profiles(self, count):
+        for i in range(count):
+            user = User.objects.create(username=f'choice{i}', email=f'choice{i}@example.com')
+            # Not left to the post_save receiver in UsersConfig.ready(): it is connected
+            # by weak reference, so whether it still fires depends on garbage collection
+            UserProfile.objects.update_or_create(user=user, defaults={'year': '2', 'department': 'CSE'})
+        return UserProfile.objects.filter(user__username__startswith='choice').select_related('user')
+
+    def test_profile_listing_has_no_per_row_lookups(self):
+        profiles = list(self.make_profiles(10))
+        get_choice_tables()
+
+        with self.assertNumQueries(0):
+            data = UserProfileSerializer(profiles, many=True).data
+
+        self.assertEqual({row['year_display'] for row in data}, {'Year II'})
+        self.assertEqual({row['department_display'] for row in data}, {'Computer Science'})
+
+    def test_save_and_delete_invalidate_tables(self):
+        profile = self.make_profiles(1).get()
+        self.assertEqual(profile.get_year_display(), 'Year II')
+
+        self.year.display_name = 'Second Year'
+        self.year.save()
+        self.assertEqual(profile.get_year_display(), 'Second Year')
+
+        self.department.delete()
+        # Falls back to the static choices
+        self.assertEqual(profile.department_display, 'Computer Science & Engineering')
+
+    def test_get_choices_served_from_tables(self):
+        EventCategory.objects.create(code='talk', display_name='Talk', order=1)
+        Department.objects.create(code='MBA', full_name='Business Administration', order=1,
+                                  category=Category.objects.create(code='PG', display_name='Postgraduate', order=2))
+        get_choice_tables()
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Year.get_choices(), [('2', 'Year II')])
+            self.assertEqual(Department.get_choices_by_category('PG'), [('MBA', 'Business Administration')])
+            self.assertEqual([code for code, _ in Department.get_choices()], ['CSE', 'MBA'])
+            self.assertIn(('talk', 'Talk'), EventCategory.get_choices())
+
+    @override_settings(CHOICE_LOOKUP_CHECK_SECONDS=0)
+    def test_reload_when_another_process_bumps_version(self):
+        get_choice_tables()
+        # Change made by another worker: no signal here, only the shared stamp moves
+        Year.objects.filter(pk=self.year.pk).update(display_name='Renamed')
+        self.assertEqual(get_choice_tables()['year_names']['2'], 'Year II')
+
+        cache.set(VERSION_CACHE_KEY, 'other-worker')
+        self.assertEqual(get_choice_tables()['year_names']['2'], 'Renamed')
+
+    def test_choice_endpoints(self):
+        response = self.client.get('/api/users/choices/departments/', {'category': 'UG'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), [{'code': 'CSE', 'full_name': 'Computer Science', 'category': 'UG'}])
@@ -6,6 +6,7 @@ from rest_framework.decorators import api_view, permission_classes
 from authentication.models import UserProfile
 from .serializers import UserProfileSerializer
 from django.contrib.auth import get_user_model
+from radiumB.query_budget import query_budget
 
 User = get_user_model()
 
@@ -15,6 +16,7 @@ class UserListView(APIView):
     List all users - Admin only
     """
     permission_classes = [IsAdminUser]
+    query_budget = 8
 
     def get(self, request):
         try:
@@ -49,6 +51,7 @@ class UserRoleUpdateView(APIView):
     Update user roles - Admin only
     """
     permission_classes = [IsAdminUser]
+    query_budget = 10
 
     def patch(self, request, user_id):
         try:
@@ -88,6 +91,7 @@ class UserRoleUpdateView(APIView):
 class UserProfileView(APIView):
 
     permission_classes = [IsAuthenticated]
+    query_budget = 10
 
     def get(self, request):
         """Retrive only authenticated user's profile"""
@@ -136,6 +140,7 @@ class UserProfileView(APIView):
 class UserProfileCompletionView(APIView):
 
     permission_classes = [IsAuthenticated]
+    query_budget = 6
 
     def get(self, request):
         """Retrive only authenticated user's profile"""
@@ -247,6 +252,7 @@ class MembershipStatusView(APIView):
     Get current membership status and available options for the authenticated user
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 10
 
     def get(self, request):
         """Return comprehensive membership status"""
@@ -257,7 +263,7 @@ class MembershipStatusView(APIView):
             devs_membership = None
             has_devs_membership = False
             try:
-                devs_membership = DevsMembership.objects.get(user=user)
+                devs_membership = DevsMembership.objects.select_related('user').get(user=user)
                 has_devs_membership = True
             except DevsMembership.DoesNotExist:
                 pass
@@ -266,14 +272,16 @@ class MembershipStatusView(APIView):
             can_claim_devs, eligibility_message = DevsMembership.can_claim_membership(user)
             
             # Get premium applications
-            premium_applications = PremiumMembershipApplication.objects.filter(user=user)
+            premium_applications = PremiumMembershipApplication.objects.filter(user=user).select_related(
+                'user', 'slot', 'reviewed_by'
+            )
             
             # Get available premium slots
             available_premium_slots = PremiumMembershipSlot.objects.filter(
                 is_open=True
             ).exclude(
                 applications__user=user  # Exclude slots user has already applied to
-            )
+            ).with_allocation()
             
             # Define membership benefits
             membership_benefits = {
@@ -318,6 +326,7 @@ class ClaimDevMembershipView(APIView):
     Claim DEVS membership for eligible first-year students
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 10
 
     def post(self, request):
         """Claim DEVS membership"""
@@ -361,6 +370,7 @@ class MembershipBenefitsView(APIView):
     Get membership benefits information
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 4
 
     def get(self, request):
         """Return membership benefits"""
@@ -411,15 +421,16 @@ class PremiumSlotsListView(APIView):
     List available premium membership slots
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 8
 
     def get(self, request):
         """Return available premium slots"""
         try:
             # Get currently open slots
-            open_slots = PremiumMembershipSlot.objects.filter(is_open=True)
+            open_slots = PremiumMembershipSlot.objects.filter(is_open=True).with_allocation()
             
             # Get all slots for reference (admin view)
-            all_slots = PremiumMembershipSlot.objects.all()
+            all_slots = PremiumMembershipSlot.objects.with_allocation()
             
             response_data = {
                 'open_slots': PremiumMembershipSlotSerializer(open_slots, many=True).data,
@@ -440,6 +451,7 @@ class ApplyForPremiumMembershipView(APIView):
     Apply for premium membership slot
     """
     permission_classes = [IsAuthenticated]
+    query_budget = 12
 
     def post(self, request):
         """Submit premium membership application"""
@@ -515,50 +527,48 @@ class ApplyForPremiumMembershipView(APIView):
 
 # ========== Dynamic Choices API Views ==========
 
-from .dynamic_choices_models import Year, Department, Category
+from .choice_lookups import get_choice_tables
 
+@query_budget(4)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_year_choices(request):
     """Get all active year choices"""
-    years = Year.objects.filter(is_active=True).order_by('order')
-    data = [{'code': year.code, 'display_name': year.display_name} for year in years]
+    data = [{'code': year['code'], 'display_name': year['display_name']} for year in get_choice_tables()['years']]
     return Response(data, status=status.HTTP_200_OK)
 
 
+@query_budget(4)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_department_choices(request):
     """Get all active department choices, optionally filtered by category"""
     category = request.query_params.get('category', None)
+    departments = get_choice_tables()['departments']
     
     if category:
-        departments = Department.objects.filter(
-            is_active=True, 
-            category__code=category,
-            category__is_active=True
-        ).order_by('order')
-    else:
-        departments = Department.objects.filter(is_active=True).order_by('category__order', 'order')
+        departments = [
+            dept for dept in departments
+            if dept['category__code'] == category and dept['category__is_active']
+        ]
     
     data = [{
-        'code': dept.code,
-        'full_name': dept.full_name,
-        'category': dept.category.code
+        'code': dept['code'],
+        'full_name': dept['full_name'],
+        'category': dept['category__code']
     } for dept in departments]
     
     return Response(data, status=status.HTTP_200_OK)
 
 
+@query_budget(4)
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_category_choices(request):
     """Get all active category choices"""
-    categories = Category.objects.filter(is_active=True).order_by('order')
-    
     data = [{
-        'code': cat.code,
-        'display_name': cat.display_name
-    } for cat in categories]
+        'code': cat['code'],
+        'display_name': cat['display_name']
+    } for cat in get_choice_tables()['categories']]
     
     return Response(data, status=status.HTTP_200_OK)
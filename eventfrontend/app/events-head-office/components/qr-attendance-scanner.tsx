@@ -6,6 +6,7 @@ import { Label } from "@/components/ui/label"
 import { Select } from "@/components/ui/select"
 import { Camera, QrCode, CheckCircle, XCircle, AlertCircle, Play, Square } from "lucide-react"
 import { useEvents, useMarkAttendance } from "@/lib/hooks/useEvents"
+import type { ScannedParticipant } from "@/lib/api/events"
 import { Html5QrcodeScanner } from "html5-qrcode";
 import { cn } from "@/lib/utils"
 
@@ -21,7 +22,7 @@ interface AttendanceResult {
   message: string
   participant_id?: number
   error?: string
-  participant?: any // Add participant field for full details
+  participant?: ScannedParticipant
 }
 
 export default function QRAttendanceScanner() {
@@ -57,13 +58,15 @@ export default function QRAttendanceScanner() {
         setScanResult({
           success: true,
           message: result.data.message,
-          participant_id: result.data.participant_id
+          participant_id: result.data.participant?.participant_id,
+          participant: result.data.participant
         })
       } else if (result.status === 208) {
         setScanResult({
           success: false,
           message: result.data.message,
-          participant_id: result.data.participant_id
+          participant_id: result.data.participant?.participant_id,
+          participant: result.data.participant
         })
       }
     } catch (error: any) {
@@ -231,15 +234,12 @@ export default function QRAttendanceScanner() {
                     <p className="font-medium text-sm sm:text-base break-words">{scanResult.message}</p>
                     {scanResult.participant && (
                       <div className="mt-2 text-xs sm:text-sm text-muted-foreground space-y-1">
-                        <div><span className="font-semibold">Name:</span> {scanResult.participant.user?.first_name} {scanResult.participant.user?.last_name}</div>
-                        <div><span className="font-semibold">Username:</span> {scanResult.participant.user?.username}</div>
-                        <div><span className="font-semibold">Email:</span> {scanResult.participant.user?.email}</div>
-                        {scanResult.participant.user?.rollno && <div><span className="font-semibold">Roll No:</span> {scanResult.participant.user.rollno}</div>}
-                        {scanResult.participant.user?.department && <div><span className="font-semibold">Department:</span> {scanResult.participant.user.department}</div>}
-                        {scanResult.participant.user?.degree && <div><span className="font-semibold">Degree:</span> {scanResult.participant.user.degree}</div>}
-                        {scanResult.participant.user?.college_name && <div><span className="font-semibold">College:</span> {scanResult.participant.user.college_name}</div>}
-                        <div><span className="font-semibold">Status:</span> {scanResult.participant.registration_status}</div>
-                        <div><span className="font-semibold">Payment:</span> {scanResult.participant.payment_status ? "Paid" : "Unpaid"}</div>
+                        <div><span className="font-semibold">Name:</span> {scanResult.participant.name}</div>
+                        <div><span className="font-semibold">Email:</span> {scanResult.participant.email}</div>
+                        {scanResult.participant.rollno && <div><span className="font-semibold">Roll No:</span> {scanResult.participant.rollno}</div>}
+                        {scanResult.participant.department && <div><span className="font-semibold">Department:</span> {scanResult.participant.department}</div>}
+                        {scanResult.participant.year && <div><span className="font-semibold">Year:</span> {scanResult.participant.year}</div>}
+                        {scanResult.participant.attendance_marked_at && <div><span className="font-semibold">Marked at:</span> {new Date(scanResult.participant.attendance_marked_at).toLocaleString()}</div>}
                       </div>
                     )}
                   </div>
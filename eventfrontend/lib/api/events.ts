@@ -224,6 +224,35 @@ export interface ODListResponse {
   total_count: number;
 }
 
+// Queued report download (analysis / OD list CSV)
+export interface ReportJob {
+  job_id: string;
+  status: "queued" | "running" | "done" | "failed";
+  status_url?: string;
+  download_url?: string | null;
+  error?: string;
+}
+
+const REPORT_POLL_INTERVAL = 2000; // 2 seconds
+const REPORT_POLL_TIMEOUT = 5 * 60 * 1000; // 5 minutes
+
+// status_url / download_url are server paths (/api/...): resolve them against
+// the API origin instead of appending them to the /api base URL
+const resolveServerPath = (path: string): string =>
+  new URL(path, new URL(apiClient.defaults.baseURL ?? "/", window.location.origin)).toString();
+
+// Participant shown at the gate after a scan
+export interface ScannedParticipant {
+  participant_id: number;
+  name: string;
+  email: string;
+  rollno: string | null;
+  department: string | null;
+  year: string | null;
+  attendance: boolean;
+  attendance_marked_at: string | null;
+}
+
 // Events service class
 export class EventsService {
   static async getEvents(
@@ -580,17 +609,7 @@ export class EventsService {
 
   // Download event analysis (Admin only)
   static async downloadEventAnalysis(eventId: number): Promise<Blob> {
-    try {
-      const response = await apiClient.get(
-        `/events/${eventId}/analysis/download/`,
-        {
-          responseType: "blob",
-        }
-      );
-      return response.data;
-    } catch (error) {
-      throw this.handleEventError(error as ApiError);
-    }
+    return this.downloadReport(`/events/${eventId}/analysis/download/`);
   }
 
   // Get event OD list data (Staff only)
@@ -608,24 +627,45 @@ export class EventsService {
 
   // Download event OD list (Staff only)
   static async downloadEventODList(eventId: number): Promise<Blob> {
-    try {
-      const response = await apiClient.get(
-        `/events/${eventId}/od-list/download/`,
-        {
-          responseType: "blob",
-        }
-      );
+    return this.downloadReport(`/events/${eventId}/od-list/download/`);
+  }
+
+  // A cached report comes back as the CSV; otherwise the server queues it
+  // (202 with the job) and the file is fetched once the job is done
+  private static async downloadReport(path: string): Promise<Blob> {
+    const get = async <T>(url: string, blob = false) => {
+      try {
+        return await apiClient.get<T>(url, blob ? { responseType: "blob" } : undefined);
+      } catch (error) {
+        throw this.handleEventError(error as ApiError);
+      }
+    };
+
+    const response = await get<Blob>(path, true);
+    if (response.status !== 202) {
       return response.data;
-    } catch (error) {
-      throw this.handleEventError(error as ApiError);
     }
+
+    const job: ReportJob = JSON.parse(await response.data.text());
+    const deadline = Date.now() + REPORT_POLL_TIMEOUT;
+    while (Date.now() < deadline) {
+      await new Promise((resolve) => setTimeout(resolve, REPORT_POLL_INTERVAL));
+      const { data } = await get<ReportJob>(resolveServerPath(job.status_url!));
+      if (data.status === "done" && data.download_url) {
+        return (await get<Blob>(resolveServerPath(data.download_url), true)).data;
+      }
+      if (data.status === "failed") {
+        throw new Error(data.error || "Report generation failed");
+      }
+    }
+    throw new Error("The report is still being generated. Please try again shortly.");
   }
 
   // Mark attendance with QR code (Admin only)
   static async markAttendance(
     eventId: number,
     hash: string
-  ): Promise<ApiResponse<{ message: string; participant_id: number }>> {
+  ): Promise<ApiResponse<{ message: string; participant: ScannedParticipant }>> {
     try {
       const response = await apiClient.put(
         `/events/${eventId}/mark-attendance/`,